@@ -1,15 +1,55 @@
-from .clue import BaseClient, ClueDifficulty, ClueGenerator, OpenAIClient
-from .crossword import generate_crossword
-from .word import prepare_words, remove_duplicates
+from .clue import (
+    AdaptiveLimit,
+    AsyncBaseClient,
+    AsyncOpenAIClient,
+    BaseClient,
+    ClueCache,
+    ClueDifficulty,
+    ClueGenerator,
+    LRUClueCache,
+    OpenAIClient,
+    RateLimiter,
+    RetryPolicy,
+)
+from .crossword import (
+    CrosswordEngine,
+    GenerationStats,
+    WordIndex,
+    WordOrder,
+    fill_template,
+    generate_crossword,
+    generate_crosswords,
+    stream_crossword,
+)
+from .pipeline import generate_crossword_with_clues
+from .server import CrosswordServer
+from .word import prepare_words, read_words, remove_duplicates
 
 __version__ = "0.3.0"
 __all__ = (
     "__version__",
+    "AdaptiveLimit",
+    "AsyncBaseClient",
+    "AsyncOpenAIClient",
     "BaseClient",
+    "ClueCache",
     "ClueDifficulty",
     "ClueGenerator",
+    "CrosswordEngine",
+    "CrosswordServer",
+    "fill_template",
+    "GenerationStats",
     "generate_crossword",
+    "generate_crosswords",
+    "generate_crossword_with_clues",
+    "LRUClueCache",
     "OpenAIClient",
     "prepare_words",
+    "RateLimiter",
+    "read_words",
     "remove_duplicates",
+    "RetryPolicy",
+    "stream_crossword",
+    "WordIndex",
+    "WordOrder",
 )
@@ -1,17 +1,43 @@
 import asyncio
+import contextlib
+import dataclasses
+import itertools
+import json
 import logging
 import os
+import signal
+import sqlite3
+import sys
 from argparse import ArgumentParser, Namespace
 from pathlib import Path
-
-from openai import OpenAIError
+from typing import Generator, TextIO
 
 from . import __version__
 from ._logger import setup_logging
-from ._utils import print_clues, print_crossword, render_crossword, save
-from .clue import ClueDifficulty, ClueGenerator, OpenAIClient
-from .crossword import generate_crossword
-from .word import prepare_words
+from ._utils import print_clues, print_crossword, render_crossword, save, serialize
+from .clue import (
+    AdaptiveLimit,
+    AsyncOpenAIClient,
+    ClueCache,
+    ClueDifficulty,
+    ClueGenerator,
+    LRUClueCache,
+    RateLimiter,
+    RetryPolicy,
+)
+from .clue.cache import MAX_CLUES
+from .crossword import (
+    CrosswordEngine,
+    GenerationStats,
+    WordIndex,
+    WordOrder,
+    fill_template,
+    generate_crossword,
+    generate_crosswords,
+)
+from .pipeline import generate_crossword_with_clues
+from .server import LIMITS, CrosswordServer
+from .word import prepare_words, read_words
 
 logger = setup_logging()
 
@@ -21,6 +47,117 @@ def log_fatal(message: str):
     exit(1)
 
 
+def clue_arguments(parser: ArgumentParser):
+    """Adds the arguments of the clue generation to a parser.
+
+    Args:
+        parser: The argument parser object.
+
+    Returns:
+        The group of the clue arguments.
+    """
+    clue = parser.add_argument_group("clue arguments")
+    clue.add_argument(
+        "-cd",
+        "--clue-difficulty",
+        dest="clue_difficulty",
+        type=str,
+        choices=list(ClueDifficulty),
+        help="Difficulty level of the clues.",
+    )
+    clue.add_argument(
+        "-cc",
+        "--clue-concurrency",
+        dest="clue_concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of clue requests sent at a time.",
+    )
+    clue.add_argument(
+        "-cb",
+        "--clue-batch-size",
+        dest="clue_batch_size",
+        type=int,
+        help="Number of words whose clues are asked for in a single request.",
+    )
+    clue.add_argument(
+        "--requests-per-minute",
+        dest="requests_per_minute",
+        type=float,
+        help="Maximum number of clue requests per minute.",
+    )
+    clue.add_argument(
+        "--tokens-per-minute",
+        dest="tokens_per_minute",
+        type=float,
+        help="Maximum number of tokens of the clue requests per minute.",
+    )
+    clue.add_argument(
+        "--max-retries",
+        dest="max_retries",
+        type=int,
+        default=5,
+        help="Retries of a failed clue request, with backoff, before giving up.",
+    )
+    clue.add_argument(
+        "--clue-cache",
+        dest="clue_cache",
+        type=Path,
+        help="Path of the clue cache database, shared by the runs. Defaults to "
+        "clues.sqlite3 in $PYCROSSWORD_CACHE_DIR or ~/.cache/pycrossword.",
+    )
+    clue.add_argument(
+        "--clue-cache-ttl",
+        dest="clue_cache_ttl",
+        type=float,
+        help="Seconds after which cached clues expire.",
+    )
+    clue.add_argument(
+        "--clue-cache-size",
+        dest="clue_cache_size",
+        type=int,
+        default=100_000,
+        help="Number of cached clues above which the least recently used are evicted.",
+    )
+    clue.add_argument(
+        "--clue-memory-size",
+        dest="clue_memory_size",
+        type=int,
+        help="Number of words whose clues are kept in memory, the least recently used "
+        "are evicted above it.",
+    )
+    clue.add_argument(
+        "--clues-per-word",
+        dest="clues_per_word",
+        type=int,
+        default=MAX_CLUES,
+        help="Number of clues of a word kept in memory, the oldest are evicted "
+        "above it.",
+    )
+    clue.add_argument(
+        "--no-clue-cache",
+        dest="disable_clue_cache",
+        action="store_true",
+        help="Disable the clue cache.",
+    )
+    token = clue.add_mutually_exclusive_group(required=True)
+    token.add_argument(
+        "-t",
+        "--api-token",
+        dest="api_token",
+        type=str,
+        help="Api token of OpenAI.",
+    )
+    token.add_argument(
+        "--no-clue",
+        dest="disable_clue_generation",
+        action="store_true",
+        help="Disable clue generation.",
+    )
+
+    return clue
+
+
 def cli(parser: ArgumentParser) -> Namespace:
     """Parses command-line arguments for configuring and generating a crossword puzzle.
 
@@ -46,6 +183,14 @@ def cli(parser: ArgumentParser) -> Namespace:
         type=Path,
         help="Path to the file containing the words for generating crossword puzzle.",
     )
+    required.add_argument(
+        "-bf",
+        "--batch-file",
+        dest="batch_file",
+        type=Path,
+        help="Path to the file containing one JSON array of words per line ('-' for stdin), "
+        "a crossword puzzle is generated for each line and written as a JSON line.",
+    )
 
     # Group for crossword-related arguments
     crossword = parser.add_argument_group("crossword arguments")
@@ -65,6 +210,13 @@ def cli(parser: ArgumentParser) -> Namespace:
         default=None,
         help="The height of the crossword puzzle grid.",
     )
+    crossword.add_argument(
+        "-tp",
+        "--template",
+        type=Path,
+        help="Path to a crossword template to fill with the words instead of laying them "
+        "out freely, one row per line: blocks (#), empty cells (.) and letters.",
+    )
     crossword.add_argument(
         "-se",
         "--seed",
@@ -72,6 +224,66 @@ def cli(parser: ArgumentParser) -> Namespace:
         default=None,
         help="Seed for crossword generation to ensure reproducibility.",
     )
+    crossword.add_argument(
+        "-e",
+        "--engine",
+        type=str,
+        choices=list(CrosswordEngine),
+        default=CrosswordEngine.PYTHON,
+        help="Engine used to search placements of the words. The beam engine doesn't "
+        "fill the grid better than as many --attempts of the python engine, which cost "
+        "about the same.",
+    )
+    crossword.add_argument(
+        "-bw",
+        "--beam-width",
+        dest="beam_width",
+        type=int,
+        default=4,
+        help="Number of partial crosswords kept by the beam engine.",
+    )
+    crossword.add_argument(
+        "-bd",
+        "--beam-depth",
+        dest="beam_depth",
+        type=int,
+        default=None,
+        help="Number of words after which the beam engine keeps its best partial "
+        "crossword only.",
+    )
+    crossword.add_argument(
+        "-wo",
+        "--word-order",
+        dest="word_order",
+        type=str,
+        choices=list(WordOrder),
+        default=WordOrder.RANDOM,
+        help="Order the words are placed in, connectivity places first the words with "
+        "the most letters in common with the others.",
+    )
+    crossword.add_argument(
+        "-at",
+        "--attempts",
+        type=int,
+        default=1,
+        help="Number of attempts to generate the crossword, the best one is kept.",
+    )
+    crossword.add_argument(
+        "-wk",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes running the attempts, or the crossword puzzles in batch "
+        "mode (defaults to the number of CPUs in batch mode).",
+    )
+    crossword.add_argument(
+        "-tb",
+        "--time-budget",
+        dest="time_budget",
+        type=float,
+        default=None,
+        help="Seconds after which the generation stops and keeps the best crossword so far.",
+    )
     crossword.add_argument(
         "-th",
         "--theme",
@@ -87,29 +299,7 @@ def cli(parser: ArgumentParser) -> Namespace:
     )
 
     # Group for clue-related arguments
-    clue = parser.add_argument_group("clue arguments")
-    clue.add_argument(
-        "-cd",
-        "--clue-difficulty",
-        dest="clue_difficulty",
-        type=str,
-        choices=list(ClueDifficulty),
-        help="Difficulty level of the clues.",
-    )
-    token = clue.add_mutually_exclusive_group(required=True)
-    token.add_argument(
-        "-t",
-        "--api-token",
-        dest="api_token",
-        type=str,
-        help="Api token of OpenAI.",
-    )
-    token.add_argument(
-        "--no-clue",
-        dest="disable_clue_generation",
-        action="store_true",
-        help="Disable clue generation.",
-    )
+    clue_arguments(parser)
 
     # Group for output-related arguments
     output = parser.add_argument_group("output arguments")
@@ -131,6 +321,13 @@ def cli(parser: ArgumentParser) -> Namespace:
         action="store_true",
         help="Overwrite the file even if it already exists.",
     )
+    output.add_argument(
+        "-st",
+        "--stats",
+        action="store_true",
+        help="Log the counts and timings of the generation (added to each JSON line in "
+        "batch mode).",
+    )
 
     # Group for optional arguments
     optional = parser.add_argument_group("optional arguments")
@@ -157,10 +354,414 @@ def cli(parser: ArgumentParser) -> Namespace:
     return parser.parse_args()
 
 
+def compile_cli(parser: ArgumentParser, args: list) -> Namespace:
+    """Parses command-line arguments for compiling a word list.
+
+    Args:
+        parser: The argument parser object.
+        args: Arguments following the command.
+
+    Returns:
+        Namespace: Parsed command-line arguments.
+    """
+    parser.add_argument(
+        "words_files",
+        nargs="+",
+        type=Path,
+        help="Files with one word per line, gzipped or not, - reads the words from "
+        "stdin.",
+    )
+    parser.add_argument(
+        "-min",
+        "--min-length",
+        type=int,
+        help="Skip the words shorter than this length.",
+    )
+    parser.add_argument(
+        "-max",
+        "--max-length",
+        type=int,
+        help="Skip the words longer than this length.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        required=True,
+        help="Path to save the compiled word list, to use as --words-file.",
+    )
+    parser.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="Overwrite the file even if it already exists.",
+    )
+    parser.add_argument(
+        "-s",
+        "--silent",
+        action="store_true",
+        help="Suppress logs and output.",
+    )
+
+    return parser.parse_args(args)
+
+
+def run_compile(args: list):
+    """Compiles word lists into a file the crossword generation maps in memory.
+
+    Words are read lazily, normalized to uppercase and deduplicated, words with
+    non-alphabetic characters or out of the length range are skipped.
+
+    Args:
+        args: Arguments following the command.
+    """
+    parser = ArgumentParser(
+        prog="pycrossword compile-wordlist",
+        description="Compile word lists into an indexed file, opened without reading "
+        "the words and shared by the processes using it.",
+    )
+    args = compile_cli(parser, args)
+    if args.silent:
+        logger.setLevel(logging.ERROR)
+
+    try:
+        if args.output.exists() and not args.force:
+            raise FileExistsError(f"Output file {args.output} already exists.")
+
+        words = itertools.chain.from_iterable(
+            read_words(
+                sys.stdin if str(words_file) == "-" else words_file,
+                args.min_length,
+                args.max_length,
+            )
+            for words_file in args.words_files
+        )
+        index = WordIndex(words)
+        index.save(args.output)
+        logger.info(f"{len(index)} words were compiled to {args.output}.")
+    except Exception as e:
+        log_fatal(f"Failed due to an error: {e}")
+
+
+def serve_cli(parser: ArgumentParser, args: list) -> Namespace:
+    """Parses command-line arguments for serving crossword puzzles.
+
+    Args:
+        parser: The argument parser object.
+        args: Arguments following the command.
+
+    Returns:
+        Namespace: Parsed command-line arguments.
+    """
+    server = parser.add_argument_group("server arguments")
+    server.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Host to listen to.",
+    )
+    server.add_argument(
+        "-p",
+        "--port",
+        type=int,
+        default=8000,
+        help="Port to listen to.",
+    )
+    server.add_argument(
+        "--socket",
+        type=Path,
+        help="Path of a Unix socket to listen to instead of the host and port.",
+    )
+    server.add_argument(
+        "-wk",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes laying out the crossword puzzles (defaults to the "
+        "number of CPUs).",
+    )
+    server.add_argument(
+        "-q",
+        "--queue-size",
+        dest="queue_size",
+        type=int,
+        default=None,
+        help="Number of requests waiting for a process above which requests are "
+        "rejected with a 503 (defaults to 4 per process).",
+    )
+    server.add_argument(
+        "--max-attempts",
+        dest="max_attempts",
+        type=int,
+        default=LIMITS["attempts"],
+        help="Largest number of attempts of a request.",
+    )
+    server.add_argument(
+        "--max-beam-width",
+        dest="max_beam_width",
+        type=int,
+        default=LIMITS["beam_width"],
+        help="Largest beam width of a request.",
+    )
+    server.add_argument(
+        "--max-beam-depth",
+        dest="max_beam_depth",
+        type=int,
+        default=LIMITS["beam_depth"],
+        help="Largest beam depth of a request.",
+    )
+    server.add_argument(
+        "--max-time-budget",
+        dest="max_time_budget",
+        type=float,
+        default=LIMITS["time_budget"],
+        help="Largest time budget of a request in seconds, also the time budget of the "
+        "requests without one.",
+    )
+    clue = clue_arguments(parser)
+    clue.add_argument(
+        "-th",
+        "--theme",
+        type=str,
+        help="Theme of the clues.",
+    )
+    # the clues of a long-running server are bounded in memory
+    parser.set_defaults(clue_memory_size=10_000)
+    parser.add_argument(
+        "-s",
+        "--silent",
+        action="store_true",
+        help="Suppress logs and output.",
+    )
+
+    return parser.parse_args(args)
+
+
+async def run_serve(args: list):
+    """Serves crossword puzzles over HTTP until interrupted.
+
+    The puzzles are laid out on a pool of processes warmed up at startup, and the clue
+    client and caches are shared by all the requests.
+
+    Args:
+        args: Arguments following the command.
+    """
+    parser = ArgumentParser(
+        prog="pycrossword serve",
+        description="Serve crossword puzzles over HTTP: POST a JSON object with the "
+        "words and the options of the puzzle to /crosswords.",
+    )
+    args = serve_cli(parser, args)
+    if args.silent:
+        logger.setLevel(logging.ERROR)
+
+    try:
+        clue_generator = None
+        if not args.disable_clue_generation:
+            clue_generator = create_clue_generator(args, get_api_token(args))
+
+        server = CrosswordServer(
+            host=args.host,
+            port=args.port,
+            path=args.socket,
+            workers=args.workers,
+            queue_size=args.queue_size,
+            clue_generator=clue_generator,
+            clue_concurrency=args.clue_concurrency,
+            clue_batch_size=args.clue_batch_size,
+            limits={
+                "attempts": args.max_attempts,
+                "beam_width": args.max_beam_width,
+                "beam_depth": args.max_beam_depth,
+                "time_budget": args.max_time_budget,
+            },
+        )
+        async with server:
+            # stopping the service shuts the processes down and removes the socket
+            serving = asyncio.ensure_future(server.serve_forever())
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, serving.cancel
+            )
+            with contextlib.suppress(asyncio.CancelledError):
+                await serving
+    except Exception as e:
+        log_fatal(f"Failed due to an error: {e}")
+
+
+def read_word_lists(
+    file: TextIO, allow_duplicates: bool, lines: list
+) -> Generator[list, None, None]:
+    """Reads word lists from a file with one JSON array of words per line.
+
+    Invalid lines are logged and skipped.
+
+    Args:
+        file: The file to read the word lists from.
+        allow_duplicates: If set to False, duplicate words will be removed.
+        lines: List the line number of each yielded word list is appended to.
+
+    Yields:
+        list: Prepared words of a line.
+    """
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            words = json.loads(line)
+            if not isinstance(words, list) or not words:
+                raise ValueError("Expected a non-empty JSON array of words.")
+
+            words = prepare_words(words, allow_duplicates)
+        except (ValueError, AttributeError) as e:
+            logger.error(f"Skipping line {number} due to an error: {e}")
+            continue
+
+        lines.append(number)
+        yield words
+
+
+def get_api_token(args: Namespace) -> str | None:
+    """Returns the api token of OpenAI, from the arguments or the environment.
+
+    Args:
+        args: Parsed command-line arguments.
+
+    Returns:
+        str | None: The api token, None if clue generation is disabled.
+
+    Raises:
+        OpenAIError: If clue generation is enabled and the token is not found.
+    """
+    if args.disable_clue_generation or args.api_token:
+        return args.api_token
+
+    api_token = os.environ.get("OPENAI_API_KEY")
+    if api_token is None:
+        from openai import OpenAIError
+
+        raise OpenAIError(
+            "OpenAI API token not found. Please provide it via the -t / --api-token argument "
+            "or set it as the environment variable 'OPENAI_API_KEY'."
+        )
+
+    return api_token
+
+
+def create_clue_generator(args: Namespace, api_token: str) -> ClueGenerator:
+    """Creates the clue generator, with the clue cache unless it is disabled.
+
+    The clue cache is optional: if it can't be opened, clues are generated without it.
+    Requests are rate limited and retried, and their concurrency shrinks when the
+    service pushes back.
+
+    Args:
+        args: Parsed command-line arguments.
+        api_token: Api token of OpenAI.
+
+    Returns:
+        ClueGenerator: The clue generator.
+    """
+    cache = None
+    if not args.disable_clue_cache:
+        try:
+            cache = ClueCache(
+                args.clue_cache,
+                ttl=args.clue_cache_ttl,
+                max_entries=args.clue_cache_size,
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"The clue cache is disabled due to an error: {e}")
+
+    rate_limiter = None
+    if args.requests_per_minute is not None or args.tokens_per_minute is not None:
+        rate_limiter = RateLimiter(args.requests_per_minute, args.tokens_per_minute)
+
+    client = AsyncOpenAIClient(
+        api_token,
+        rate_limiter=rate_limiter,
+        retry_policy=RetryPolicy(args.max_retries),
+        concurrency=AdaptiveLimit(args.clue_concurrency, maximum=args.clue_concurrency),
+    )
+    return ClueGenerator(
+        client,
+        theme=args.theme,
+        difficulty=args.clue_difficulty,
+        cache=cache,
+        memory_cache=LRUClueCache(
+            max_entries=args.clue_memory_size, max_clues=args.clues_per_word
+        ),
+    )
+
+
+async def run_batch(args: Namespace, api_token: str | None):
+    """Generates a crossword puzzle for each line of the batch file and writes them as
+    JSON lines, in the order they are finished.
+
+    Args:
+        args: Parsed command-line arguments.
+        api_token: Api token of OpenAI, None if clue generation is disabled.
+    """
+    clue_generator = None
+    if not args.disable_clue_generation:
+        clue_generator = create_clue_generator(args, api_token)
+
+    if str(args.batch_file) == "-":
+        source = contextlib.nullcontext(sys.stdin)
+    else:
+        source = open(args.batch_file)
+
+    if args.output:
+        target = open(args.output, "w")
+    else:
+        target = contextlib.nullcontext(sys.stdout)
+
+    lines = []
+    with source as file, target as output:
+        crosswords = generate_crosswords(
+            read_word_lists(file, args.allow_repeat, lines),
+            x=args.cols,
+            y=args.rows,
+            seed=args.seed,
+            engine=args.engine,
+            attempts=args.attempts,
+            workers=args.workers,
+            time_budget=args.time_budget,
+            beam_width=args.beam_width,
+            beam_depth=args.beam_depth,
+            stats=args.stats,
+            order=args.word_order,
+        )
+        for index, dimensions, placed_words, *stats in crosswords:
+            clues = None
+            if clue_generator:
+                clues = await clue_generator.acreate(
+                    [item[0] for item in placed_words],
+                    max_concurrency=args.clue_concurrency,
+                    batch_size=args.clue_batch_size,
+                )
+
+            crossword = {
+                "line": lines[index],
+                **serialize(dimensions, placed_words, clues),
+            }
+            if stats:
+                crossword["stats"] = dataclasses.asdict(stats[0])
+
+            output.write(json.dumps(crossword) + "\n")
+            output.flush()
+
+    logger.info(f"{len(lines)} crossword puzzles were generated.")
+
+
 async def run():
     parser = ArgumentParser(
         prog="pycrossword",
         description="A Python cli tool for generating customizable crossword puzzles.",
+        epilog="Large word lists can be compiled once with `pycrossword "
+        "compile-wordlist`, see `pycrossword compile-wordlist --help`, and crossword "
+        "puzzles served over HTTP with `pycrossword serve`, see `pycrossword serve "
+        "--help`.",
         add_help=False,
     )
     args = cli(parser)
@@ -168,39 +769,90 @@ async def run():
         logger.setLevel(logging.ERROR)
 
     try:
-        api_token = args.api_token
-        if not args.disable_clue_generation and not args.api_token:
-            api_token = os.environ.get("OPENAI_API_KEY")
-            if api_token is None:
-                raise OpenAIError(
-                    "OpenAI API token not found. Please provide it via the -t / --api-token argument "
-                    "or set it as the environment variable 'OPENAI_API_KEY'."
-                )
-
+        api_token = get_api_token(args)
         if args.output and not args.force:
             if args.output.exists():
                 raise FileExistsError(f"Output file {args.output} already exists.")
 
+        if args.template and args.batch_file:
+            raise ValueError("A template can't be filled in batch mode.")
+
         logger.info("Preparing to generate crossword puzzles.")
+        if args.batch_file:
+            await run_batch(args, api_token)
+            logger.info("Done. Enjoy your crosswords!")
+            return
+
         if args.words:
             words = prepare_words(args.words, args.allow_repeat)
+        elif WordIndex.is_compiled(args.words_file):
+            # compiled words are normalized already, see compile-wordlist
+            index = WordIndex.open(args.words_file)
+            words = index if args.template else list(index)
         else:
             with open(args.words_file) as f:
                 words = prepare_words(f.read().splitlines(), args.allow_repeat)
 
         total_words = len(words)
         logger.info(f"Starting crossword puzzle generation with {total_words} words.")
-        dimensions, placed_words = generate_crossword(
-            words, x=args.cols, y=args.rows, seed=args.seed
-        )
+        stats = GenerationStats() if args.stats else None
+        clue_generator = None
         if not args.disable_clue_generation:
-            ai_client = OpenAIClient(api_token)
-            clue_generator = ClueGenerator(
-                ai_client, theme=args.theme, difficulty=args.clue_difficulty
+            clue_generator = create_clue_generator(args, api_token)
+
+        clues = None
+        if args.template:
+            with open(args.template) as f:
+                # words are normalized to uppercase, so are the letters of the template
+                template = f.read().upper().split()
+
+            dimensions, placed_words = fill_template(
+                template, words, seed=args.seed, time_budget=args.time_budget
+            )
+        elif (
+            clue_generator is not None
+            and args.attempts == 1
+            and args.engine != CrosswordEngine.BEAM
+        ):
+            # clues are requested as the words are placed
+            dimensions, placed_words, clues = await generate_crossword_with_clues(
+                words,
+                clue_generator,
+                max_concurrency=args.clue_concurrency,
+                batch_size=args.clue_batch_size,
+                x=args.cols,
+                y=args.rows,
+                seed=args.seed,
+                engine=args.engine,
+                time_budget=args.time_budget,
+                stats=stats,
+                order=args.word_order,
             )
-            clues = clue_generator.create([item[0] for item in placed_words])
         else:
-            clues = None
+            dimensions, placed_words = generate_crossword(
+                words,
+                x=args.cols,
+                y=args.rows,
+                seed=args.seed,
+                engine=args.engine,
+                attempts=args.attempts,
+                workers=args.workers or 1,
+                time_budget=args.time_budget,
+                beam_width=args.beam_width,
+                beam_depth=args.beam_depth,
+                stats=stats,
+                order=args.word_order,
+            )
+
+        if stats is not None:
+            logger.info(f"Generation stats: {stats}")
+
+        if clue_generator is not None and clues is None:
+            clues = await clue_generator.acreate(
+                [item[0] for item in placed_words],
+                max_concurrency=args.clue_concurrency,
+                batch_size=args.clue_batch_size,
+            )
 
         logger.info("Finished crossword puzzle generation.")
 
@@ -227,6 +879,16 @@ async def run():
 
 
 def main():
+    if sys.argv[1:2] == ["compile-wordlist"]:
+        run_compile(sys.argv[2:])
+        return
+
+    if sys.argv[1:2] == ["serve"]:
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(run_serve(sys.argv[2:]))
+
+        return
+
     asyncio.run(run())
 
 
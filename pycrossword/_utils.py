@@ -28,6 +28,24 @@ def print_clues(clues: dict, placed_words: list):
         print(f"({item[1]}, {item[2]}), {item[0]}: {clues[item[0]].pop()}")
 
 
+def serialize(dimensions: list, placed_words: list, clues: dict = None) -> dict:
+    return {
+        "dimensions": {"cols": dimensions[0], "rows": dimensions[1]},
+        "placed_words": [
+            {
+                "word": item[0],
+                "starting_position": {
+                    "row": item[1],
+                    "col": item[2],
+                },
+                "direction": "horizontal" if item[3] else "vertical",
+                "clue": clues[item[0]].pop() if clues else None,
+            }
+            for item in placed_words
+        ],
+    }
+
+
 def save(
     file_path: Path,
     as_json: bool,
@@ -37,25 +55,7 @@ def save(
 ):
     if as_json:
         with open(file_path, "w") as f:
-            json.dump(
-                {
-                    "dimensions": {"cols": dimensions[0], "rows": dimensions[1]},
-                    "placed_words": [
-                        {
-                            "word": item[0],
-                            "starting_position": {
-                                "row": item[1],
-                                "col": item[2],
-                            },
-                            "direction": "horizontal" if item[3] else "vertical",
-                            "clue": clues[item[0]].pop() if clues else None,
-                        }
-                        for item in placed_words
-                    ],
-                },
-                f,
-                indent=2,
-            )
+            json.dump(serialize(dimensions, placed_words, clues), f, indent=2)
     else:
         grid = render_crossword(placed_words, dimensions)
         with open(file_path, "w") as sys.stdout:
@@ -1 +1,10 @@
-from .clue import BaseClient, ClueDifficulty, ClueGenerator, OpenAIClient
+from .cache import ClueCache, LRUClueCache
+from .clue import (
+    AsyncBaseClient,
+    AsyncOpenAIClient,
+    BaseClient,
+    ClueDifficulty,
+    ClueGenerator,
+    OpenAIClient,
+)
+from .limits import AdaptiveLimit, RateLimiter, RetryPolicy
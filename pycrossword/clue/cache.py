@@ -0,0 +1,348 @@
+import contextlib
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# seconds a process waits for another one to release the database
+TIMEOUT = 30
+# clues of a word kept in memory by default
+MAX_CLUES = 10
+# clues read but not yet marked as used above which they are marked right away, they
+# are otherwise marked with the next write
+MAX_PENDING_USES = 1000
+# clues added by a process after which it counts the clues again, since the other
+# processes sharing the database add clues too
+COUNT_INTERVAL = 100
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clues (
+    word TEXT NOT NULL,
+    theme TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    model TEXT NOT NULL,
+    clue TEXT NOT NULL,
+    created REAL NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS clues_key ON clues (word, theme, difficulty, model);
+CREATE INDEX IF NOT EXISTS clues_used ON clues (used);
+CREATE INDEX IF NOT EXISTS clues_created ON clues (created);
+"""
+
+
+def default_cache_dir() -> Path:
+    """Return the directory of the clue cache.
+
+    It is $PYCROSSWORD_CACHE_DIR if set, else the pycrossword directory of
+    $XDG_CACHE_HOME or of ~/.cache.
+
+    Returns:
+        Path: The directory.
+    """
+    path = os.environ.get("PYCROSSWORD_CACHE_DIR")
+    if path:
+        return Path(path)
+
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / (
+        "pycrossword"
+    )
+
+
+class ClueCache:
+    """Persistent cache of the generated clues, stored in a SQLite database.
+
+    Clues are keyed by word, theme, difficulty and model, and a key can have several
+    clues. The database is in WAL mode and written in immediate transactions, so several
+    processes can share it: readers don't block the writer, and writers wait for each
+    other up to TIMEOUT seconds. Reads don't write: the clues they return are marked as
+    used with the next write of the process, which is also when the least recently used
+    clues are evicted.
+    """
+
+    __slots__ = (
+        "path",
+        "ttl",
+        "max_entries",
+        "__connection",
+        "__lock",
+        "__uses",
+        "__count",
+        "__added",
+    )
+
+    def __init__(
+        self,
+        path: str | os.PathLike | None = None,
+        ttl: float | None = None,
+        max_entries: int | None = None,
+    ):
+        """Open the cache, creating its database if needed.
+
+        Args:
+            path: Path of the database. Defaults to None (clues.sqlite3 in
+                `default_cache_dir`).
+            ttl: Seconds after which a clue expires. Defaults to None (never).
+            max_entries: Number of clues above which the least recently used ones are
+                evicted. Defaults to None (unbounded).
+
+        Raises:
+            ValueError: If the time to live or the maximum number of entries is not
+                positive.
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError("The time to live of the clues must be positive.")
+
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("The maximum number of clues must be at least 1.")
+
+        if path is None:
+            path = default_cache_dir() / "clues.sqlite3"
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # transactions are managed explicitly, see __execute
+        self.__connection = sqlite3.connect(
+            self.path, timeout=TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.executescript(SCHEMA)
+        self.__lock = threading.Lock()
+        # last use of the clues read since the last write, by rowid
+        self.__uses = {}
+        # number of clues as of the last count, plus the ones added since
+        self.__count = len(self) if max_entries is not None else 0
+        self.__added = 0
+
+    def __reduce__(self) -> tuple:
+        # processes open their own connection to the database
+        return ClueCache, (self.path, self.ttl, self.max_entries)
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return self.__connection.execute("SELECT COUNT(*) FROM clues").fetchone()[0]
+
+    @contextlib.contextmanager
+    def __transaction(self):
+        """Run statements in an immediate transaction, committed unless they fail.
+
+        Yields:
+            sqlite3.Cursor: The cursor to execute the statements with.
+        """
+        with self.__lock:
+            cursor = self.__connection.cursor()
+            # take the write lock upfront, so the transaction can't fail half-way
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+
+            cursor.execute("COMMIT")
+
+    def __write_uses(self, cursor: sqlite3.Cursor):
+        """Mark the clues read since the last write as used."""
+        cursor.executemany(
+            "UPDATE clues SET used = ? WHERE rowid = ?",
+            [(used, rowid) for rowid, used in self.__uses.items()],
+        )
+        self.__uses.clear()
+
+    def get(self, word: str, theme: str, difficulty: str, model: str) -> list:
+        """Return the clues of a key that have not expired, marking them as used.
+
+        Args:
+            word: The word of the clues.
+            theme: The theme of the clues.
+            difficulty: The difficulty level of the clues.
+            model: The model that generated the clues.
+
+        Returns:
+            list: The clues, oldest first.
+        """
+        now = time.time()
+        expiry = -1 if self.ttl is None else now - self.ttl
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT rowid, clue FROM clues WHERE word = ? AND theme = ? "
+                "AND difficulty = ? AND model = ? AND created >= ? ORDER BY rowid",
+                (word, theme, difficulty, model, expiry),
+            ).fetchall()
+            for rowid, _ in rows:
+                self.__uses[rowid] = now
+
+            pending = len(self.__uses)
+
+        if pending >= MAX_PENDING_USES:
+            with self.__transaction() as cursor:
+                self.__write_uses(cursor)
+
+        return [clue for _, clue in rows]
+
+    def add(self, word: str, theme: str, difficulty: str, model: str, clue: str):
+        """Add a clue, evicting the expired clues and the least recently used ones.
+
+        Args:
+            word: The word of the clue.
+            theme: The theme of the clue.
+            difficulty: The difficulty level of the clue.
+            model: The model that generated the clue.
+            clue: The clue.
+        """
+        self.add_many([(word, theme, difficulty, model, clue)])
+
+    def add_many(self, entries: list):
+        """Add clues in a single transaction, evicting the expired clues and the least
+        recently used ones.
+
+        Args:
+            entries: Clues as (word, theme, difficulty, model, clue).
+        """
+        now = time.time()
+        with self.__transaction() as cursor:
+            self.__write_uses(cursor)
+            cursor.executemany(
+                "INSERT INTO clues VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*entry, now, now) for entry in entries],
+            )
+            if self.ttl is not None:
+                cursor.execute("DELETE FROM clues WHERE created < ?", (now - self.ttl,))
+                self.__count -= cursor.rowcount
+
+            if self.max_entries is None:
+                return
+
+            self.__count += len(entries)
+            self.__added += len(entries)
+            # the clues are only counted when they may exceed the bound
+            if self.__count <= self.max_entries and self.__added < COUNT_INTERVAL:
+                return
+
+            count = cursor.execute("SELECT COUNT(*) FROM clues").fetchone()[0]
+            if count > self.max_entries:
+                cursor.execute(
+                    "DELETE FROM clues WHERE rowid IN (SELECT rowid FROM clues "
+                    "ORDER BY used, rowid LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+                count = self.max_entries
+
+            self.__count = count
+            self.__added = 0
+
+    def clear(self):
+        """Remove all the clues."""
+        with self.__transaction() as cursor:
+            cursor.execute("DELETE FROM clues")
+            self.__uses.clear()
+            self.__count = 0
+
+    def close(self):
+        """Mark the clues read as used and close the connection to the database."""
+        if self.__uses:
+            with self.__transaction() as cursor:
+                self.__write_uses(cursor)
+
+        with self.__lock:
+            self.__connection.close()
+
+
+class LRUClueCache(OrderedDict):
+    """In-memory cache of the generated clues, bounded with least recently used eviction.
+
+    Words map to their clues, the least recently used word first. Like a
+    defaultdict, a missing word is added with no clues, which may evict the least
+    recently used word.
+    """
+
+    def __init__(
+        self, max_entries: int | None = None, max_clues: int | None = MAX_CLUES
+    ):
+        """Initialize the cache with its bounds.
+
+        Args:
+            max_entries: Number of words above which the least recently used word is
+                evicted. Defaults to None (unbounded).
+            max_clues: Number of clues of a word above which its oldest clue is
+                evicted, None for unbounded. Defaults to MAX_CLUES.
+
+        Raises:
+            ValueError: If a bound is less than 1.
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("The maximum number of words must be at least 1.")
+
+        if max_clues is not None and max_clues < 1:
+            raise ValueError("The maximum number of clues per word must be at least 1.")
+
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_clues = max_clues
+        self.hits = 0
+        self.misses = 0
+
+    def __missing__(self, word: str) -> list:
+        clues = self[word] = []
+        self.__evict()
+        return clues
+
+    def __evict(self):
+        """Evict the least recently used words above the maximum number of words."""
+        if self.max_entries is not None:
+            while len(self) > self.max_entries:
+                self.popitem(last=False)
+
+    def __reduce__(self) -> tuple:
+        # OrderedDict pickles its items but not the attributes of subclasses
+        return (
+            self.__class__,
+            (self.max_entries, self.max_clues),
+            {"hits": self.hits, "misses": self.misses},
+            None,
+            iter(self.items()),
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        """Returns the share of the lookups that found a clue."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def add(self, word: str, clue: str):
+        """Add a clue of a word, evicting the oldest clue and least recently used word
+        if needed.
+
+        Args:
+            word: The word of the clue.
+            clue: The clue.
+        """
+        clues = self.setdefault(word, [])
+        clues.append(clue)
+        if self.max_clues is not None and len(clues) > self.max_clues:
+            del clues[: len(clues) - self.max_clues]
+
+        self.move_to_end(word)
+        self.__evict()
+
+    def choice(self, word: str) -> str | None:
+        """Return a random clue of a word, marking the word as used.
+
+        Args:
+            word: The word.
+
+        Returns:
+            str | None: A clue if available, else None.
+        """
+        clues = self.get(word)
+        if not clues:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.move_to_end(word)
+        return random.choice(clues)
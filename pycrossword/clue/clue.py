@@ -1,13 +1,26 @@
+import asyncio
+import contextlib
 import enum
+import itertools
+import json
 import random
+import time
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from functools import singledispatchmethod
+from typing import TYPE_CHECKING
 
-from openai import OpenAI
+from .cache import ClueCache, LRUClueCache
+from .limits import AdaptiveLimit, RateLimiter, RetryPolicy, is_pushback
+
+# openai is imported when a client is built, it takes most of the import time
+if TYPE_CHECKING:
+    from openai import APIError
 
 GPT3_TURBO = "gpt-3.5-turbo"
 GPT4_TURBO = "gpt-4-turbo-preview"
+# tokens a completion is expected to use, corrected with its actual usage
+COMPLETION_TOKENS = 100
 
 
 class ClueDifficulty(enum.StrEnum):
@@ -29,45 +42,197 @@ class BaseClient(ABC):
     def render_query(self, *args, **kwargs) -> str:
         raise NotImplementedError
 
+    def render_batch_query(self, *args, **kwargs) -> str:
+        """Create a query for the clues of several words, see `parse_batch_response`.
+
+        Raises:
+            NotImplementedError: If the client doesn't support batched queries.
+        """
+        raise NotImplementedError("The client doesn't support batched queries.")
+
+    def parse_batch_response(self, *args, **kwargs) -> dict:
+        """Parse the response of a batched query into the clues of its words.
+
+        Raises:
+            NotImplementedError: If the client doesn't support batched queries.
+        """
+        raise NotImplementedError("The client doesn't support batched queries.")
+
+
+class AsyncBaseClient(ABC):
+    """Abstract base class for clients interacting with the service asynchronously."""
+
+    @abstractmethod
+    async def request(self, *args, **kwargs) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def render_query(self, *args, **kwargs) -> str:
+        raise NotImplementedError
+
+    def render_batch_query(self, *args, **kwargs) -> str:
+        """Create a query for the clues of several words, see `parse_batch_response`.
+
+        Raises:
+            NotImplementedError: If the client doesn't support batched queries.
+        """
+        raise NotImplementedError("The client doesn't support batched queries.")
+
+    def parse_batch_response(self, *args, **kwargs) -> dict:
+        """Parse the response of a batched query into the clues of its words.
+
+        Raises:
+            NotImplementedError: If the client doesn't support batched queries.
+        """
+        raise NotImplementedError("The client doesn't support batched queries.")
+
+
+def _chat_result(response) -> str:
+    """Return the content of a chat completion.
+
+    Args:
+        response: The chat completion.
+
+    Returns:
+        str: The stripped content of the first choice.
+
+    Raises:
+        ValueError: If no response is received from the model, or it has no choices.
+    """
+    # the request succeeded, retrying it would most likely get the same response
+    if not getattr(response, "choices", None):
+        raise ValueError("No choices in the response of the chat model.")
+
+    chat_result = response.choices[0].message.content
+    if not chat_result:
+        raise ValueError("No response from the chat model.")
+
+    return chat_result.strip()
+
+
+def _chat_options(json_output: bool) -> dict:
+    """Return the options of a chat completion.
+
+    Args:
+        json_output: Whether the model must answer with a JSON object.
+
+    Returns:
+        dict: Keyword arguments of the chat completion, besides the model and messages.
+    """
+    options = {"temperature": 0.9}
+    if json_output:
+        options["response_format"] = {"type": "json_object"}
+
+    return options
+
+
+def _estimate_tokens(query: str) -> int:
+    """Estimate the tokens of a chat completion, about 4 characters per prompt token."""
+    return len(query) // 4 + COMPLETION_TOKENS
+
+
+def _settle(client, estimated: int, response):
+    """Correct the tokens reserved for a request with the usage of its response."""
+    used = getattr(getattr(response, "usage", None), "total_tokens", None)
+    if client.rate_limiter is not None and isinstance(used, int):
+        client.rate_limiter.settle(estimated, used)
+
+
+def _backoff(client, error: "APIError", attempt: int) -> float:
+    """Return the seconds to wait before retrying a failed request of a client.
+
+    When the service pushes back, the rate limiter holds the other requests for as
+    long, and the concurrency limit of an asynchronous client is halved.
+
+    Args:
+        client: The client.
+        error: The error of the request.
+        attempt: Number of the failed attempt, from 0.
+
+    Returns:
+        float: Seconds to wait.
+
+    Raises:
+        APIError: The error, if it can't be retried or the retries are spent.
+    """
+    delay = client.retry_policy.backoff(error, attempt)
+    client.retries += 1
+    if is_pushback(error):
+        if client.rate_limiter is not None:
+            client.rate_limiter.pause(delay)
+
+        if getattr(client, "concurrency", None) is not None:
+            client.concurrency.push_back()
+
+    return delay
+
 
 class OpenAIClient(BaseClient):
     """Implementation of BaseClient using OpenAI API."""
 
-    def __init__(self, api_token: str, model: str = GPT3_TURBO):
+    def __init__(
+        self,
+        api_token: str,
+        model: str = GPT3_TURBO,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        base_url: str | None = None,
+    ):
         """Initialize the OpenAIClient with an API token and model.
 
         Args:
             api_token: The API token for OpenAI.
             model: The model to use for generating clues.
+            rate_limiter: Limit of the requests and tokens per minute. Defaults to None.
+            retry_policy: Retries of the failed requests. Defaults to None (5 retries
+                with a jittered exponential backoff).
+            base_url: URL of an OpenAI-compatible API. Defaults to None (OpenAI API).
         """
-        self.client = OpenAI(api_key=api_token)
+        from openai import OpenAI
+
+        # requests are retried by the retry policy
+        self.client = OpenAI(api_key=api_token, base_url=base_url, max_retries=0)
         self.model = model
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retries = 0
 
-    def request(self, query: str) -> str:
+    def request(self, query: str, json_output: bool = False) -> str:
         """Send a request to the OpenAI API and return the response.
 
         Args:
             query: The query to send to the OpenAI API.
+            json_output: Whether the model must answer with a JSON object.
+                Defaults to False.
 
         Returns:
             str: The response from the OpenAI API.
 
         Raises:
             ValueError: If no response is received from the model.
+            APIError: If the request failed and can't be retried.
         """
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "user", "content": query},
-            ],
-            temperature=0.9,
-        )
-        # todo: handle possible errors (IndexError, ...)
-        chat_result = response.choices[0].message.content
-        if not chat_result:
-            raise ValueError("No response from the chat model.")
-
-        return chat_result.strip()
+        from openai import APIError
+
+        estimated = _estimate_tokens(query)
+        for attempt in itertools.count():
+            if self.rate_limiter is not None:
+                time.sleep(self.rate_limiter.reserve(estimated))
+
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "user", "content": query},
+                    ],
+                    **_chat_options(json_output),
+                )
+            except APIError as e:
+                time.sleep(_backoff(self, e, attempt))
+                continue
+
+            _settle(self, estimated, response)
+            return _chat_result(response)
 
     @staticmethod
     def render_query(word: str, theme: str, difficulty: str) -> str:
@@ -87,18 +252,154 @@ class OpenAIClient(BaseClient):
             f"Output: 1 sentence with a period at the end."
         )
 
+    @staticmethod
+    def render_batch_query(words: list, theme: str, difficulty: str) -> str:
+        """Create a query string for generating the crossword clues of several words.
+
+        Args:
+            words: The words for which to generate clues.
+            theme: The theme for the crossword clues.
+            difficulty: The difficulty level of the crossword clues.
+
+        Returns:
+            str: The query string.
+        """
+        quoted = ", ".join(f"'{word}'" for word in words)
+        return (
+            f"Generate a {difficulty} difficulty crossword clue "
+            f"for each of the words {quoted} "
+            f"with a theme related to {theme}. "
+            f"Output: a JSON object mapping each word, as written, to its clue "
+            f"of 1 sentence with a period at the end."
+        )
+
+    @staticmethod
+    def parse_batch_response(response: str, words: list) -> dict:
+        """Parse the response of a batched query into the clues of its words.
+
+        Words are matched regardless of case, and words that are missing from the
+        response or have no clue in it are left out.
+
+        Args:
+            response: The response to the query, see `render_batch_query`.
+            words: The words of the query.
+
+        Returns:
+            dict: The clue of each word of the response.
+        """
+        # models may wrap the object in a code block despite the json output
+        start, end = response.find("{"), response.rfind("}")
+        try:
+            answer = json.loads(response[start : end + 1])
+        except ValueError:
+            return {}
+
+        if not isinstance(answer, dict):
+            return {}
+
+        requested = {word.upper(): word for word in words}
+        clues = {}
+        for word, clue in answer.items():
+            word = requested.get(str(word).strip().upper())
+            if word is not None and isinstance(clue, str) and clue.strip():
+                clues[word] = clue.strip()
+
+        return clues
+
+
+class AsyncOpenAIClient(AsyncBaseClient):
+    """Implementation of AsyncBaseClient using OpenAI API."""
+
+    def __init__(
+        self,
+        api_token: str,
+        model: str = GPT3_TURBO,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        concurrency: AdaptiveLimit | None = None,
+        base_url: str | None = None,
+    ):
+        """Initialize the AsyncOpenAIClient with an API token and model.
+
+        Args:
+            api_token: The API token for OpenAI.
+            model: The model to use for generating clues.
+            rate_limiter: Limit of the requests and tokens per minute. Defaults to None.
+            retry_policy: Retries of the failed requests. Defaults to None (5 retries
+                with a jittered exponential backoff).
+            concurrency: Limit of the requests in flight, halved when the service
+                pushes back. Defaults to None.
+            base_url: URL of an OpenAI-compatible API. Defaults to None (OpenAI API).
+        """
+        from openai import AsyncOpenAI
+
+        # requests are retried by the retry policy
+        self.client = AsyncOpenAI(api_key=api_token, base_url=base_url, max_retries=0)
+        self.model = model
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.concurrency = concurrency
+        self.retries = 0
+
+    async def request(self, query: str, json_output: bool = False) -> str:
+        """Send a request to the OpenAI API and return the response.
+
+        Args:
+            query: The query to send to the OpenAI API.
+            json_output: Whether the model must answer with a JSON object.
+                Defaults to False.
+
+        Returns:
+            str: The response from the OpenAI API.
+
+        Raises:
+            ValueError: If no response is received from the model.
+            APIError: If the request failed and can't be retried.
+        """
+        from openai import APIError
+
+        estimated = _estimate_tokens(query)
+        for attempt in itertools.count():
+            if self.rate_limiter is not None:
+                await asyncio.sleep(self.rate_limiter.reserve(estimated))
+
+            try:
+                async with self.concurrency or contextlib.nullcontext():
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "user", "content": query},
+                        ],
+                        **_chat_options(json_output),
+                    )
+            except APIError as e:
+                await asyncio.sleep(_backoff(self, e, attempt))
+                continue
+
+            if self.concurrency is not None:
+                self.concurrency.succeed()
+
+            _settle(self, estimated, response)
+            return _chat_result(response)
+
+    render_query = staticmethod(OpenAIClient.render_query)
+    render_batch_query = staticmethod(OpenAIClient.render_batch_query)
+    parse_batch_response = staticmethod(OpenAIClient.parse_batch_response)
+
 
 class ClueGenerator:
     """A class to generate crossword clues using a client."""
 
-    __slots__ = ("client", "theme", "difficulty", "__cacheable", "__clues")
+    __slots__ = ("client", "theme", "difficulty", "cache", "__cacheable", "__clues")
 
     def __init__(
         self,
-        client: BaseClient,
+        client: BaseClient | AsyncBaseClient,
         theme: str = "common",
         difficulty: str = ClueDifficulty.MEDIUM,
         cacheable: bool = True,
+        cache: ClueCache | None = None,
+        memory_cache: LRUClueCache | None = None,
     ):
         """Initialize the ClueGenerator with a client, theme, difficulty, and cacheable flag.
 
@@ -107,12 +408,18 @@ class ClueGenerator:
             theme: The theme for the crossword clues.
             difficulty: The difficulty level of the crossword clues.
             cacheable: Whether the generated clues should be cached.
+            cache: Persistent cache the clues are looked up in before being requested,
+                and saved to. Defaults to None.
+            memory_cache: In-memory cache of the clues of a cacheable generator, to
+                bound its memory. Defaults to None (unbounded words, MAX_CLUES clues
+                per word).
         """
         self.client = client
         self.theme = theme
         self.difficulty = difficulty
+        self.cache = cache
         self.__cacheable = cacheable
-        self.__clues = defaultdict(list)
+        self.__clues = LRUClueCache() if memory_cache is None else memory_cache
 
     @property
     def is_cacheable(self) -> bool:
@@ -121,9 +428,115 @@ class ClueGenerator:
 
     @property
     def clues(self) -> dict:
-        """Returns the dictionary of cached clues."""
+        """Returns the in-memory cache of the clues, mapping words to their clues."""
         return self.__clues
 
+    def __key(self, word: str) -> tuple:
+        """Return the key of the clues of a word in the persistent cache."""
+        model = getattr(self.client, "model", None) or ""
+        return word, self.theme or "", self.difficulty or "", model
+
+    def __store(self, word: str, clue: str, persist: bool = True):
+        """Cache a clue of a word if the generator is cacheable, and persist it."""
+        if self.is_cacheable:
+            self.__clues.add(word, clue)
+
+        if persist and self.cache is not None:
+            self.cache.add(*self.__key(word), clue)
+
+    def __pick(self, word: str, clues: list) -> str | None:
+        """Return a random clue of a word among its clues of the persistent cache."""
+        if not clues:
+            return None
+
+        clue = random.choice(clues)
+        # a clue found again in the persistent cache is kept in memory once
+        if clue not in self.__clues.get(word, ()):
+            self.__store(word, clue, persist=False)
+
+        return clue
+
+    def __cached(self, word: str) -> str | None:
+        """Return a random clue of a word from the persistent cache, if any."""
+        if self.cache is None:
+            return None
+
+        return self.__pick(word, self.cache.get(*self.__key(word)))
+
+    def __lookup(self, words: list) -> list:
+        """Return the clues of each word in the persistent cache."""
+        return [self.cache.get(*self.__key(word)) for word in words]
+
+    def __persist(self, clues: list):
+        """Save the clues, pairs of a word and its clue, to the persistent cache."""
+        self.cache.add_many([(*self.__key(word), clue) for word, clue in clues])
+
+    async def __acached(self, words: list) -> list:
+        """Return a random clue of each word from the persistent cache, None if it has
+        none. The cache is read from a worker thread, so that a locked database doesn't
+        block the event loop.
+        """
+        if self.cache is None:
+            return [None] * len(words)
+
+        found = await asyncio.to_thread(self.__lookup, words)
+        return [self.__pick(word, clues) for word, clues in zip(words, found)]
+
+    async def __astore(self, clues: list):
+        """Cache the clues, pairs of a word and its clue, and persist them from a worker
+        thread.
+        """
+        for word, clue in clues:
+            self.__store(word, clue, persist=False)
+
+        if self.cache is not None and clues:
+            await asyncio.to_thread(self.__persist, clues)
+
+    async def __arequest(self, query: str, json_output: bool = False) -> str:
+        """Send a request with the client, from a worker thread if it is synchronous."""
+        # clients without batched queries may not take the json output flag
+        options = {"json_output": True} if json_output else {}
+        if isinstance(self.client, AsyncBaseClient):
+            return await self.client.request(query, **options)
+
+        return await asyncio.to_thread(self.client.request, query, **options)
+
+    def __parse_batch(self, batch: list, response: str, store: bool = True) -> list:
+        """Parse the response of a batched query and cache the clues of its words.
+
+        Args:
+            batch: The words of the query.
+            response: The response to the query.
+            store: Whether to cache the clues. Defaults to True.
+
+        Returns:
+            list: The clue of each word of the batch, None for the words missing from
+                the response, which must be requested individually.
+        """
+        answer = self.client.parse_batch_response(response, batch)
+        clues = []
+        for word in batch:
+            # a word repeated in the batch gets its clue once, and is retried after
+            clue = answer.pop(word, None)
+            if store and clue is not None:
+                self.__store(word, clue)
+
+            clues.append(clue)
+
+        return clues
+
+    @staticmethod
+    def __batches(words: list, batch_size: int) -> list:
+        """Split the words into batches of at most `batch_size` words.
+
+        Raises:
+            ValueError: If the batch size is less than 1.
+        """
+        if batch_size < 1:
+            raise ValueError("The batch size must be at least 1.")
+
+        return [words[i : i + batch_size] for i in range(0, len(words), batch_size)]
+
     @singledispatchmethod
     def create(self, word: str) -> str:
         """Generate a crossword clue for a single word.
@@ -133,28 +546,159 @@ class ClueGenerator:
 
         Returns:
             str: The generated clue.
+
+        Raises:
+            TypeError: If the client is asynchronous, see `acreate`.
         """
+        if isinstance(self.client, AsyncBaseClient):
+            raise TypeError("Can't create clue with an async client, use acreate.")
+
+        clue = self.__cached(word)
+        if clue is not None:
+            return clue
+
         clue = self.client.request(
             self.client.render_query(word, self.theme, self.difficulty)
         )
-        if self.is_cacheable:
-            self.__clues[word].append(clue)
-
+        self.__store(word, clue)
         return clue
 
     @create.register
-    def _(self, words: list) -> dict:
+    def _(self, words: list, batch_size: int | None = None) -> dict:
         """Generate crossword clues for a list of words.
 
+        With a batch size, the clues of up to `batch_size` words are asked for in a
+        single request answered with a JSON object, and the words missing from the
+        answer are requested individually.
+
         Args:
             words: The list of words for which to generate clues.
+            batch_size: Number of words per request. Defaults to None (one request
+                per word).
 
         Returns:
             defaultdict: A dictionary with words as keys and lists of clues as values.
+
+        Raises:
+            ValueError: If the batch size is less than 1.
+            TypeError: If the client is asynchronous, see `acreate`.
         """
         clues = defaultdict(list)
-        for word in words:
-            clues[word].append(self.create(word))
+        if batch_size is None:
+            for word in words:
+                clues[word].append(self.create(word))
+
+            return clues
+
+        if isinstance(self.client, AsyncBaseClient):
+            raise TypeError("Can't create clue with an async client, use acreate.")
+
+        # only the words missing from the persistent cache are requested
+        results = [self.__cached(word) for word in words]
+        pending = [word for word, clue in zip(words, results) if clue is None]
+        created = []
+        for batch in self.__batches(pending, batch_size):
+            response = self.client.request(
+                self.client.render_batch_query(batch, self.theme, self.difficulty),
+                json_output=True,
+            )
+            for word, clue in zip(batch, self.__parse_batch(batch, response)):
+                created.append(self.create(word) if clue is None else clue)
+
+        created = iter(created)
+        for word, clue in zip(words, results):
+            clues[word].append(next(created) if clue is None else clue)
+
+        return clues
+
+    @singledispatchmethod
+    async def acreate(self, word: str) -> str:
+        """Generate a crossword clue for a single word asynchronously.
+
+        Requests of synchronous clients, and the reads and writes of the persistent
+        cache, are run in a worker thread so that they don't block the event loop.
+
+        Args:
+            word: The word for which to generate a clue.
+
+        Returns:
+            str: The generated clue.
+        """
+        (clue,) = await self.__acached([word])
+        if clue is not None:
+            return clue
+
+        clue = await self.__arequest(
+            self.client.render_query(word, self.theme, self.difficulty)
+        )
+        await self.__astore([(word, clue)])
+        return clue
+
+    @acreate.register
+    async def _(
+        self, words: list, max_concurrency: int = 8, batch_size: int | None = None
+    ) -> dict:
+        """Generate crossword clues for a list of words asynchronously.
+
+        Requests are sent concurrently, at most `max_concurrency` at a time, so the
+        clues take about len(words) / max_concurrency round trips instead of len(words).
+        With a batch size, requests are batched as by `create`.
+
+        Args:
+            words: The list of words for which to generate clues.
+            max_concurrency: Maximum number of requests in flight. Defaults to 8.
+            batch_size: Number of words per request. Defaults to None (one request
+                per word).
+
+        Returns:
+            defaultdict: A dictionary with words as keys and lists of clues as values.
+
+        Raises:
+            ValueError: If the maximum concurrency or the batch size is less than 1.
+        """
+        if max_concurrency < 1:
+            raise ValueError("The maximum concurrency must be at least 1.")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def create(word: str) -> str:
+            async with semaphore:
+                return await self.acreate(word)
+
+        async def create_batch(batch: list) -> list:
+            async with semaphore:
+                response = await self.__arequest(
+                    self.client.render_batch_query(batch, self.theme, self.difficulty),
+                    json_output=True,
+                )
+
+            clues = self.__parse_batch(batch, response, store=False)
+            await self.__astore(
+                [(word, clue) for word, clue in zip(batch, clues) if clue is not None]
+            )
+            retried = iter(
+                await asyncio.gather(
+                    *(create(word) for word, clue in zip(batch, clues) if clue is None)
+                )
+            )
+            return [next(retried) if clue is None else clue for clue in clues]
+
+        # results of gather keep the order of the words
+        if batch_size is None:
+            results = await asyncio.gather(*(create(word) for word in words))
+        else:
+            # only the words missing from the persistent cache are requested
+            results = await self.__acached(words)
+            pending = [word for word, clue in zip(words, results) if clue is None]
+            batches = await asyncio.gather(
+                *(create_batch(batch) for batch in self.__batches(pending, batch_size))
+            )
+            created = iter(clue for batch in batches for clue in batch)
+            results = [next(created) if clue is None else clue for clue in results]
+
+        clues = defaultdict(list)
+        for word, clue in zip(words, results):
+            clues[word].append(clue)
 
         return clues
 
@@ -173,8 +717,4 @@ class ClueGenerator:
         if not self.is_cacheable:
             raise TypeError("Can't get clue from non cacheable generator.")
 
-        clues = self.clues[word]
-        if not clues:
-            return None
-
-        return random.choice(clues)
+        return self.__clues.choice(word)
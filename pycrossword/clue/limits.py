@@ -0,0 +1,326 @@
+"""Client-side limits of the requests to the service.
+
+A RateLimiter keeps the requests under the requests and tokens per minute of the
+service, a RetryPolicy retries the failed requests with a jittered exponential backoff,
+and an AdaptiveLimit bounds the requests in flight, halving the bound when the service
+pushes back and growing it back additively (AIMD).
+"""
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from typing import TYPE_CHECKING
+
+# openai is imported when an error is inspected, it takes most of the import time
+if TYPE_CHECKING:
+    from openai import APIError
+
+# status codes of the responses that are worth retrying
+RETRYABLE_STATUSES = frozenset((408, 409, 429, 500, 502, 503, 504))
+# status codes of the responses telling the client to slow down
+PUSHBACK_STATUSES = frozenset((429, 503))
+
+
+class TokenBucket:
+    """Bucket of tokens refilled continuously at a rate per minute, holding up to a
+    minute of tokens.
+    """
+
+    __slots__ = ("rate", "capacity", "__tokens", "__updated", "__lock")
+
+    def __init__(self, per_minute: float):
+        """Initialize a full bucket.
+
+        Args:
+            per_minute: Tokens added per minute.
+
+        Raises:
+            ValueError: If the rate is not positive.
+        """
+        if per_minute <= 0:
+            raise ValueError("The rate of a token bucket must be positive.")
+
+        self.rate = per_minute / 60
+        self.capacity = per_minute
+        self.__tokens = float(per_minute)
+        self.__updated = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def __refill(self):
+        now = time.monotonic()
+        self.__tokens = min(
+            self.capacity, self.__tokens + (now - self.__updated) * self.rate
+        )
+        self.__updated = now
+
+    def reserve(self, amount: float = 1) -> float:
+        """Take tokens from the bucket, in advance if it doesn't have them yet.
+
+        Args:
+            amount: Number of tokens. Defaults to 1.
+
+        Returns:
+            float: Seconds to wait until the tokens are available.
+        """
+        with self.__lock:
+            self.__refill()
+            self.__tokens -= amount
+            return max(-self.__tokens / self.rate, 0.0)
+
+    def refund(self, amount: float):
+        """Give tokens back to the bucket, or take more of them if negative.
+
+        Args:
+            amount: Number of tokens.
+        """
+        with self.__lock:
+            self.__refill()
+            self.__tokens = min(self.capacity, self.__tokens + amount)
+
+    def pause(self, seconds: float):
+        """Empty the bucket for a number of seconds.
+
+        Args:
+            seconds: Seconds before the bucket has tokens again.
+        """
+        with self.__lock:
+            self.__refill()
+            self.__tokens = min(self.__tokens, -seconds * self.rate)
+
+
+class RateLimiter:
+    """Limit of the requests and of the tokens sent per minute."""
+
+    __slots__ = ("requests", "tokens")
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+    ):
+        """Initialize the limiter with its limits.
+
+        Args:
+            requests_per_minute: Requests per minute. Defaults to None (unlimited).
+            tokens_per_minute: Tokens per minute, of the prompts and the completions.
+                Defaults to None (unlimited).
+        """
+        self.requests = None
+        if requests_per_minute is not None:
+            self.requests = TokenBucket(requests_per_minute)
+
+        self.tokens = None
+        if tokens_per_minute is not None:
+            self.tokens = TokenBucket(tokens_per_minute)
+
+    def __buckets(self) -> list:
+        return [bucket for bucket in (self.requests, self.tokens) if bucket is not None]
+
+    def reserve(self, tokens: float) -> float:
+        """Reserve a request of an estimated number of tokens.
+
+        Args:
+            tokens: Estimated tokens of the request.
+
+        Returns:
+            float: Seconds to wait before sending the request.
+        """
+        delay = 0.0
+        if self.requests is not None:
+            delay = self.requests.reserve()
+
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.reserve(tokens))
+
+        return delay
+
+    def settle(self, estimated: float, used: float):
+        """Correct the tokens of a request once its actual usage is known.
+
+        Args:
+            estimated: Tokens reserved for the request.
+            used: Tokens the request actually used.
+        """
+        if self.tokens is not None:
+            self.tokens.refund(estimated - used)
+
+    def pause(self, seconds: float):
+        """Hold the requests for a number of seconds, as told by the service.
+
+        Args:
+            seconds: Seconds before the next request.
+        """
+        for bucket in self.__buckets():
+            bucket.pause(seconds)
+
+
+def is_pushback(error: Exception) -> bool:
+    """Return whether an error tells the client to slow down."""
+    from openai import APIStatusError, RateLimitError
+
+    return isinstance(error, RateLimitError) or (
+        isinstance(error, APIStatusError) and error.status_code in PUSHBACK_STATUSES
+    )
+
+
+def retry_after(error: Exception) -> float | None:
+    """Return the seconds the service asks to wait before retrying, if it does.
+
+    Args:
+        error: The error of the request.
+
+    Returns:
+        float | None: The seconds of the retry-after-ms or retry-after header.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        return float(headers["retry-after-ms"]) / 1000
+    except (KeyError, TypeError, ValueError):
+        pass
+
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    # or an http date
+    try:
+        return max(
+            email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Retries of the failed requests, with a jittered exponential backoff."""
+
+    __slots__ = ("max_retries", "base_delay", "max_delay", "rng")
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 60.0,
+        rng: random.Random | None = None,
+    ):
+        """Initialize the policy.
+
+        Args:
+            max_retries: Retries of a request before its error is raised. Defaults to 5.
+            base_delay: Seconds of the backoff of the first retry. Defaults to 0.5.
+            max_delay: Maximum seconds of a backoff. Defaults to 60.
+            rng: Random number generator of the jitter. Defaults to None (new one).
+
+        Raises:
+            ValueError: If the retries or the delays are negative.
+        """
+        if max_retries < 0 or base_delay < 0 or max_delay < 0:
+            raise ValueError("The retries and delays must not be negative.")
+
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """Return whether a request that failed with an error is worth retrying."""
+        from openai import APIConnectionError, APIStatusError, InternalServerError
+
+        if isinstance(error, APIStatusError):
+            return error.status_code in RETRYABLE_STATUSES
+
+        return isinstance(error, (APIConnectionError, InternalServerError))
+
+    def backoff(self, error: "APIError", attempt: int) -> float:
+        """Return the seconds to wait before retrying a failed request.
+
+        The delay is drawn between 0 and base_delay * 2 ** attempt (full jitter), so that
+        clients failing together don't retry together. A delay asked for by the service
+        is honoured, with a jitter of up to base_delay.
+
+        Args:
+            error: The error of the request.
+            attempt: Number of the failed attempt, from 0.
+
+        Returns:
+            float: Seconds to wait.
+
+        Raises:
+            APIError: The error, if it can't be retried or the retries are spent.
+        """
+        if attempt >= self.max_retries or not self.is_retryable(error):
+            raise error
+
+        delay = retry_after(error)
+        if delay is not None:
+            return min(delay, self.max_delay) + self.rng.uniform(0, self.base_delay)
+
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class AdaptiveLimit:
+    """Limit of the requests in flight, adapted to the pushback of the service.
+
+    The limit is halved when the service pushes back and grows by one every limit
+    successful requests, so it settles just under the concurrency the service accepts.
+    Requests enter the limit with `async with`.
+    """
+
+    __slots__ = ("minimum", "maximum", "in_flight", "__limit", "__condition")
+
+    def __init__(self, initial: int = 8, minimum: int = 1, maximum: int = 64):
+        """Initialize the limit.
+
+        Args:
+            initial: Initial limit. Defaults to 8.
+            minimum: Minimum limit. Defaults to 1.
+            maximum: Maximum limit. Defaults to 64.
+
+        Raises:
+            ValueError: If the limits are not ordered or the minimum is less than 1.
+        """
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError(
+                "The limits must satisfy 1 <= minimum <= initial <= maximum."
+            )
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.__limit = float(initial)
+        self.__condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Returns the current number of requests allowed in flight."""
+        return int(self.__limit)
+
+    async def __aenter__(self):
+        async with self.__condition:
+            await self.__condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def __aexit__(self, *exc_info):
+        async with self.__condition:
+            self.in_flight -= 1
+            self.__condition.notify_all()
+
+    def succeed(self):
+        """Grow the limit after a successful request."""
+        self.__limit = min(self.__limit + 1 / self.__limit, self.maximum)
+
+    def push_back(self):
+        """Halve the limit after the service pushed back."""
+        self.__limit = max(self.__limit / 2, self.minimum)
@@ -1,8 +1,25 @@
-from ._v2 import generate_crossword
-from .utils import generate_score, random_state
+from ._fill import WordIndex, fill_template
+from ._v2 import generate_crossword, stream_crossword
+from .batch import generate_crosswords
+from .utils import (
+    CrosswordEngine,
+    GenerationStats,
+    WordOrder,
+    calculate_score,
+    generate_score,
+    random_state,
+)
 
 __all__ = (
+    "CrosswordEngine",
+    "GenerationStats",
     "generate_crossword",
+    "generate_crosswords",
+    "stream_crossword",
+    "fill_template",
+    "WordIndex",
+    "WordOrder",
     "random_state",
     "generate_score",
+    "calculate_score",
 )
@@ -0,0 +1,4 @@
+from .index import WordIndex
+from .solver import fill_template
+
+__all__ = ("WordIndex", "fill_template")
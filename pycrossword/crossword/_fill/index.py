@@ -0,0 +1,286 @@
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator
+
+# file format of a compiled index, all little-endian:
+#   header: magic, version, number of buckets, number of bitsets
+#   buckets: length, number of words, bytes per word, offset of the words
+#   bitsets: length, position, letter (code point), offset of the bitset
+#   words of each bucket, utf-8 encoded and padded with NUL bytes to the same size
+#   bitsets, of the number of words of their length in bits rounded up to bytes
+MAGIC = b"PCWI"
+VERSION = 1
+HEADER = struct.Struct("<4sIII")
+BUCKET = struct.Struct("<IIIQ")
+BITSET = struct.Struct("<IIIQ")
+
+
+class WordIndex:
+    """Positional index of a word list for filling crossword templates.
+
+    Words are bucketed by length, and every (length, position, letter) maps to a bitset
+    of the words of that length having that letter at that position, a bit per word.
+    Bitsets are plain ints, so the candidates of a slot are the AND of the bitsets of its
+    filled cells, computed in C over whole machine words.
+
+    An index can be saved to a compiled file and opened again with `WordIndex.open`,
+    which maps the file in memory instead of reading and indexing the words.
+    """
+
+    __slots__ = ("__buckets", "__everything", "__positions")
+
+    def __init__(self, words: Iterable[str]):
+        """Index the words.
+
+        Args:
+            words: Words to index, duplicates are indexed once.
+        """
+        buckets = {}
+        for word in dict.fromkeys(words):
+            buckets.setdefault(len(word), []).append(word)
+
+        self.__buckets = buckets
+        self.__everything = {}
+        self.__positions = {}
+        for length, bucket in buckets.items():
+            self.__everything[length] = (1 << len(bucket)) - 1
+            # bits are set in byte buffers, or-ing growing ints would be quadratic
+            size = (len(bucket) + 7) // 8
+            buffers = [{} for _ in range(length)]
+            for bit, word in enumerate(bucket):
+                byte, mask = divmod(bit, 8)
+                for position, char in enumerate(word):
+                    buffer = buffers[position].get(char)
+                    if buffer is None:
+                        buffer = buffers[position][char] = bytearray(size)
+
+                    buffer[byte] |= 1 << mask
+
+            self.__positions[length] = [
+                {
+                    char: int.from_bytes(buffer, "little")
+                    for char, buffer in letters.items()
+                }
+                for letters in buffers
+            ]
+
+    def __iter__(self) -> Iterator[str]:
+        for length in self.lengths():
+            for bit in range(self.candidates(length).bit_length()):
+                yield self.word(length, bit)
+
+    def __len__(self) -> int:
+        return sum(self.candidates(length).bit_length() for length in self.lengths())
+
+    def lengths(self) -> list:
+        """Return the lengths of the indexed words, in ascending order."""
+        return sorted(self.__buckets)
+
+    def letters(self, length: int, position: int) -> list:
+        """Return the letters the words of a length have at a position.
+
+        Args:
+            length: Length of the words.
+            position: Position of the letters in the words.
+
+        Returns:
+            list: The letters.
+        """
+        return list(self.__positions[length][position])
+
+    def candidates(self, length: int) -> int:
+        """Return the bitset of all the words of a length.
+
+        Args:
+            length: Length of the words.
+
+        Returns:
+            int: Bitset of the words.
+        """
+        return self.__everything.get(length, 0)
+
+    def matching(self, length: int, position: int, char: str) -> int:
+        """Return the bitset of the words of a length having a letter at a position.
+
+        Args:
+            length: Length of the words.
+            position: Position of the letter in the words.
+            char: The letter.
+
+        Returns:
+            int: Bitset of the words.
+        """
+        positions = self.__positions.get(length)
+        if positions is None:
+            return 0
+
+        return positions[position].get(char, 0)
+
+    def word(self, length: int, bit: int) -> str:
+        """Return the word of a length at a bit of the bitsets.
+
+        Args:
+            length: Length of the word.
+            bit: Position of the word in the bitsets.
+
+        Returns:
+            str: The word.
+        """
+        return self.__buckets[length][bit]
+
+    def save(self, path: str | os.PathLike):
+        """Save the index to a compiled file, see `WordIndex.open`.
+
+        The file is written aside and then moved in place, so that processes that have
+        mapped a former version of it keep reading the former version.
+
+        Args:
+            path: Path of the file.
+        """
+        lengths = self.lengths()
+        buckets = []
+        for length in lengths:
+            words = [
+                self.word(length, bit)
+                for bit in range(self.candidates(length).bit_length())
+            ]
+            encoded = [word.encode() for word in words]
+            stride = max(len(word) for word in encoded)
+            buckets.append((length, words, stride, encoded))
+
+        bitsets = [
+            (length, position, char)
+            for length in lengths
+            for position in range(length)
+            for char in sorted(self.letters(length, position))
+        ]
+        offset = HEADER.size + BUCKET.size * len(buckets) + BITSET.size * len(bitsets)
+        temporary = f"{os.fspath(path)}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(buckets), len(bitsets)))
+            for length, words, stride, _ in buckets:
+                f.write(BUCKET.pack(length, len(words), stride, offset))
+                offset += stride * len(words)
+
+            for length, position, char in bitsets:
+                f.write(BITSET.pack(length, position, ord(char), offset))
+                offset += (self.candidates(length).bit_length() + 7) // 8
+
+            for _, _, stride, encoded in buckets:
+                for word in encoded:
+                    f.write(word.ljust(stride, b"\0"))
+
+            for length, position, char in bitsets:
+                size = (self.candidates(length).bit_length() + 7) // 8
+                f.write(self.matching(length, position, char).to_bytes(size, "little"))
+
+        os.replace(temporary, path)
+
+    @staticmethod
+    def is_compiled(path: str | os.PathLike) -> bool:
+        """Return whether a file is a compiled index.
+
+        Args:
+            path: Path of the file.
+
+        Returns:
+            bool: Whether the file starts as a compiled index.
+        """
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+
+    @staticmethod
+    def open(path: str | os.PathLike) -> "WordIndex":
+        """Open a compiled index, see `WordIndex.save`.
+
+        The file is mapped in memory, so opening it doesn't depend on the number of
+        words, and processes opening the same file share its pages. Words and bitsets
+        are read from the file when they are first used.
+
+        Args:
+            path: Path of the file.
+
+        Returns:
+            WordIndex: The index.
+
+        Raises:
+            ValueError: If the file is not a compiled index of this version.
+        """
+        return _MappedWordIndex(path)
+
+
+class _MappedWordIndex(WordIndex):
+    """Word index read from a compiled file mapped in memory."""
+
+    __slots__ = ("path", "__map", "__buckets", "__offsets", "__bitsets")
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, buckets, bitsets = HEADER.unpack_from(self.__map)
+        except struct.error:
+            magic = version = None
+
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a compiled word index.")
+
+        # length -> (number of words, bytes per word, offset of the words)
+        self.__buckets = {}
+        for i in range(buckets):
+            length, count, stride, offset = BUCKET.unpack_from(
+                self.__map, HEADER.size + i * BUCKET.size
+            )
+            self.__buckets[length] = (count, stride, offset)
+
+        # (length, position, letter) -> offset of the bitset, then the bitset once read
+        self.__offsets = {}
+        start = HEADER.size + buckets * BUCKET.size
+        for i in range(bitsets):
+            length, position, char, offset = BITSET.unpack_from(
+                self.__map, start + i * BITSET.size
+            )
+            self.__offsets[(length, position, chr(char))] = offset
+
+        self.__bitsets = {}
+
+    def __reduce__(self) -> tuple:
+        # worker processes map the same file instead of receiving a copy of it
+        return _MappedWordIndex, (self.path,)
+
+    def lengths(self) -> list:
+        return sorted(self.__buckets)
+
+    def letters(self, length: int, position: int) -> list:
+        return [
+            char
+            for (length_, position_, char) in self.__offsets
+            if length_ == length and position_ == position
+        ]
+
+    def candidates(self, length: int) -> int:
+        count = self.__buckets.get(length, (0,))[0]
+        return (1 << count) - 1
+
+    def matching(self, length: int, position: int, char: str) -> int:
+        key = (length, position, char)
+        bitset = self.__bitsets.get(key)
+        if bitset is None:
+            offset = self.__offsets.get(key)
+            if offset is None:
+                return 0
+
+            size = (self.__buckets[length][0] + 7) // 8
+            bitset = self.__bitsets[key] = int.from_bytes(
+                self.__map[offset : offset + size], "little"
+            )
+
+        return bitset
+
+    def word(self, length: int, bit: int) -> str:
+        _, stride, offset = self.__buckets[length]
+        start = offset + bit * stride
+        return self.__map[start : start + stride].rstrip(b"\0").decode()
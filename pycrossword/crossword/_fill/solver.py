@@ -0,0 +1,315 @@
+"""Fill of crossword templates, solved as a constraint satisfaction problem.
+
+The template is a grid of blocks (#), empty cells (.) and letters. Every run of two or
+more cells across or down is a slot to fill with a word of its length; slots that share
+a cell must agree on its letter, and a word fills a single slot.
+
+The search is a depth-first one: the next slot is the one with the fewest candidate
+words left (most constrained first) and every word tried is forward checked, the
+candidates of the crossing slots are narrowed to the words having the crossed letter,
+and the word is tried no further if one of them runs out of candidates. Candidates are
+bitsets of a WordIndex, so narrowing a slot is a single AND.
+"""
+
+import random
+import time
+from collections.abc import Iterable
+
+from .index import WordIndex
+
+BLOCK = "#"
+EMPTY = "."
+# backtracks of the first run of the search, later runs get multiples of it
+RESTART_BACKTRACKS = 64
+
+
+class _Restart(Exception):
+    """Raised when a run of the search spends its backtracks."""
+
+
+class _Slot:
+    """Run of cells to fill with a word."""
+
+    __slots__ = ("x", "y", "horizontal", "length", "crossings", "twins")
+
+    def __init__(self, x: int, y: int, horizontal: bool, length: int):
+        self.x = x
+        self.y = y
+        self.horizontal = horizontal
+        self.length = length
+        # (position in this slot, crossing slot, position in the crossing slot)
+        self.crossings = []
+        # other slots of the same length, which can't take the same word
+        self.twins = []
+
+    def cells(self) -> list:
+        """Return the (x, y) coordinates of the cells of the slot."""
+        if self.horizontal:
+            return [(self.x, self.y + i) for i in range(self.length)]
+
+        return [(self.x + i, self.y) for i in range(self.length)]
+
+
+def parse_template(template: str | list) -> tuple:
+    """Parse a crossword template into its rows and slots.
+
+    Args:
+        template: Rows of the template, as a list or as lines of a string. A row is made
+            of blocks (#), empty cells (.) and letters.
+
+    Returns:
+        tuple: List of rows and list of slots, the across ones and then the down ones,
+            each from the top left.
+
+    Raises:
+        ValueError: If the template is empty or its rows differ in length.
+    """
+    rows = template.split() if isinstance(template, str) else list(template)
+    if not rows or not rows[0]:
+        raise ValueError("The template must have at least one row and one col.")
+
+    if any(len(row) != len(rows[0]) for row in rows):
+        raise ValueError("All the rows of the template must have the same length.")
+
+    slots = []
+    for horizontal in (True, False):
+        lines = rows if horizontal else ["".join(col) for col in zip(*rows)]
+        for i, line in enumerate(lines):
+            start = 0
+            for run in line.split(BLOCK):
+                if len(run) > 1:
+                    x, y = (i, start) if horizontal else (start, i)
+                    slots.append(_Slot(x, y, horizontal, len(run)))
+
+                start += len(run) + 1
+
+    cells = {}
+    for slot in slots:
+        for position, cell in enumerate(slot.cells()):
+            cells.setdefault(cell, []).append((slot, position))
+
+    for crossing in cells.values():
+        if len(crossing) == 2:
+            (across, i), (down, j) = crossing
+            across.crossings.append((i, down, j))
+            down.crossings.append((j, across, i))
+
+    for slot in slots:
+        slot.twins = [
+            twin for twin in slots if twin is not slot and twin.length == slot.length
+        ]
+
+    return rows, slots
+
+
+class _Search:
+    """Depth-first search of the words of the slots, with forward checking."""
+
+    __slots__ = (
+        "index",
+        "slots",
+        "domains",
+        "assigned",
+        "trail",
+        "rng",
+        "deadline",
+        "backtracks",
+    )
+
+    def __init__(
+        self,
+        index: WordIndex,
+        slots: list,
+        domains: dict,
+        rng: random.Random,
+        deadline: float | None = None,
+        backtracks: int | None = None,
+    ):
+        self.index = index
+        self.slots = slots
+        # bitset of the candidate words of each slot
+        self.domains = domains
+        self.assigned = {}
+        # (slot, former domain) of the narrowed slots, to undo them
+        self.trail = []
+        self.rng = rng
+        self.deadline = deadline
+        # backtracks left before the run gives up
+        self.backtracks = backtracks
+
+    def solve(self) -> bool:
+        """Assign a word to every slot left.
+
+        Returns:
+            bool: Whether the slots left could be filled.
+
+        Raises:
+            TimeoutError: If the deadline is passed.
+            _Restart: If the run spent its backtracks.
+        """
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise TimeoutError("The template was not filled within the time budget.")
+
+        # the most constrained slot first, the one with the fewest candidates left
+        slot = min(
+            (slot for slot in self.slots if slot not in self.assigned),
+            key=lambda slot: self.domains[slot].bit_count(),
+            default=None,
+        )
+        if slot is None:
+            return True
+
+        domain = self.domains[slot]
+        size = self.index.candidates(slot.length).bit_length()
+        # rotate the bitset so that the candidates start at a random word
+        shift = self.rng.randrange(size)
+        domain = domain >> shift | (domain & ((1 << shift) - 1)) << (size - shift)
+        while domain:
+            low = domain & -domain
+            domain ^= low
+            bit = (low.bit_length() - 1 + shift) % size
+            mark = len(self.trail)
+            if self.forward_check(slot, self.index.word(slot.length, bit), 1 << bit):
+                self.assigned[slot] = self.index.word(slot.length, bit)
+                if self.solve():
+                    return True
+
+                del self.assigned[slot]
+
+            self.undo(mark)
+            if self.backtracks is not None:
+                self.backtracks -= 1
+                if self.backtracks < 0:
+                    raise _Restart
+
+        return False
+
+    def forward_check(self, slot: _Slot, word: str, bit: int) -> bool:
+        """Narrow the candidates of the slots left to those compatible with a word.
+
+        Args:
+            slot: The slot the word is tried in.
+            word: The word.
+            bit: Bit of the word in the bitsets.
+
+        Returns:
+            bool: Whether every slot left still has candidates.
+        """
+        for i, crossing, j in slot.crossings:
+            if crossing not in self.assigned and not self.narrow(
+                crossing, self.index.matching(crossing.length, j, word[i])
+            ):
+                return False
+
+        for twin in slot.twins:
+            if twin not in self.assigned and not self.narrow(twin, ~bit):
+                return False
+
+        return True
+
+    def narrow(self, slot: _Slot, mask: int) -> bool:
+        """Narrow the candidates of a slot with a mask.
+
+        Args:
+            slot: The slot.
+            mask: Bitset of the words the slot can keep.
+
+        Returns:
+            bool: Whether the slot still has candidates.
+        """
+        domain = self.domains[slot] & mask
+        if domain != self.domains[slot]:
+            self.trail.append((slot, self.domains[slot]))
+            self.domains[slot] = domain
+
+        return domain != 0
+
+    def undo(self, mark: int):
+        """Restore the candidates narrowed since the trail had the given length.
+
+        Args:
+            mark: Length of the trail to go back to.
+        """
+        while len(self.trail) > mark:
+            slot, domain = self.trail.pop()
+            self.domains[slot] = domain
+
+
+def __luby(run: int) -> int:
+    """Return the term of the Luby sequence (1, 1, 2, 1, 1, 2, 4, ...) for a run from 1."""
+    while run != (1 << run.bit_length()) - 1:
+        run -= (1 << (run.bit_length() - 1)) - 1
+
+    return 1 << (run.bit_length() - 1)
+
+
+def fill_template(
+    template: str | list,
+    words: Iterable[str] | WordIndex,
+    seed: int | None = None,
+    rng: random.Random | None = None,
+    time_budget: float | None = None,
+) -> tuple:
+    """Fill a crossword template with words.
+
+    Letters of the template are kept, and must match the case of the words, see
+    `prepare_words`.
+
+    Args:
+        template: Rows of the template, as a list or as lines of a string. A row is made
+            of blocks (#), empty cells (.) and letters.
+        words: Words to fill the template with, or a WordIndex of them to reuse it
+            between templates.
+        seed: Random seed for reproducibility. Defaults to None.
+        rng: Random number generator to use instead of a seed. Defaults to None.
+        time_budget: Seconds after which the search gives up. Defaults to None.
+
+    Returns:
+        tuple: Dimension list (cols, rows) and placement list [word, x, y, horizontal],
+            as returned by `generate_crossword`.
+
+    Raises:
+        ValueError: If the template is invalid, if both a seed and a random number
+            generator are given, or if the template can't be filled with the words.
+        TimeoutError: If the time budget is spent before the template is filled.
+    """
+    if seed is not None and rng is not None:
+        raise ValueError("Either a seed or a random number generator can be given.")
+
+    if seed is not None:
+        rng = random.Random(seed)
+
+    rng = rng or random.Random()
+    index = words if isinstance(words, WordIndex) else WordIndex(words)
+    rows, slots = parse_template(template)
+    domains = {}
+    for slot in slots:
+        domain = index.candidates(slot.length)
+        for position, (x, y) in enumerate(slot.cells()):
+            if rows[x][y] != EMPTY:
+                domain &= index.matching(slot.length, position, rows[x][y])
+
+        domains[slot] = domain
+
+    if not all(domains.values()):
+        raise ValueError("The template can't be filled with the words.")
+
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    # the time to fill a template varies wildly with the first words tried, so runs that
+    # get stuck are restarted with other words and a growing number of backtracks
+    run = 1
+    while True:
+        backtracks = RESTART_BACKTRACKS * __luby(run)
+        search = _Search(index, slots, domains.copy(), rng, deadline, backtracks)
+        try:
+            if not search.solve():
+                raise ValueError("The template can't be filled with the words.")
+
+            break
+        except _Restart:
+            run += 1
+
+    placed_words = [
+        [search.assigned[slot], slot.x, slot.y, slot.horizontal] for slot in slots
+    ]
+    return (len(rows[0]), len(rows)), placed_words
@@ -1,3 +1,3 @@
-from .generator import generate_crossword
+from .generator import generate_crossword, stream_crossword
 
-__all__ = ("generate_crossword",)
+__all__ = ("generate_crossword", "stream_crossword")
@@ -1,11 +1,24 @@
 import random
-from collections import defaultdict
-
-from ..utils import generate_score, random_state
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Callable, Generator
+
+from ..utils import (
+    CrosswordEngine,
+    GenerationStats,
+    WordOrder,
+    calculate_score,
+    generate_score,
+    measure,
+)
+from .grid import Grid
+from .ordering import letter_masks, order_words
 
 
 def __place(
-    word: str, crossword: dict, x, y, horizontal: bool, dimensions: list
+    word: str, crossword: Grid, x, y, horizontal: bool, dimensions: list
 ) -> tuple:
     """Place a word onto the crossword grid.
 
@@ -45,15 +58,65 @@ def __place_first(word: str) -> tuple:
     Returns:
         tuple: Initialized crossword grid and dimensions list.
     """
-    crossword = defaultdict(str)
+    crossword = Grid()
     return __place(word, crossword, 0, 0, True, [0, 0, 0, 0])
 
 
-def __check_horizontal_placement(word: str, offset: int, crossword: dict, x, y) -> bool:
-    """Check if placing the word horizontally is valid at the given position.
+def __expand_dimensions(word: str, x, y, horizontal: bool, dimensions: list) -> tuple:
+    """Calculate the dimensions the crossword grid would have after placing a word.
 
     Args:
         word: The word to place.
+        x: Starting x-coordinate.
+        y: Starting y-coordinate.
+        horizontal: True if placing horizontally, False if placing vertically.
+        dimensions: Current crossword dimensions [min_x, max_x, min_y, max_y].
+
+    Returns:
+        tuple: New crossword dimensions (min_x, max_x, min_y, max_y).
+    """
+    if horizontal:
+        return (
+            dimensions[0],
+            dimensions[1],
+            min(dimensions[2], y),
+            max(dimensions[3], y + len(word) - 1),
+        )
+
+    return (
+        min(dimensions[0], x),
+        max(dimensions[1], x + len(word) - 1),
+        dimensions[2],
+        dimensions[3],
+    )
+
+
+def __count_new_cells(word: bytes, crossword: Grid, x, y, horizontal: bool) -> int:
+    """Count the empty cells of the grid that placing the word would fill.
+
+    Args:
+        word: The word to place, encoded with the letter codes of the grid.
+        crossword: The current crossword grid.
+        x: Starting x-coordinate.
+        y: Starting y-coordinate.
+        horizontal: True if placing horizontally, False if placing vertically.
+
+    Returns:
+        int: Number of cells the placement adds to the grid.
+    """
+    cells = crossword.cells
+    start = crossword.index(x, y)
+    step = 1 if horizontal else crossword.width
+    return sum(1 for i in range(len(word)) if not cells[start + i * step])
+
+
+def __check_horizontal_placement(
+    word: bytes, offset: int, crossword: Grid, x, y
+) -> bool:
+    """Check if placing the word horizontally is valid at the given position.
+
+    Args:
+        word: The word to place, encoded with the letter codes of the grid.
         offset: Offset position within the word.
         crossword: The current crossword grid.
         x: Starting x-coordinate.
@@ -62,32 +125,37 @@ def __check_horizontal_placement(word: str, offset: int, crossword: dict, x, y)
     Returns:
         bool: True if placement is valid, False otherwise.
     """
-    y -= offset
+    visit = crossword.visit
+    start = crossword.index(x, y - offset)
+    # neighbour rows of the word
+    above = start - crossword.width
+    below = start + crossword.width
 
-    if crossword[(x, y - 1)] != "" or crossword[(x, y + len(word))] != "":
+    if visit(start - 1) or visit(start + len(word)):
         return False
 
     for i in range(len(word)):
         if i == offset:
             continue
 
-        if crossword[(x, y + i)] != word[i] and crossword[(x, y + i)] != "":
+        cell = visit(start + i)
+        if cell != word[i] and cell:
             return False
 
-        if crossword[(x - 1, y + i)] != "":
+        if visit(above + i):
             return False
 
-        if crossword[(x + 1, y + i)] != "":
+        if visit(below + i):
             return False
 
     return True
 
 
-def __check_vertical_placement(word: str, offset: int, crossword: dict, x, y) -> bool:
+def __check_vertical_placement(word: bytes, offset: int, crossword: Grid, x, y) -> bool:
     """Check if placing the word vertically is valid at the given position.
 
     Args:
-        word: The word to place.
+        word: The word to place, encoded with the letter codes of the grid.
         offset: Offset position within the word.
         crossword: The current crossword grid.
         x: Starting x-coordinate.
@@ -96,32 +164,36 @@ def __check_vertical_placement(word: str, offset: int, crossword: dict, x, y) ->
     Returns:
         bool: True if placement is valid, False otherwise.
     """
-    x -= offset
+    visit = crossword.visit
+    start = crossword.index(x - offset, y)
+    step = crossword.width
 
-    if crossword[(x - 1, y)] != "" or crossword[(x + len(word), y)] != "":
+    if visit(start - step) or visit(start + len(word) * step):
         return False
 
     for i in range(len(word)):
         if i == offset:
             continue
 
-        if crossword[(x + i, y)] != word[i] and crossword[(x + i, y)] != "":
+        cell = visit(start + i * step)
+        if cell != word[i] and cell:
             return False
 
-        if crossword[(x + i, y - 1)] != "":
+        # neighbour cols of the word
+        if visit(start + i * step - 1):
             return False
 
-        if crossword[(x + i, y + 1)] != "":
+        if visit(start + i * step + 1):
             return False
 
     return True
 
 
-def __find_placements(word: str, offset: int, crossword: dict, x, y) -> list:
+def __find_placements(word: bytes, offset: int, crossword: Grid, x, y) -> list:
     """Find valid placements for a word at the given offset within the crossword grid.
 
     Args:
-        word: The word to place.
+        word: The word to place, encoded with the letter codes of the grid.
         offset: Offset position within the word.
         crossword: The current crossword grid.
         x: Starting x-coordinate.
@@ -140,92 +212,533 @@ def __find_placements(word: str, offset: int, crossword: dict, x, y) -> list:
     return start_points
 
 
-def __generate_crossword(
-    words: list, x: int | None = None, y: int | None = None
+def score_placements(
+    word: bytes,
+    crossword: Grid,
+    dimensions: list,
+    allocated: int,
+    x: int | None = None,
+    y: int | None = None,
+    stats: GenerationStats | None = None,
+) -> list:
+    """Find the valid placements of a word on the crossword grid and score them.
+
+    Args:
+        word: The word to place, encoded with the letter codes of the grid.
+        crossword: The current crossword grid.
+        dimensions: Current crossword dimensions [min_x, max_x, min_y, max_y].
+        allocated: Number of filled cells of the crossword grid.
+        x: Optional width constraint for the crossword grid. Defaults to None.
+        y: Optional height constraint for the crossword grid. Defaults to None.
+        stats: Stats the search is counted in. Defaults to None.
+
+    Returns:
+        list: Placements within the constraints as (score, (x, y, horizontal), filled
+            cells after the placement, dimensions after the placement), in search order.
+    """
+    placements = []
+    for i in range(len(word)):
+        anchors = crossword.anchors(word[i])
+        for _, anchor_x, anchor_y in anchors:
+            placements.extend(__find_placements(word, i, crossword, anchor_x, anchor_y))
+
+        if stats is not None:
+            stats.anchors += len(anchors)
+
+    scored = []
+    for placement in placements:
+        # candidates are measured without touching the grid, only the winner is placed
+        new_dimensions = __expand_dimensions(word, *placement, dimensions)
+
+        if (
+            x
+            and new_dimensions[3] - new_dimensions[2] >= x
+            or y
+            and new_dimensions[1] - new_dimensions[0] >= y
+        ):
+            continue
+
+        new_allocated = allocated + __count_new_cells(word, crossword, *placement)
+        new_score = calculate_score(new_allocated, new_dimensions)
+        scored.append((new_score, placement, new_allocated, new_dimensions))
+
+    if stats is not None:
+        stats.candidates += len(placements)
+        stats.rejected_by_bounds += len(placements) - len(scored)
+        stats.score_calls += len(scored)
+
+    return scored
+
+
+def __find_best_placement(
+    word: bytes,
+    crossword: Grid,
+    dimensions: list,
+    allocated: int,
+    x: int | None = None,
+    y: int | None = None,
+    stats: GenerationStats | None = None,
 ) -> tuple:
-    """Generate a crossword puzzle using the given list of words.
+    """Find the best scoring placement for a word on the crossword grid.
+
+    Args:
+        word: The word to place, encoded with the letter codes of the grid.
+        crossword: The current crossword grid.
+        dimensions: Current crossword dimensions [min_x, max_x, min_y, max_y].
+        allocated: Number of filled cells of the crossword grid.
+        x: Optional width constraint for the crossword grid. Defaults to None.
+        y: Optional height constraint for the crossword grid. Defaults to None.
+        stats: Stats the search is counted in. Defaults to None.
+
+    Returns:
+        tuple: Best placement (x, y, horizontal) or None, and the number of filled cells
+            after the placement.
+    """
+    best_score = 0
+    best_placement = None
+    best_allocated = allocated
+    scored = score_placements(word, crossword, dimensions, allocated, x, y, stats)
+    for new_score, placement, new_allocated, _ in scored:
+        if new_score > best_score:
+            best_score = new_score
+            best_placement = placement
+            best_allocated = new_allocated
+
+    if stats is not None:
+        stats.rejected_by_score += len(scored) - (best_placement is not None)
+
+    return best_placement, best_allocated
+
+
+def __iter_placements(
+    words: list,
+    x: int | None = None,
+    y: int | None = None,
+    engine: str = CrosswordEngine.PYTHON,
+    rng: random.Random | None = None,
+    time_budget: float | None = None,
+    progress: Callable[[int, int, float], None] | None = None,
+    cancel: threading.Event | None = None,
+    stats: GenerationStats | None = None,
+    order: str = WordOrder.RANDOM,
+) -> Generator[list, None, tuple]:
+    """Generate a crossword puzzle using the given list of words, placement by placement.
+
+    Placements are committed greedily, so each one is final once yielded.
 
     Args:
         words: List of words to use for the crossword puzzle.
         x: Optional width constraint for the crossword grid. Defaults to None.
         y: Optional height constraint for the crossword grid. Defaults to None.
+        engine: Engine used to search placements. Defaults to CrosswordEngine.PYTHON.
+        rng: Random number generator shuffling the words. Defaults to None (new one).
+        time_budget: Seconds after which the generation stops. Defaults to None.
+        progress: Callback called with the number of placed words, the number of pending
+            words and the current score after each word. Defaults to None.
+        cancel: Event that stops the generation once set. Defaults to None.
+        stats: Stats the generation is counted in. Defaults to None.
+        order: Order the words are placed in. Defaults to WordOrder.RANDOM.
+
+    Yields:
+        list: The placements [word, x, y, horizontal], as they are committed.
 
     Returns:
         tuple: Final crossword grid, dimensions list and placement list.
     """
-    random.shuffle(words)
+    find_best_placement = __find_best_placement
+    if engine == CrosswordEngine.NUMPY:
+        # numpy is imported only by the engine that needs it
+        from . import vectorized
+
+        if vectorized.available:
+            find_best_placement = vectorized.find_best_placement
+
+    order_words(words, rng, order, x)
+    masks = letter_masks(words)
     word_ = words.pop(0)
     placed_words = [[word_, 0, 0, True]]
     crossword_, dimensions = __place_first(word_)
+    yield placed_words[0]
+    # letters on the grid, a word sharing none of them has nothing to cross
+    letters = masks[word_]
+    allocated = len(word_)
+    deadline = None if time_budget is None else time.monotonic() + time_budget
     count = 0
     while len(words) > 0 and count < len(words):
+        # the crossword only grows, so stopping early returns the best layout so far
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+
+        if cancel is not None and cancel.is_set():
+            break
+
         word_ = words.pop(0)
-        placements = []
-        for i in range(len(word_)):
-            for coords, value in crossword_.copy().items():
-                if value == word_[i]:
-                    placements.extend(__find_placements(word_, i, crossword_, *coords))
-
-        best_score = 0
-        best_crossword = crossword_.copy()
         best_placement = None
-        best_dimensions = []
-        for placement in placements:
-            new_crossword, new_dimensions = __place(
-                word_, crossword_.copy(), *placement, dimensions.copy()
-            )
-
-            if (
-                x
-                and new_dimensions[3] - new_dimensions[2] >= x
-                or y
-                and new_dimensions[1] - new_dimensions[0] >= y
-            ):
-                continue
-
-            new_score = generate_score(new_crossword, new_dimensions)
-            if new_score > best_score:
-                best_score = new_score
-                best_crossword = new_crossword
-                best_placement = placement
-                best_dimensions = new_dimensions
-
-        if best_score > 0:
-            crossword_ = best_crossword
-            dimensions = best_dimensions
+        if masks[word_] & letters:
+            codes = crossword_.encode(word_)
+            crossword_.reserve_placements(len(word_), dimensions)
+            with measure(stats, "search"):
+                best_placement, best_allocated = find_best_placement(
+                    codes, crossword_, dimensions, allocated, x, y, stats
+                )
+        elif stats is not None:
+            stats.skipped += 1
+
+        if best_placement is not None:
+            # commit the winner onto the live grid, so that its anchor index stays current
+            with measure(stats, "place"):
+                __place(word_, crossword_, *best_placement, dimensions)
+
+            allocated = best_allocated
+            letters |= masks[word_]
             placed_words.append([word_, *best_placement])
+            yield placed_words[-1]
             count = 0
         else:
             words.append(word_)
             count += 1
+            if stats is not None:
+                stats.requeued += 1
+
+        if progress is not None:
+            progress(
+                len(placed_words), len(words), calculate_score(allocated, dimensions)
+            )
+            if stats is not None:
+                stats.score_calls += 1
 
     return crossword_, dimensions, placed_words
 
 
+def __generate_crossword(*args, **kwargs) -> tuple:
+    """Generate a crossword puzzle using the given list of words.
+
+    Args:
+        args: Positional arguments of `__iter_placements`.
+        kwargs: Keyword arguments of `__iter_placements`.
+
+    Returns:
+        tuple: Final crossword grid, dimensions list and placement list.
+    """
+    placements = __iter_placements(*args, **kwargs)
+    while True:
+        try:
+            next(placements)
+        except StopIteration as stop:
+            return stop.value
+
+
+def __normalize(dimensions: list, placed_words: list) -> tuple:
+    """Move the placements so that the top left cell of the grid is (0, 0).
+
+    Args:
+        dimensions: Dimensions list of the grid.
+        placed_words: Placement list, moved in place.
+
+    Returns:
+        tuple: Dimension list (cols, rows) and placement list.
+    """
+    rows = dimensions[1] - dimensions[0] + 1
+    cols = dimensions[3] - dimensions[2] + 1
+    for i in range(len(placed_words)):
+        placed_words[i][1] = placed_words[i][1] - dimensions[0]
+        placed_words[i][2] = placed_words[i][2] - dimensions[2]
+
+    return (cols, rows), placed_words
+
+
+def __attempt(
+    words: list,
+    x: int | None = None,
+    y: int | None = None,
+    engine: str = CrosswordEngine.PYTHON,
+    rng: random.Random | None = None,
+    deadline: float | None = None,
+    progress: Callable[[int, int, float], None] | None = None,
+    cancel: threading.Event | None = None,
+    beam_width: int = 4,
+    beam_depth: int | None = None,
+    stats: GenerationStats | None = None,
+    order: str = WordOrder.RANDOM,
+) -> tuple:
+    """Run a single attempt of the crossword puzzle generation.
+
+    Args:
+        words: List of words to use for the crossword puzzle.
+        x: Optional width constraint for the crossword grid. Defaults to None.
+        y: Optional height constraint for the crossword grid. Defaults to None.
+        engine: Engine used to search placements. Defaults to CrosswordEngine.PYTHON.
+        rng: Random number generator shuffling the words. Defaults to None (new one).
+        deadline: Time (as of time.time, to be shared with worker processes) when the
+            generation stops. Defaults to None.
+        progress: Callback called after each word. Defaults to None.
+        cancel: Event that stops the generation once set. Defaults to None.
+        beam_width: Width of the beam search, see CrosswordEngine.BEAM. Defaults to 4.
+        beam_depth: Depth of the beam search, see CrosswordEngine.BEAM.
+            Defaults to None.
+        stats: Stats the attempt is counted in, returned as they may be filled in a
+            worker process. Defaults to None.
+        order: Order the words are placed in. Defaults to WordOrder.RANDOM.
+
+    Returns:
+        tuple: Rank of the attempt (number of placed words, score), dimensions list,
+            placement list and stats.
+    """
+    time_budget = None if deadline is None else deadline - time.time()
+    with measure(stats, "total"):
+        if engine == CrosswordEngine.BEAM:
+            # imported here, the beam search builds on this module
+            from .._v3 import generate_crossword as generate_beam_crossword
+
+            crossword, dimensions, placed_words = generate_beam_crossword(
+                words,
+                x,
+                y,
+                rng,
+                time_budget,
+                progress,
+                cancel,
+                beam_width,
+                beam_depth,
+                stats,
+                order,
+            )
+        else:
+            crossword, dimensions, placed_words = __generate_crossword(
+                words, x, y, engine, rng, time_budget, progress, cancel, stats, order
+            )
+
+        rank = len(placed_words), generate_score(crossword, dimensions)
+
+    if stats is not None:
+        stats.score_calls += 1
+
+    return rank, dimensions, placed_words, stats
+
+
 def generate_crossword(
-    words: list, x: int | None = None, y: int | None = None, seed: int | None = None
+    words: list,
+    x: int | None = None,
+    y: int | None = None,
+    seed: int | None = None,
+    engine: str = CrosswordEngine.PYTHON,
+    attempts: int = 1,
+    workers: int = 1,
+    rng: random.Random | None = None,
+    time_budget: float | None = None,
+    progress: Callable[[int, int, float], None] | None = None,
+    cancel: threading.Event | None = None,
+    beam_width: int = 4,
+    beam_depth: int | None = None,
+    stats: GenerationStats | None = None,
+    order: str = WordOrder.RANDOM,
 ) -> tuple:
     """Generate a crossword puzzle from the given list of words.
 
+    The generation uses its own random number generator rather than the global one of
+    the `random` module, so concurrent generations, e.g. in threads, don't interfere and
+    stay reproducible for a seed.
+
+    With several attempts, each one shuffles the words with its own seed (seed, seed + 1,
+    ...) and the crossword that places the most words wins, ties are broken by the
+    highest score and then by the lowest seed. So the result depends on the seed and the
+    number of attempts only, not on the number of workers.
+
+    The generation can be bounded: once the time budget is spent or the cancel event is
+    set, it stops and returns the best crossword generated so far. Attempts that have not
+    started by then are skipped.
+
     Args:
         words: List of words to use for the crossword puzzle.
         x: Optional width constraint for the crossword grid. Defaults to None.
         y: Optional height constraint for the crossword grid. Defaults to None.
         seed: Random seed for reproducibility. Defaults to None.
+        engine: Engine used to search placements, CrosswordEngine.NUMPY requires numpy
+            and falls back to CrosswordEngine.PYTHON without it. Both engines produce
+            the same crossword. CrosswordEngine.BEAM keeps several partial layouts
+            instead of committing greedily to the best placement of each word.
+            Defaults to CrosswordEngine.PYTHON.
+        attempts: Number of independent attempts to generate the crossword. Defaults to 1.
+        workers: Number of processes running the attempts. Defaults to 1 (no processes).
+        rng: Random number generator to use instead of a seed, with several attempts it
+            only draws the seed of the first one. Defaults to None.
+        time_budget: Seconds after which the generation stops. Defaults to None.
+        progress: Callback called with the number of placed words, the number of pending
+            words and the current score after each word (by every attempt). It can't be
+            used with several workers. Defaults to None.
+        cancel: Event that stops the generation once set. It can't be used with several
+            workers. Defaults to None.
+        beam_width: Number of partial layouts kept by CrosswordEngine.BEAM, and of
+            placements each layout is expanded with. Defaults to 4.
+        beam_depth: Number of words after which CrosswordEngine.BEAM collapses to its
+            best layout. Defaults to None (never).
+        stats: Stats the counts and timings of the generation are added to, those of
+            every attempt. Defaults to None.
+        order: Order the words are placed in. WordOrder.CONNECTIVITY places first the
+            words with the most letters in common with the others, from a seed word that
+            fits the width constraint, each next word crossing the previous ones if
+            possible. Defaults to WordOrder.RANDOM.
 
     Returns:
         tuple: Dimension list and placement list.
+
+    Raises:
+        ValueError: If the number of attempts or workers is less than 1, if both a seed
+            and a random number generator are given, if a progress callback or a cancel
+            event is given with several workers, or if the beam width or depth is less
+            than 1.
     """
+    if attempts < 1:
+        raise ValueError("The number of attempts must be at least 1.")
+
+    if workers < 1:
+        raise ValueError("The number of workers must be at least 1.")
+
+    if seed is not None and rng is not None:
+        raise ValueError("Either a seed or a random number generator can be given.")
+
+    if workers > 1 and attempts > 1 and (progress is not None or cancel is not None):
+        raise ValueError("Progress and cancel can't be used with several workers.")
+
+    if beam_width < 1 or (beam_depth is not None and beam_depth < 1):
+        raise ValueError("The beam width and depth must be at least 1.")
+
     if seed is not None:
-        with random_state(seed):
-            _, dimensions, placed_words = __generate_crossword(words, x, y)
+        rng = random.Random(seed)
+
+    deadline = None if time_budget is None else time.time() + time_budget
+    if attempts == 1:
+        _, dimensions, placed_words, _ = __attempt(
+            words,
+            x,
+            y,
+            engine,
+            rng,
+            deadline,
+            progress,
+            cancel,
+            beam_width,
+            beam_depth,
+            stats,
+            order,
+        )
     else:
-        _, dimensions, placed_words = __generate_crossword(words, x, y)
+        if seed is None:
+            seed = (rng or random.Random()).randrange(2**32)
+
+        seeds = range(seed, seed + attempts)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, attempts)) as executor:
+                results = list(
+                    executor.map(
+                        __attempt,
+                        [words.copy() for _ in seeds],
+                        repeat(x),
+                        repeat(y),
+                        repeat(engine),
+                        [random.Random(s) for s in seeds],
+                        repeat(deadline),
+                        repeat(None),
+                        repeat(None),
+                        repeat(beam_width),
+                        repeat(beam_depth),
+                        [None if stats is None else GenerationStats() for _ in seeds],
+                        repeat(order),
+                    )
+                )
+        else:
+            results = []
+            for s in seeds:
+                if results and (
+                    deadline is not None
+                    and time.time() >= deadline
+                    or cancel is not None
+                    and cancel.is_set()
+                ):
+                    break
+
+                results.append(
+                    __attempt(
+                        words.copy(),
+                        x,
+                        y,
+                        engine,
+                        random.Random(s),
+                        deadline,
+                        progress,
+                        cancel,
+                        beam_width,
+                        beam_depth,
+                        None if stats is None else GenerationStats(),
+                        order,
+                    )
+                )
+
+        if stats is not None:
+            for *_, attempt_stats in results:
+                stats.merge(attempt_stats)
+
+        # max keeps the first of equally ranked attempts, the one with the lowest seed
+        _, dimensions, placed_words, _ = max(results, key=lambda result: result[0])
+
+    return __normalize(dimensions, placed_words)
+
+
+def stream_crossword(
+    words: list,
+    x: int | None = None,
+    y: int | None = None,
+    seed: int | None = None,
+    engine: str = CrosswordEngine.PYTHON,
+    rng: random.Random | None = None,
+    time_budget: float | None = None,
+    cancel: threading.Event | None = None,
+    stats: GenerationStats | None = None,
+    order: str = WordOrder.RANDOM,
+) -> Generator[list, None, tuple]:
+    """Generate a crossword puzzle from the given list of words, yielding each placement
+    as soon as it is committed.
+
+    The placements are those of a single attempt of `generate_crossword` with the same
+    arguments, so work that depends on the placed words, such as generating their clues,
+    can start while the layout continues. The grid may still grow up or left, so the
+    coordinates of the yielded placements are relative to the first word, and they are
+    moved to the top left cell of the grid once the generation is done.
 
-    rows = dimensions[1] - dimensions[0] + 1
-    cols = dimensions[3] - dimensions[2] + 1
-    for i in range(len(placed_words)):
-        placed_words[i][1] = placed_words[i][1] - dimensions[0]
-        placed_words[i][2] = placed_words[i][2] - dimensions[2]
+    Args:
+        words: List of words to use for the crossword puzzle.
+        x: Optional width constraint for the crossword grid. Defaults to None.
+        y: Optional height constraint for the crossword grid. Defaults to None.
+        seed: Random seed for reproducibility. Defaults to None.
+        engine: Engine used to search placements, CrosswordEngine.PYTHON or
+            CrosswordEngine.NUMPY. Defaults to CrosswordEngine.PYTHON.
+        rng: Random number generator to use instead of a seed. Defaults to None.
+        time_budget: Seconds after which the generation stops. Defaults to None.
+        cancel: Event that stops the generation once set. Defaults to None.
+        stats: Stats the counts and timings of the generation are added to.
+            Defaults to None.
+        order: Order the words are placed in. Defaults to WordOrder.RANDOM.
+
+    Yields:
+        list: The placements [word, x, y, horizontal], as they are committed.
 
-    return (cols, rows), placed_words
+    Returns:
+        tuple: Dimension list and placement list, as returned by `generate_crossword`.
+
+    Raises:
+        ValueError: If both a seed and a random number generator are given, or if the
+            engine is CrosswordEngine.BEAM, whose placements are final only at the end.
+    """
+    if seed is not None and rng is not None:
+        raise ValueError("Either a seed or a random number generator can be given.")
+
+    if engine == CrosswordEngine.BEAM:
+        raise ValueError("The placements of the beam engine can't be streamed.")
+
+    if seed is not None:
+        rng = random.Random(seed)
+
+    _, dimensions, placed_words = yield from __iter_placements(
+        words, x, y, engine, rng, time_budget, None, cancel, stats, order
+    )
+    return __normalize(dimensions, placed_words)
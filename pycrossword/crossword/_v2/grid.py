@@ -0,0 +1,225 @@
+from array import array
+from bisect import insort
+from collections.abc import Iterator, Mapping
+
+
+class Grid(Mapping):
+    """Dense crossword grid backed by a growable bytearray.
+
+    Letters are stored as small integer codes (0 is an empty cell) in a row-major buffer
+    that covers the rows [top, top + height) and the cols [left, left + width). The buffer
+    grows on demand, so coordinates can be negative, as with the former dict based grid.
+
+    As a mapping, the grid exposes only its filled cells: (x, y) -> letter.
+
+    Every cell also remembers the moment it was first visited (read through `visit` or
+    written), in 4 bytes per cell. Anchors of a letter are ordered by that moment, which is
+    the order the former dict based grid produced, so seeded layouts stay the same.
+    """
+
+    __slots__ = (
+        "cells",
+        "ranks",
+        "top",
+        "left",
+        "width",
+        "height",
+        "clock",
+        "__codes",
+        "__letters",
+        "__anchors",
+        "__allocated",
+    )
+
+    def __init__(self):
+        self.cells = bytearray(1)
+        self.ranks = array("I", [0])
+        self.top = 0
+        self.left = 0
+        self.width = 1
+        self.height = 1
+        self.clock = 0
+        self.__codes = {}
+        self.__letters = [""]
+        self.__anchors = {}
+        self.__allocated = 0
+
+    def __getitem__(self, key: tuple) -> str:
+        x, y = key
+        if not (
+            self.top <= x < self.top + self.height
+            and self.left <= y < self.left + self.width
+        ):
+            raise KeyError(key)
+
+        code = self.cells[self.index(x, y)]
+        if not code:
+            raise KeyError(key)
+
+        return self.__letters[code]
+
+    def __setitem__(self, key: tuple, char: str):
+        x, y = key
+        self.reserve(x, x, y, y)
+        i = self.index(x, y)
+        if self.cells[i]:
+            return
+
+        if not self.ranks[i]:
+            self.clock += 1
+            self.ranks[i] = self.clock
+
+        code = self.encode(char)[0]
+        self.cells[i] = code
+        self.__allocated += 1
+        insort(self.__anchors.setdefault(code, []), (self.ranks[i], x, y))
+
+    def __iter__(self) -> Iterator[tuple]:
+        for i, code in enumerate(self.cells):
+            if code:
+                yield self.top + i // self.width, self.left + i % self.width
+
+    def __len__(self) -> int:
+        return self.__allocated
+
+    def copy(self) -> "Grid":
+        """Return an independent copy of the grid."""
+        grid = Grid.__new__(Grid)
+        grid.cells = self.cells[:]
+        grid.ranks = self.ranks[:]
+        grid.top = self.top
+        grid.left = self.left
+        grid.width = self.width
+        grid.height = self.height
+        grid.clock = self.clock
+        grid.__codes = self.__codes.copy()
+        grid.__letters = self.__letters.copy()
+        grid.__anchors = {code: cells[:] for code, cells in self.__anchors.items()}
+        grid.__allocated = self.__allocated
+        return grid
+
+    def index(self, x: int, y: int) -> int:
+        """Return the position of the (x, y) cell in the buffer.
+
+        The cell must lie within the reserved area, see `reserve`.
+        """
+        return (x - self.top) * self.width + (y - self.left)
+
+    def visit(self, i: int) -> int:
+        """Read the letter code of the cell at the buffer position, 0 if the cell is empty.
+
+        The read is not pure: an empty cell read for the first time is ranked, as the
+        former defaultdict grid inserted a key on every read of a missing cell. Which
+        anchors a later letter gets first depends on those ranks, so the placement checks
+        must read through this method to keep seeded layouts the same.
+
+        Args:
+            i: Position of the cell in the buffer.
+
+        Returns:
+            int: Letter code of the cell.
+        """
+        code = self.cells[i]
+        if not code and not self.ranks[i]:
+            self.clock += 1
+            self.ranks[i] = self.clock
+
+        return code
+
+    def encode(self, word: str) -> bytes:
+        """Encode the word with the letter codes of the grid.
+
+        Args:
+            word: The word to encode.
+
+        Returns:
+            bytes: Letter codes of the word.
+
+        Raises:
+            ValueError: If the grid runs out of letter codes.
+        """
+        for char in word:
+            if char not in self.__codes:
+                if len(self.__letters) > 255:
+                    raise ValueError("The crossword can't hold more than 255 letters.")
+
+                self.__codes[char] = len(self.__letters)
+                self.__letters.append(char)
+
+        return bytes(self.__codes[char] for char in word)
+
+    def anchors(self, code: int) -> list:
+        """Return the filled cells holding the letter code.
+
+        Args:
+            code: Letter code.
+
+        Returns:
+            list: Cells as (rank, x, y), ordered by the moment they were first visited.
+        """
+        return self.__anchors.get(code, [])
+
+    def reserve(self, min_x: int, max_x: int, min_y: int, max_y: int):
+        """Grow the buffer, if needed, to cover the rows [min_x, max_x] and cols [min_y, max_y].
+
+        Args:
+            min_x: Top row to cover.
+            max_x: Bottom row to cover.
+            min_y: Left col to cover.
+            max_y: Right col to cover.
+        """
+        bottom = self.top + self.height - 1
+        right = self.left + self.width - 1
+        if (
+            min_x >= self.top
+            and max_x <= bottom
+            and min_y >= self.left
+            and max_y <= right
+        ):
+            return
+
+        # grow by at least half of the current size to keep reallocations rare
+        slack_x = self.height // 2
+        slack_y = self.width // 2
+        top = min(self.top, min_x - slack_x) if min_x < self.top else self.top
+        bottom = max(bottom, max_x + slack_x) if max_x > bottom else bottom
+        left = min(self.left, min_y - slack_y) if min_y < self.left else self.left
+        right = max(right, max_y + slack_y) if max_y > right else right
+
+        width = right - left + 1
+        height = bottom - top + 1
+        cells = bytearray(width * height)
+        ranks = array("I", [0]) * (width * height)
+        for row in range(self.height):
+            source = row * self.width
+            target = (row + self.top - top) * width + self.left - left
+            cells[target : target + self.width] = self.cells[
+                source : source + self.width
+            ]
+            ranks[target : target + self.width] = self.ranks[
+                source : source + self.width
+            ]
+
+        self.cells = cells
+        self.ranks = ranks
+        self.top = top
+        self.left = left
+        self.width = width
+        self.height = height
+
+    def reserve_placements(self, length: int, dimensions: list):
+        """Grow the buffer, if needed, to cover every placement of a word crossing the
+        crossword, with its end caps and the neighbours of its letters.
+
+        Args:
+            length: Length of the word.
+            dimensions: Current crossword dimensions [min_x, max_x, min_y, max_y].
+        """
+        # the longest reach of a placement and its neighbours
+        margin = length + 1
+        self.reserve(
+            dimensions[0] - margin,
+            dimensions[1] + margin,
+            dimensions[2] - margin,
+            dimensions[3] + margin,
+        )
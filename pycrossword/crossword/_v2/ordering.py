@@ -0,0 +1,132 @@
+"""Ordering of the words of the v2 generator.
+
+Besides the random order, words can be ordered by their crossings: two words cross on
+each pair of equal letters, so the letter counts of the words make up a crossing graph
+without listing its edges. Words with the most crossings per letter come first, starting
+with a seed word that fits the width constraint, and each next word shares a letter with
+the words before it whenever possible, so the grid grows from crossing to crossing
+instead of requeueing words that have nothing to cross yet.
+"""
+
+import random
+from collections import Counter
+
+from ..utils import WordOrder
+
+
+def letter_masks(words: list) -> dict:
+    """Map the words to bitmasks of their letters, with one bit per distinct letter.
+
+    Args:
+        words: List of words.
+
+    Returns:
+        dict: Bitmask of the letters of each word.
+    """
+    bits = {}
+    masks = {}
+    for word in words:
+        mask = 0
+        for char in word:
+            mask |= bits.setdefault(char, 1 << len(bits))
+
+        masks[word] = mask
+
+    return masks
+
+
+def __crossings(counts: list) -> list:
+    """Count the crossings of each word with the other words.
+
+    Args:
+        counts: Letter counts of the words.
+
+    Returns:
+        list: Number of pairs of equal letters of each word and of the other words.
+    """
+    totals = Counter()
+    for letters in counts:
+        totals.update(letters)
+
+    return [
+        sum(count * (totals[char] - count) for char, count in letters.items())
+        for letters in counts
+    ]
+
+
+def __connect(ranked: list, counts: list, seed: int) -> list:
+    """Order the words from the seed, each next word sharing a letter with the previous ones.
+
+    Args:
+        ranked: Indexes of the words, the preferred ones first.
+        counts: Letter counts of the words.
+        seed: Index of the first word.
+
+    Returns:
+        list: Indexes of the words, the words that share no letter with the others last.
+    """
+    rank = {i: position for position, i in enumerate(ranked)}
+    # words of each letter, the preferred ones first, consumed from the head
+    by_letter = {}
+    for i in ranked:
+        for char in counts[i]:
+            by_letter.setdefault(char, []).append(i)
+
+    heads = dict.fromkeys(by_letter, 0)
+    ordered = [seed]
+    used = {seed}
+    letters = set(counts[seed])
+    while True:
+        best = None
+        for char in letters:
+            queue = by_letter[char]
+            head = heads[char]
+            while head < len(queue) and queue[head] in used:
+                head += 1
+
+            heads[char] = head
+            if head < len(queue) and (best is None or rank[queue[head]] < rank[best]):
+                best = queue[head]
+
+        if best is None:
+            break
+
+        ordered.append(best)
+        used.add(best)
+        letters.update(counts[best])
+
+    ordered.extend(i for i in ranked if i not in used)
+    return ordered
+
+
+def order_words(
+    words: list,
+    rng: random.Random | None = None,
+    order: str = WordOrder.RANDOM,
+    x: int | None = None,
+):
+    """Order the words in place for the generation.
+
+    Args:
+        words: List of words to order.
+        rng: Random number generator shuffling the words, equally ranked words keep the
+            shuffled order. Defaults to None (new one).
+        order: Strategy of the ordering. Defaults to WordOrder.RANDOM.
+        x: Optional width constraint for the crossword grid, the seed word of
+            WordOrder.CONNECTIVITY fits it if possible. Defaults to None.
+    """
+    (rng or random.Random()).shuffle(words)
+    if order != WordOrder.CONNECTIVITY or not words:
+        return
+
+    counts = [Counter(word) for word in words]
+    crossings = __crossings(counts)
+    # sort is stable, equally ranked words keep the shuffled order
+    ranked = sorted(
+        range(len(words)),
+        key=lambda i: crossings[i] / max(len(words[i]), 1),
+        reverse=True,
+    )
+    # the seed word is placed horizontally, without checking the constraints
+    seed = next((i for i in ranked if not x or len(words[i]) <= x), ranked[0])
+    words[:] = [words[i] for i in __connect(ranked, counts, seed)]
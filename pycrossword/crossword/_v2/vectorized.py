@@ -0,0 +1,221 @@
+"""Placement search of the v2 generator vectorized with NumPy.
+
+All candidate placements of a word are validated and scored as a batch over a NumPy view
+of the grid buffer, instead of one cell at a time. The search reproduces the pure-Python
+one exactly: same candidates in the same order, same scores and the same cells marked as
+visited, so both engines produce the same crossword for a seed.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from ..utils import GenerationStats
+from .grid import Grid
+
+available = np is not None
+
+
+def __anchors(crossword: Grid, cells, word) -> tuple:
+    """Find the anchors of a word, in the order of `Grid.anchors` letter by letter.
+
+    The filled cells are read from the buffer at once rather than from the anchor lists
+    of the grid, which would take a Python loop over every anchor of every letter.
+
+    Args:
+        crossword: The current crossword grid.
+        cells: Letter codes of the grid buffer.
+        word: Letter codes of the word.
+
+    Returns:
+        tuple: Buffer positions of the anchors and offsets of the anchors in the word.
+    """
+    ranks = np.frombuffer(crossword.ranks, dtype=f"u{crossword.ranks.itemsize}")
+    filled = np.flatnonzero(cells)
+    letters = cells[filled]
+    # filled cells grouped by letter, each group in the order the cells were visited
+    order = np.lexsort((ranks[filled], letters))
+    filled = filled[order]
+    letters = letters[order]
+    starts = np.searchsorted(letters, word, "left")
+    ends = np.searchsorted(letters, word, "right")
+    anchors = np.concatenate([filled[a:b] for a, b in zip(starts, ends)])
+    offsets = np.repeat(np.arange(len(word)), ends - starts)
+    return anchors, offsets
+
+
+def __probe(cells, word, offsets, starts, step: int, across: int) -> tuple:
+    """Validate a batch of placements in one direction.
+
+    The cells of a placement are probed in the order of the pure-Python check: both ends
+    of the word, then each cell of the word followed by its two neighbours across it,
+    skipping the anchor. A check stops at the first probe that fails. Most placements
+    fail at their ends, so the cells of the word are only probed for the others.
+
+    Args:
+        cells: Letter codes of the grid buffer.
+        word: Letter codes of the word.
+        offsets: Offset of the anchor within the word, per placement.
+        starts: Buffer position of the first letter, per placement.
+        step: Distance between two consecutive letters of the word in the buffer.
+        across: Distance between a letter and its neighbours across the word.
+
+    Returns:
+        tuple: Positions actually read, their placement and probe indices, mask of the
+            valid placements and number of empty cells the valid placements fill.
+    """
+    length = len(word)
+    ends = np.stack((starts - step, starts + length * step), axis=1)
+    values = cells[ends]
+    # the far end is only read if the near one is empty
+    end_read = np.ones(ends.shape, dtype=bool)
+    end_read[:, 1] = values[:, 0] == 0
+    rows = np.flatnonzero(~values.any(axis=1))
+
+    body = starts[rows, None] + np.arange(length) * step
+    positions = np.stack((body, body - across, body + across), axis=2).reshape(
+        -1, length * 3
+    )
+    values = cells[positions]
+    failed = values != 0
+    # a letter of the word may cross a matching letter of the grid
+    failed[:, ::3] &= values[:, ::3] != word
+    skipped = np.repeat(np.arange(length) == offsets[rows, None], 3, axis=1)
+    failed &= ~skipped
+    body_valid = ~failed.any(axis=1)
+    first = np.where(body_valid, length * 3, failed.argmax(axis=1))
+    read = (np.arange(length * 3) <= first[:, None]) & ~skipped
+
+    valid = np.zeros(len(starts), dtype=bool)
+    valid[rows] = body_valid
+    new_cells = np.zeros(len(starts), dtype=np.int64)
+    new_cells[rows] = (values[:, ::3] == 0).sum(axis=1)
+
+    end_rows, end_probes = np.nonzero(end_read)
+    body_rows, body_probes = np.nonzero(read)
+    read_positions = np.concatenate((ends[end_read], positions[read]))
+    read_rows = np.concatenate((end_rows, rows[body_rows]))
+    read_probes = np.concatenate((end_probes, body_probes + 2))
+    return read_positions, read_rows, read_probes, valid, new_cells
+
+
+def __visit(crossword: Grid, cells, positions, order):
+    """Mark the empty cells at the positions as visited, in the order of their keys.
+
+    Args:
+        crossword: The current crossword grid.
+        cells: Letter codes of the grid buffer.
+        positions: Probed buffer positions.
+        order: Keys of the positions, in the order they were read.
+    """
+    ranks = np.frombuffer(crossword.ranks, dtype=f"u{crossword.ranks.itemsize}")
+    unvisited = (cells[positions] == 0) & (ranks[positions] == 0)
+    positions = positions[unvisited]
+    positions = positions[np.argsort(order[unvisited])]
+    unique, first = np.unique(positions, return_index=True)
+    unique = unique[np.argsort(first)]
+    ranks[unique] = crossword.clock + 1 + np.arange(len(unique))
+    crossword.clock += len(unique)
+
+
+def __score(allocated, rows, cols):
+    """Vectorized counterpart of `calculate_score`, computed with the same float steps."""
+    size_ratio = np.where(rows - 1 > cols - 1, cols / rows, rows / cols)
+    area = rows * cols
+    free = area - allocated
+    filled_ratio = np.divide(allocated, free, out=np.zeros(free.shape), where=free != 0)
+    return size_ratio * 10 + filled_ratio * 20
+
+
+def find_best_placement(
+    word: bytes,
+    crossword: Grid,
+    dimensions: list,
+    allocated: int,
+    x: int | None = None,
+    y: int | None = None,
+    stats: GenerationStats | None = None,
+) -> tuple:
+    """Find the best scoring placement for a word on the crossword grid.
+
+    Args:
+        word: The word to place, encoded with the letter codes of the grid.
+        crossword: The current crossword grid.
+        dimensions: Current crossword dimensions [min_x, max_x, min_y, max_y].
+        allocated: Number of filled cells of the crossword grid.
+        x: Optional width constraint for the crossword grid. Defaults to None.
+        y: Optional height constraint for the crossword grid. Defaults to None.
+        stats: Stats the search is counted in, as by the pure-Python search.
+            Defaults to None.
+
+    Returns:
+        tuple: Best placement (x, y, horizontal) or None, and the number of filled cells
+            after the placement.
+    """
+    length = len(word)
+    width = crossword.width
+    cells = np.frombuffer(crossword.cells, dtype=np.uint8)
+    codes = np.frombuffer(word, dtype=np.uint8)
+    anchors, offsets = __anchors(crossword, cells, codes)
+    if not len(anchors):
+        return None, allocated
+
+    if stats is not None:
+        stats.anchors += len(anchors)
+
+    anchors_x = crossword.top + anchors // width
+    anchors_y = crossword.left + anchors % width
+
+    h_positions, h_rows, h_probes, h_valid, h_cells = __probe(
+        cells, codes, offsets, anchors - offsets, 1, width
+    )
+    v_positions, v_rows, v_probes, v_valid, v_cells = __probe(
+        cells, codes, offsets, anchors - offsets * width, width, 1
+    )
+    # each anchor is checked horizontally and then vertically
+    probes = 2 + length * 3
+    __visit(
+        crossword,
+        cells,
+        np.concatenate((h_positions, v_positions)),
+        np.concatenate(
+            (h_rows * 2 * probes + h_probes, (v_rows * 2 + 1) * probes + v_probes)
+        ),
+    )
+
+    # dimensions and filled cells after each placement, horizontal ones first
+    starts_x = np.stack((anchors_x, anchors_x - offsets), axis=1)
+    starts_y = np.stack((anchors_y - offsets, anchors_y), axis=1)
+    min_x = np.minimum(dimensions[0], starts_x)
+    max_x = np.maximum(dimensions[1], starts_x + [0, length - 1])
+    min_y = np.minimum(dimensions[2], starts_y)
+    max_y = np.maximum(dimensions[3], starts_y + [length - 1, 0])
+    new_cells = np.stack((h_cells, v_cells), axis=1)
+
+    valid = np.stack((h_valid, v_valid), axis=1)
+    candidates = int(valid.sum())
+    if x:
+        valid &= max_y - min_y < x
+
+    if y:
+        valid &= max_x - min_x < y
+
+    new_allocated = allocated + new_cells
+    scores = __score(new_allocated, max_x - min_x + 1, max_y - min_y + 1)
+    scores = np.where(valid, scores, 0.0).ravel()
+    best = int(scores.argmax())
+    if stats is not None:
+        # only the candidates within the constraints count as scored
+        scored = int(valid.sum())
+        stats.candidates += candidates
+        stats.rejected_by_bounds += candidates - scored
+        stats.score_calls += scored
+        stats.rejected_by_score += scored - int(scores[best] > 0)
+
+    if scores[best] <= 0:
+        return None, allocated
+
+    k, vertical = divmod(best, 2)
+    placement = (int(starts_x[k, vertical]), int(starts_y[k, vertical]), not vertical)
+    return placement, int(new_allocated[k, vertical])
@@ -0,0 +1,3 @@
+from .generator import generate_crossword
+
+__all__ = ("generate_crossword",)
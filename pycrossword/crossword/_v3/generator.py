@@ -0,0 +1,256 @@
+import random
+import threading
+import time
+from typing import Callable
+
+from .._v2.generator import score_placements
+from .._v2.grid import Grid
+from .._v2.ordering import order_words
+from ..utils import GenerationStats, WordOrder, calculate_score, measure
+
+
+class _Layout:
+    """Partial crossword layout of the beam: grid, placed words and pending words."""
+
+    __slots__ = (
+        "crossword",
+        "dimensions",
+        "allocated",
+        "score",
+        "placed_words",
+        "words",
+        "count",
+    )
+
+    def __init__(
+        self,
+        crossword: Grid,
+        dimensions: list,
+        allocated: int,
+        placed_words: list,
+        words: list,
+        count: int = 0,
+    ):
+        self.crossword = crossword
+        self.dimensions = dimensions
+        self.allocated = allocated
+        self.score = calculate_score(allocated, dimensions)
+        self.placed_words = placed_words
+        self.words = words
+        self.count = count
+
+    @property
+    def is_done(self) -> bool:
+        """Returns whether no pending word can be placed anymore."""
+        return not self.words or self.count >= len(self.words)
+
+    @property
+    def rank(self) -> tuple:
+        """Returns the key layouts are ranked by: placed words, then score."""
+        return len(self.placed_words), self.score
+
+
+def __expand(
+    layout: _Layout,
+    x: int | None,
+    y: int | None,
+    width: int,
+    stats: GenerationStats | None = None,
+) -> list:
+    """List the successors of a layout for its next pending word.
+
+    Args:
+        layout: The layout to expand.
+        x: Optional width constraint for the crossword grid.
+        y: Optional height constraint for the crossword grid.
+        width: Number of best placements of the word to expand the layout with.
+        stats: Stats the search is counted in. Defaults to None.
+
+    Returns:
+        list: Successors as (rank, layout, placement), placement is None if the word
+            can't be placed and goes back to the end of the pending words.
+    """
+    word = layout.words[0]
+    codes = layout.crossword.encode(word)
+    dimensions = layout.dimensions
+    layout.crossword.reserve_placements(len(word), dimensions)
+    placements = score_placements(
+        codes, layout.crossword, dimensions, layout.allocated, x, y, stats
+    )
+    if not placements:
+        return [(layout.rank, layout, None)]
+
+    if stats is not None:
+        stats.rejected_by_score += max(len(placements) - width, 0)
+
+    # sort is stable, the earliest of equally scored placements stays first
+    placements.sort(key=lambda placement: placement[0], reverse=True)
+    return [
+        ((len(layout.placed_words) + 1, placement[0]), layout, placement)
+        for placement in placements[:width]
+    ]
+
+
+def __advance(layout: _Layout, placement: tuple | None, reuse: bool) -> _Layout:
+    """Build the successor of a layout.
+
+    Args:
+        layout: The expanded layout.
+        placement: Scored placement of the next pending word, None to postpone the word.
+        reuse: Whether the layout is not needed anymore and can be modified in place.
+
+    Returns:
+        _Layout: The successor layout.
+    """
+    words = layout.words if reuse else layout.words.copy()
+    word = words.pop(0)
+    if placement is None:
+        words.append(word)
+        if reuse:
+            layout.count += 1
+            return layout
+
+        return _Layout(
+            layout.crossword.copy(),
+            layout.dimensions.copy(),
+            layout.allocated,
+            layout.placed_words.copy(),
+            words,
+            layout.count + 1,
+        )
+
+    _, (start_x, start_y, horizontal), allocated, dimensions = placement
+    crossword = layout.crossword if reuse else layout.crossword.copy()
+    for i, char in enumerate(word):
+        if horizontal:
+            crossword[(start_x, start_y + i)] = char
+        else:
+            crossword[(start_x + i, start_y)] = char
+
+    return _Layout(
+        crossword,
+        list(dimensions),
+        allocated,
+        [*layout.placed_words, [word, start_x, start_y, horizontal]],
+        words,
+    )
+
+
+def generate_crossword(
+    words: list,
+    x: int | None = None,
+    y: int | None = None,
+    rng: random.Random | None = None,
+    time_budget: float | None = None,
+    progress: Callable[[int, int, float], None] | None = None,
+    cancel: threading.Event | None = None,
+    width: int = 4,
+    depth: int | None = None,
+    stats: GenerationStats | None = None,
+    order: str = WordOrder.RANDOM,
+) -> tuple:
+    """Generate a crossword puzzle using beam search over the placements of the words.
+
+    Words are taken in order, as by the greedy generator, but instead of
+    committing to the best placement of each word, the search keeps the `width` best
+    partial layouts, ranked by placed words and then by score, and expands each one with
+    the `width` best placements of its next word. A word that can't be placed goes back
+    to the end of the pending words of its layout. With a `depth`, the beam collapses to
+    its best layout every `depth` words, which bounds how far alternatives are explored.
+    With a width of 1 the search is the greedy generator.
+
+    A beam of width w costs about as much as w greedy attempts, and it is not
+    established that it places more words for that cost: on real word lists in bounded
+    grids, the best of w greedy attempts places as many words or slightly more, see
+    the beam benchmark of tests/benchmarks.
+
+    Args:
+        words: List of words to use for the crossword puzzle.
+        x: Optional width constraint for the crossword grid. Defaults to None.
+        y: Optional height constraint for the crossword grid. Defaults to None.
+        rng: Random number generator shuffling the words. Defaults to None (new one).
+        time_budget: Seconds after which the generation stops. Defaults to None.
+        progress: Callback called with the number of placed words, the number of pending
+            words and the current score of the best layout after each word.
+            Defaults to None.
+        cancel: Event that stops the generation once set. Defaults to None.
+        width: Number of layouts kept, and of placements each layout is expanded with.
+            Defaults to 4.
+        depth: Number of words after which the beam collapses to its best layout.
+            Defaults to None (never).
+        stats: Stats the generation is counted in, placements that are not expanded
+            count as rejected by score. Defaults to None.
+        order: Order the words are placed in. Defaults to WordOrder.RANDOM.
+
+    Returns:
+        tuple: Final crossword grid, dimensions list and placement list.
+
+    Raises:
+        ValueError: If the width or the depth is less than 1.
+    """
+    if width < 1:
+        raise ValueError("The beam width must be at least 1.")
+
+    if depth is not None and depth < 1:
+        raise ValueError("The beam depth must be at least 1.")
+
+    order_words(words, rng, order, x)
+    word_ = words.pop(0)
+    crossword_ = Grid()
+    for i, char in enumerate(word_):
+        crossword_[(0, i)] = char
+
+    beam = [
+        _Layout(
+            crossword_,
+            [0, 0, 0, len(word_) - 1],
+            len(word_),
+            [[word_, 0, 0, True]],
+            words,
+        )
+    ]
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    step = 0
+    while not all(layout.is_done for layout in beam):
+        # layouts only grow, so stopping early returns the best layout so far
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+
+        if cancel is not None and cancel.is_set():
+            break
+
+        successors = []
+        with measure(stats, "search"):
+            for layout in beam:
+                if layout.is_done:
+                    successors.append((layout.rank, layout, False))
+                else:
+                    successors.extend(__expand(layout, x, y, width, stats))
+
+        # sort is stable, equally ranked successors keep the order they were found in
+        successors.sort(key=lambda successor: successor[0], reverse=True)
+        successors = successors[:width]
+
+        step += 1
+        if depth is not None and step % depth == 0:
+            successors = successors[:1]
+
+        # a layout can be modified in place by its last successor only
+        last = {id(layout): i for i, (_, layout, _) in enumerate(successors)}
+        beam = []
+        with measure(stats, "place"):
+            for i, (_, layout, placement) in enumerate(successors):
+                if placement is False:
+                    beam.append(layout)
+                else:
+                    beam.append(__advance(layout, placement, last[id(layout)] == i))
+
+        if stats is not None:
+            stats.requeued += sum(placement is None for *_, placement in successors)
+
+        if progress is not None:
+            best = beam[0]
+            progress(len(best.placed_words), len(best.words), best.score)
+
+    best = beam[0]
+    return best.crossword, best.dimensions, best.placed_words
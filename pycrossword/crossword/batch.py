@@ -0,0 +1,144 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Generator, Iterable
+
+from ._v2 import generate_crossword
+from .utils import CrosswordEngine, GenerationStats, WordOrder
+
+
+def __generate(
+    index: int,
+    words: list,
+    x: int | None = None,
+    y: int | None = None,
+    seed: int | None = None,
+    engine: str = CrosswordEngine.PYTHON,
+    attempts: int = 1,
+    time_budget: float | None = None,
+    beam_width: int = 4,
+    beam_depth: int | None = None,
+    stats: bool = False,
+    order: str = WordOrder.RANDOM,
+) -> tuple:
+    """Generate the crossword puzzle of a single word list of the batch.
+
+    Returns:
+        tuple: Index of the word list, dimension list, placement list and the stats of
+            the generation if requested.
+    """
+    generation_stats = GenerationStats() if stats else None
+    dimensions, placed_words = generate_crossword(
+        words,
+        x=x,
+        y=y,
+        seed=seed,
+        engine=engine,
+        attempts=attempts,
+        time_budget=time_budget,
+        beam_width=beam_width,
+        beam_depth=beam_depth,
+        stats=generation_stats,
+        order=order,
+    )
+    if stats:
+        return index, dimensions, placed_words, generation_stats
+
+    return index, dimensions, placed_words
+
+
+def generate_crosswords(
+    word_lists: Iterable[list],
+    x: int | None = None,
+    y: int | None = None,
+    seed: int | None = None,
+    engine: str = CrosswordEngine.PYTHON,
+    attempts: int = 1,
+    workers: int | None = None,
+    time_budget: float | None = None,
+    beam_width: int = 4,
+    beam_depth: int | None = None,
+    stats: bool = False,
+    order: str = WordOrder.RANDOM,
+) -> Generator[tuple, None, None]:
+    """Generate a crossword puzzle for each word list, yielding the puzzles as they finish.
+
+    Word lists are consumed lazily and the puzzles are generated on a pool of processes,
+    so the order of the results may differ from the order of the word lists, use the
+    yielded index to match them. The options apply to every puzzle, see
+    `generate_crossword`.
+
+    Args:
+        word_lists: Iterable of word lists to generate crossword puzzles from.
+        x: Optional width constraint for the crossword grids. Defaults to None.
+        y: Optional height constraint for the crossword grids. Defaults to None.
+        seed: Random seed for reproducibility. Defaults to None.
+        engine: Engine used to search placements. Defaults to CrosswordEngine.PYTHON.
+        attempts: Number of attempts per crossword puzzle. Defaults to 1.
+        workers: Number of processes generating the puzzles, 1 generates them in the
+            current process one after another. Defaults to None (number of CPUs).
+        time_budget: Seconds after which the generation of a puzzle stops, counted from
+            its start. Defaults to None.
+        beam_width: Width of the beam search, see CrosswordEngine.BEAM. Defaults to 4.
+        beam_depth: Depth of the beam search, see CrosswordEngine.BEAM.
+            Defaults to None.
+        stats: Whether to collect the GenerationStats of each puzzle. Defaults to False.
+        order: Order the words are placed in. Defaults to WordOrder.RANDOM.
+
+    Yields:
+        tuple: Index of the word list, dimension list, placement list and, if requested,
+            the stats of the generation.
+    """
+    if workers == 1:
+        for index, words in enumerate(word_lists):
+            yield __generate(
+                index,
+                words,
+                x,
+                y,
+                seed,
+                engine,
+                attempts,
+                time_budget,
+                beam_width,
+                beam_depth,
+                stats,
+                order,
+            )
+
+        return
+
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = set()
+        for index, words in enumerate(word_lists):
+            # keep a bounded number of word lists in flight to consume the input lazily
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+            pending.add(
+                executor.submit(
+                    __generate,
+                    index,
+                    words,
+                    x,
+                    y,
+                    seed,
+                    engine,
+                    attempts,
+                    time_budget,
+                    beam_width,
+                    beam_depth,
+                    stats,
+                    order,
+                )
+            )
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
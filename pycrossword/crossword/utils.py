@@ -1,8 +1,106 @@
 import contextlib
+import dataclasses
+import enum
 import random
+import time
 from typing import Generator
 
 
+class CrosswordEngine(enum.StrEnum):
+    """Enumeration for the engines searching placements of words on the crossword grid."""
+
+    PYTHON = "python"
+    NUMPY = "numpy"
+    BEAM = "beam"
+
+
+class WordOrder(enum.StrEnum):
+    """Enumeration for the orders the words are placed on the crossword grid in."""
+
+    RANDOM = "random"
+    CONNECTIVITY = "connectivity"
+
+
+@dataclasses.dataclass
+class GenerationStats:
+    """Counts and timings of crossword puzzle generations.
+
+    Pass an instance to `generate_crossword` to collect them, the counts of every
+    attempt are added to it, so an instance can also gather several generations.
+
+    Attributes:
+        anchors: Cells of the grid sharing a letter with a word, scanned for placements.
+        candidates: Placements that fit the grid, found at the anchors.
+        rejected_by_bounds: Candidates rejected by the width or height constraint.
+        rejected_by_score: Candidates within the constraints that lost to a better one.
+        requeued: Words that couldn't be placed and went back to the end of the queue.
+        skipped: Requeued words that were not searched, none of their letters being on
+            the grid.
+        score_calls: Scores calculated, for the candidates and the final crosswords.
+        timings: Seconds spent per phase of the generation: "search" for placements,
+            "place" to commit them to the grid and "total".
+    """
+
+    anchors: int = 0
+    candidates: int = 0
+    rejected_by_bounds: int = 0
+    rejected_by_score: int = 0
+    requeued: int = 0
+    skipped: int = 0
+    score_calls: int = 0
+    timings: dict = dataclasses.field(default_factory=dict)
+
+    @contextlib.contextmanager
+    def measure(self, phase: str) -> Generator:
+        """Context manager adding the time spent in its block to a phase.
+
+        Args:
+            phase: Name of the phase.
+
+        Yields:
+            Generator: Context for the phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] = (
+                self.timings.get(phase, 0.0) + time.perf_counter() - start
+            )
+
+    def merge(self, other: "GenerationStats"):
+        """Add the counts and timings of other stats to these ones.
+
+        Args:
+            other: Stats to add.
+        """
+        for field in dataclasses.fields(self):
+            if field.name != "timings":
+                setattr(
+                    self,
+                    field.name,
+                    getattr(self, field.name) + getattr(other, field.name),
+                )
+
+        for phase, seconds in other.timings.items():
+            self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+
+def measure(
+    stats: GenerationStats | None, phase: str
+) -> contextlib.AbstractContextManager:
+    """Return a context manager timing a phase, if stats are collected.
+
+    Args:
+        stats: Stats of the generation or None.
+        phase: Name of the phase.
+
+    Returns:
+        contextlib.AbstractContextManager: Context for the phase.
+    """
+    return contextlib.nullcontext() if stats is None else stats.measure(phase)
+
+
 @contextlib.contextmanager
 def random_state(seed: int) -> Generator:
     """Context manager to set and reset the random seed.
@@ -39,6 +137,23 @@ def generate_score(crossword: dict, dimensions: list) -> float:
     #   >>> dimensions = [-1, 0, 0, 3]  # 2 rows and 4 cols
     #   >>> generate_score(crossword, dimensions)
     #   >>> 38.333..
+    allocated = len(list(filter(None, crossword.values())))
+    return calculate_score(allocated, dimensions)
+
+
+def calculate_score(allocated: int, dimensions: list) -> float:
+    """Calculate a score for the crossword puzzle from its filled cells count and size.
+
+    Same as `generate_score`, but without a pass over the grid, so a generator that keeps
+    the count of filled cells up to date can score a candidate placement in O(1).
+
+    Args:
+        allocated: Number of filled cells of the crossword grid.
+        dimensions: Dimensions of the crossword grid [min_x, max_x, min_y, max_y].
+
+    Returns:
+        float: Score of the crossword puzzle.
+    """
     if dimensions[1] - dimensions[0] > dimensions[3] - dimensions[2]:
         size_ratio = (dimensions[3] - dimensions[2] + 1) / (
             dimensions[1] - dimensions[0] + 1
@@ -49,7 +164,6 @@ def generate_score(crossword: dict, dimensions: list) -> float:
         )
 
     area = (dimensions[1] - dimensions[0] + 1) * (dimensions[3] - dimensions[2] + 1)
-    allocated = len(list(filter(None, crossword.values())))
 
     try:
         filled_ratio = allocated / (area - allocated)
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from .clue import ClueGenerator
+from .crossword import stream_crossword
+
+
+async def generate_crossword_with_clues(
+    words: list,
+    clue_generator: ClueGenerator,
+    max_concurrency: int = 8,
+    batch_size: int | None = None,
+    **kwargs,
+) -> tuple:
+    """Generate a crossword puzzle and the clues of its words at the same time.
+
+    The layout runs in a worker thread, see `stream_crossword`, and the clues of each
+    placed word are requested as soon as it is committed, so that the puzzle takes about
+    the longest of the layout and the clue requests rather than their sum. Clues of
+    words that are not in the final placements are discarded.
+
+    Args:
+        words: List of words to use for the crossword puzzle.
+        clue_generator: Generator of the clues, see `ClueGenerator.acreate`.
+        max_concurrency: Maximum number of clue requests in flight. Defaults to 8.
+        batch_size: Number of placed words whose clues are requested together, the
+            last batch is sent once the layout is done. Defaults to None (one request
+            per word).
+        kwargs: Keyword arguments of `stream_crossword`.
+
+    Returns:
+        tuple: Dimension list, placement list and clues, as a dictionary with words as
+            keys and lists of clues as values.
+
+    Raises:
+        ValueError: If the maximum concurrency or the batch size is less than 1.
+    """
+    if max_concurrency < 1:
+        raise ValueError("The maximum concurrency must be at least 1.")
+
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("The batch size must be at least 1.")
+
+    loop = asyncio.get_running_loop()
+    placed = asyncio.Queue()
+    # the layout stops if the clues fail or the pipeline is cancelled
+    cancel = kwargs["cancel"] = kwargs.get("cancel") or threading.Event()
+    done = object()
+
+    def layout() -> tuple:
+        placements = stream_crossword(words, **kwargs)
+        try:
+            while True:
+                try:
+                    placement = next(placements)
+                except StopIteration as stop:
+                    return stop.value
+
+                loop.call_soon_threadsafe(placed.put_nowait, placement[0])
+        finally:
+            loop.call_soon_threadsafe(placed.put_nowait, done)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(batch: list) -> dict:
+        async with semaphore:
+            return await clue_generator.acreate(
+                batch, max_concurrency=max_concurrency, batch_size=batch_size
+            )
+
+    def stop_on_error(task: asyncio.Task):
+        # the layout stops at once, its result is of no use without the clues
+        if not task.cancelled() and task.exception() is not None:
+            cancel.set()
+
+    def start_fetch(batch: list):
+        task = asyncio.ensure_future(fetch(batch))
+        task.add_done_callback(stop_on_error)
+        fetches.append(task)
+
+    layout_task = asyncio.ensure_future(asyncio.to_thread(layout))
+    fetches = []
+    try:
+        batch = []
+        while (word := await placed.get()) is not done:
+            batch.append(word)
+            if len(batch) >= (batch_size or 1):
+                start_fetch(batch)
+                batch = []
+
+        if batch:
+            start_fetch(batch)
+
+        dimensions, placed_words = await layout_task
+        results = await asyncio.gather(*fetches)
+    except BaseException:
+        cancel.set()
+        for task in fetches:
+            task.cancel()
+
+        raise
+
+    fetched = defaultdict(list)
+    for result in results:
+        for word, word_clues in result.items():
+            fetched[word].extend(word_clues)
+
+    clues = defaultdict(list)
+    for word, *_ in placed_words:
+        if word not in clues and word in fetched:
+            clues[word] = fetched[word]
+
+    return dimensions, placed_words, clues
@@ -0,0 +1,521 @@
+"""Long-running service generating crossword puzzles over HTTP.
+
+Requests are queued in a bounded queue and laid out on a pool of processes started and
+warmed up once, and the clues of the placed words are generated in the server process,
+so the client connections and the clue caches are shared by all the requests. When the
+queue is full, requests are rejected with a 503 right away instead of piling up.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from ._utils import serialize
+from .clue import ClueGenerator
+from .crossword import CrosswordEngine, WordOrder, generate_crossword
+from .word import prepare_words
+
+logger = logging.getLogger(__name__)
+
+# largest request body accepted, in bytes
+MAX_BODY_SIZE = 1 << 20
+# seconds a client is told to wait before retrying a rejected request
+RETRY_AFTER = 1
+# seconds between two checks that the client of a pending request is still connected
+DISCONNECT_POLL = 0.1
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Content Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+# options of a request, by name, with their parameter of generate_crossword and type
+OPTIONS = {
+    "cols": ("x", int),
+    "rows": ("y", int),
+    "seed": ("seed", int),
+    "engine": ("engine", CrosswordEngine),
+    "attempts": ("attempts", int),
+    "time_budget": ("time_budget", float),
+    "beam_width": ("beam_width", int),
+    "beam_depth": ("beam_depth", int),
+    "order": ("order", WordOrder),
+}
+# largest values of the options accepted by default, so that a request can't hold a
+# process for long: the time budget also applies to the requests without one
+LIMITS = {"attempts": 16, "beam_width": 16, "beam_depth": 64, "time_budget": 30.0}
+WARM_UP_WORDS = ["PYTHON", "AMAZON", "NIGHT", "JOY", "COMPREHENSIVE"]
+
+
+class HTTPError(Exception):
+    """Error answered to the client with its status code."""
+
+    def __init__(self, status: int, message: str, headers: dict | None = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def _warm_up():
+    """Lay out a small crossword puzzle with each engine, so that the modules of the
+    process are imported and its first request is as fast as the next ones.
+    """
+    for engine in CrosswordEngine:
+        generate_crossword(WARM_UP_WORDS.copy(), seed=0, engine=engine)
+
+
+def _parse_option(name: str, value, kind: type):
+    """Convert the value of an option to its type, without coercing other JSON types.
+
+    Args:
+        name: Name of the option.
+        value: Decoded JSON value of the option.
+        kind: Type of the option.
+
+    Returns:
+        The converted value.
+
+    Raises:
+        HTTPError: If the value doesn't have the type of the option, with status 400.
+    """
+    if kind is bool:
+        if not isinstance(value, bool):
+            raise HTTPError(400, f"The {name} must be true or false.")
+
+        return value
+
+    if kind is int or kind is float:
+        # JSON numbers only, and integral ones for the integer options
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise HTTPError(400, f"The {name} must be a number.")
+
+        if kind is int and not float(value).is_integer():
+            raise HTTPError(400, f"The {name} must be an integer.")
+
+        return kind(value)
+
+    try:
+        return kind(value)
+    except (ValueError, TypeError) as e:
+        raise HTTPError(400, str(e)) from e
+
+
+def parse_request(payload, limits: dict | None = None) -> tuple:
+    """Validate the JSON payload of a generation request.
+
+    The payload is an object with the words and, optionally, the options of
+    `generate_crossword`: cols, rows, seed, engine, attempts, time_budget, beam_width,
+    beam_depth and order, as well as allow_repeat and clues.
+
+    Args:
+        payload: The decoded JSON payload.
+        limits: Largest values of the options, by name. The time budget limit is also
+            the time budget of the requests without one. Defaults to None (`LIMITS`).
+
+    Returns:
+        tuple: Prepared words, keyword arguments of `generate_crossword` and whether
+            clues are requested.
+
+    Raises:
+        HTTPError: If the payload is invalid or an option exceeds its limit, with
+            status 400.
+    """
+    limits = LIMITS if limits is None else limits
+    if not isinstance(payload, dict):
+        raise HTTPError(400, "Expected a JSON object.")
+
+    unknown = set(payload) - {*OPTIONS, "words", "allow_repeat", "clues"}
+    if unknown:
+        raise HTTPError(400, f"Unknown options: {', '.join(sorted(unknown))}.")
+
+    words = payload.get("words")
+    if not isinstance(words, list) or not words:
+        raise HTTPError(400, "Expected a non-empty array of words.")
+
+    allow_repeat, with_clues = (
+        payload.get(name) is not None and _parse_option(name, payload[name], bool)
+        for name in ("allow_repeat", "clues")
+    )
+    try:
+        words = prepare_words(words, allow_repeat)
+    except (ValueError, TypeError, AttributeError) as e:
+        raise HTTPError(400, str(e)) from e
+
+    kwargs = {}
+    for name, (parameter, kind) in OPTIONS.items():
+        value = payload.get(name)
+        if value is None:
+            continue
+
+        kwargs[parameter] = _parse_option(name, value, kind)
+        # the dimensions aren't checked by generate_crossword
+        if name in ("cols", "rows") and kwargs[parameter] < 1:
+            raise HTTPError(400, f"The {name} must be at least 1.")
+
+    for name, limit in limits.items():
+        parameter = OPTIONS[name][0]
+        if parameter not in kwargs:
+            if name == "time_budget":
+                kwargs[parameter] = limit
+        elif kwargs[parameter] > limit:
+            raise HTTPError(400, f"The {name} can't exceed {limit}.")
+
+    return words, kwargs, with_clues
+
+
+class CrosswordServer:
+    """HTTP service generating crossword puzzles on a pool of processes.
+
+    It answers `POST /crosswords` with a crossword puzzle, see `parse_request` for the
+    payload and `serialize` for the answer, and `GET /health` with the state of the
+    queue. It listens to a TCP port or to a Unix socket. Use it as an async context
+    manager, then call `serve_forever`.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        path: str | os.PathLike | None = None,
+        workers: int | None = None,
+        queue_size: int | None = None,
+        clue_generator: ClueGenerator | None = None,
+        clue_concurrency: int = 8,
+        clue_batch_size: int | None = None,
+        limits: dict | None = None,
+    ):
+        """Initialize the server.
+
+        Args:
+            host: Host to listen to. Defaults to "127.0.0.1".
+            port: Port to listen to, 0 for any free port. Defaults to 8000.
+            path: Path of a Unix socket to listen to instead of the host and port.
+                Defaults to None.
+            workers: Number of processes laying out the crossword puzzles.
+                Defaults to None (number of CPUs).
+            queue_size: Number of requests waiting for a process above which requests
+                are rejected. Defaults to None (4 per process).
+            clue_generator: Generator of the clues of the requests asking for clues,
+                shared by all the requests. Defaults to None (clues are disabled).
+            clue_concurrency: Maximum number of clue requests in flight per crossword
+                puzzle. Defaults to 8.
+            clue_batch_size: Number of words whose clues are requested together.
+                Defaults to None (one request per word).
+            limits: Largest values of the options of the requests, by name, overriding
+                the ones of `LIMITS`, see `parse_request`. Defaults to None.
+
+        Raises:
+            ValueError: If the number of processes or the queue size is less than 1.
+        """
+        workers = workers or os.cpu_count() or 1
+        queue_size = 4 * workers if queue_size is None else queue_size
+        if workers < 1:
+            raise ValueError("The number of workers must be at least 1.")
+
+        if queue_size < 1:
+            raise ValueError("The queue size must be at least 1.")
+
+        self.host = host
+        self.port = port
+        self.path = None if path is None else Path(path)
+        self.workers = workers
+        self.queue_size = queue_size
+        self.clue_generator = clue_generator
+        self.clue_concurrency = clue_concurrency
+        self.clue_batch_size = clue_batch_size
+        self.limits = {**LIMITS, **(limits or {})}
+        # requests by status code, 499 for the requests given up by their client
+        self.responses = {}
+        self.__queue = None
+        self.__executor = None
+        self.__consumers = []
+        self.__server = None
+
+    @property
+    def url(self) -> str:
+        """Returns the base URL of the service, or the path of its Unix socket."""
+        if self.path is not None:
+            return str(self.path)
+
+        return f"http://{self.host}:{self.port}"
+
+    async def __aenter__(self) -> "CrosswordServer":
+        loop = asyncio.get_running_loop()
+        self.__executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_warm_up
+        )
+        try:
+            # start all the processes now rather than on the first requests
+            pids = await asyncio.gather(
+                *(
+                    loop.run_in_executor(self.__executor, os.getpid)
+                    for _ in range(self.workers)
+                )
+            )
+            logger.info(f"{len(set(pids))} worker processes are ready.")
+            self.__queue = asyncio.Queue(self.queue_size)
+            self.__consumers = [
+                asyncio.create_task(self.__consume()) for _ in range(self.workers)
+            ]
+            if self.path is not None:
+                self.__server = await asyncio.start_unix_server(self.__serve, self.path)
+            else:
+                self.__server = await asyncio.start_server(
+                    self.__serve, self.host, self.port
+                )
+                self.port = self.__server.sockets[0].getsockname()[1]
+        except BaseException:
+            await self.__aexit__()
+            raise
+
+        logger.info(f"Serving crossword puzzles on {self.url}.")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+
+        for consumer in self.__consumers:
+            consumer.cancel()
+
+        await asyncio.gather(*self.__consumers, return_exceptions=True)
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+    async def serve_forever(self):
+        """Serve the requests until cancelled."""
+        await self.__server.serve_forever()
+
+    async def __consume(self):
+        """Lay out the queued requests one at a time on the process pool."""
+        loop = asyncio.get_running_loop()
+        while True:
+            future, words, kwargs = await self.__queue.get()
+            try:
+                if future.cancelled():
+                    continue
+
+                result = await loop.run_in_executor(
+                    self.__executor, partial(generate_crossword, words, **kwargs)
+                )
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self.__queue.task_done()
+
+    async def generate(self, payload) -> dict:
+        """Generate the crossword puzzle of a request.
+
+        Args:
+            payload: The decoded JSON payload of the request, see `parse_request`.
+
+        Returns:
+            dict: The crossword puzzle, see `serialize`.
+
+        Raises:
+            HTTPError: If the payload is invalid (400), the queue is full (503) or the
+                clues are requested while disabled (400).
+        """
+        words, kwargs, with_clues = parse_request(payload, self.limits)
+        if with_clues and self.clue_generator is None:
+            raise HTTPError(400, "Clue generation is disabled.")
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.__queue.put_nowait((future, words, kwargs))
+        except asyncio.QueueFull:
+            raise HTTPError(
+                503,
+                "Too many requests are waiting, retry later.",
+                {"Retry-After": str(RETRY_AFTER)},
+            )
+
+        try:
+            dimensions, placed_words = await future
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from e
+
+        clues = None
+        if with_clues:
+            clues = await self.clue_generator.acreate(
+                [item[0] for item in placed_words],
+                max_concurrency=self.clue_concurrency,
+                batch_size=self.clue_batch_size,
+            )
+
+        return serialize(dimensions, placed_words, clues)
+
+    def health(self) -> dict:
+        """Return the state of the service."""
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "queued": self.__queue.qsize(),
+            "queue_size": self.queue_size,
+        }
+
+    async def __respond(self, method: str, path: str, body: bytes) -> dict:
+        """Answer a request.
+
+        Args:
+            method: Method of the request.
+            path: Path of the request.
+            body: Body of the request.
+
+        Returns:
+            dict: JSON payload of the response.
+
+        Raises:
+            HTTPError: If the request can't be answered.
+        """
+        path = path.split("?", 1)[0].rstrip("/")
+        if path == "/health":
+            if method != "GET":
+                raise HTTPError(405, "Use GET.", {"Allow": "GET"})
+
+            return self.health()
+
+        if path == "/crosswords":
+            if method != "POST":
+                raise HTTPError(405, "Use POST.", {"Allow": "POST"})
+
+            try:
+                payload = json.loads(body)
+            except ValueError as e:
+                raise HTTPError(400, f"Invalid JSON: {e}") from e
+
+            return await self.generate(payload)
+
+        raise HTTPError(404, f"No resource at {path}.")
+
+    @staticmethod
+    async def __read_head(reader: asyncio.StreamReader) -> tuple:
+        """Read the request line and the headers of a request.
+
+        Returns:
+            tuple: The request line, empty when the client closed the connection, and
+                the headers by lowercase name.
+
+        Raises:
+            ValueError: If a line is longer than the limit of the reader.
+        """
+        request_line = await reader.readline()
+        headers = {}
+        while request_line.strip():
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        return request_line, headers
+
+    @staticmethod
+    async def __complete(writer: asyncio.StreamWriter, task: asyncio.Task) -> bool:
+        """Wait for a task, cancelling it if the connection is lost first, so that a
+        queued request given up by its client is not laid out.
+
+        A client that only shuts down its side of the connection once its request is
+        sent still gets the response: the end of the request stream is not a loss.
+
+        Returns:
+            bool: Whether the task is done, False if it was cancelled.
+        """
+        try:
+            while not task.done():
+                # the transport closes on a reset or a failed read or write
+                if writer.is_closing():
+                    task.cancel()
+                    return False
+
+                await asyncio.wait({task}, timeout=DISCONNECT_POLL)
+        except BaseException:
+            task.cancel()
+            raise
+
+        return True
+
+    async def __serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # connections are kept alive, requests are read one after the other
+        try:
+            while True:
+                start = time.perf_counter()
+                request_line = b""
+                extra = {}
+                close = False
+                try:
+                    request_line, headers = await self.__read_head(reader)
+                    if not request_line.strip():
+                        break
+
+                    # the connection can't be reused if the body was left unread
+                    close = headers.get("connection", "").lower() == "close"
+                    method, path, _ = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length", 0))
+                    if length > MAX_BODY_SIZE:
+                        close = True
+                        raise HTTPError(413, "The request body is too large.")
+
+                    body = await reader.readexactly(length)
+                    responding = asyncio.ensure_future(
+                        self.__respond(method, path, body)
+                    )
+                    if not await self.__complete(writer, responding):
+                        self.responses[499] = self.responses.get(499, 0) + 1
+                        logger.info(
+                            f"{request_line.decode('latin-1').strip()} given up by "
+                            "the client"
+                        )
+                        break
+
+                    payload = responding.result()
+                    status = 200
+                except HTTPError as e:
+                    status, extra, payload = e.status, e.headers, {"error": str(e)}
+                except ValueError:
+                    close = True
+                    status, payload = 400, {"error": "Malformed request."}
+                except asyncio.IncompleteReadError:
+                    raise
+                except Exception as e:
+                    logger.exception("The request failed.")
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+                self.responses[status] = self.responses.get(status, 0) + 1
+                logger.info(
+                    f"{request_line.decode('latin-1').strip()} {status} "
+                    f"{time.perf_counter() - start:.3f}s"
+                )
+                content = json.dumps(payload).encode()
+                head = [
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(content)}",
+                    *(f"{name}: {value}" for name, value in extra.items()),
+                ]
+                if close:
+                    head.append("Connection: close")
+
+                writer.write("\r\n".join(head).encode() + b"\r\n\r\n" + content)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
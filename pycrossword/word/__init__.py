@@ -1 +1 @@
-from .word import prepare_words, remove_duplicates
+from .word import prepare_words, read_words, remove_duplicates
@@ -1,4 +1,12 @@
-def remove_duplicates(words: list) -> list[str]:
+import gzip
+import os
+from typing import Generator, Iterable
+
+# first bytes of a gzip file
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def remove_duplicates(words: Iterable[str]) -> list[str]:
     """Removes duplicate words from a list while maintaining the original order.
 
     Args:
@@ -7,18 +15,11 @@ def remove_duplicates(words: list) -> list[str]:
     Returns:
         list[str]: A list of words with duplicates removed, preserving the original order.
     """
-    # regular set(words) produces semi-random sequence of words
-    unique_words = []
-    for word in words:
-        if word in unique_words:
-            continue
+    # regular set(words) produces semi-random sequence of words, dict keys keep the order
+    return list(dict.fromkeys(words))
 
-        unique_words.append(word)
 
-    return unique_words
-
-
-def prepare_words(words: list, allow_duplicates: bool = False) -> list[str]:
+def prepare_words(words: Iterable[str], allow_duplicates: bool = False) -> list[str]:
     """Prepares a list of words by normalizing them to uppercase and optionally removing duplicates.
 
     Args:
@@ -45,3 +46,84 @@ def prepare_words(words: list, allow_duplicates: bool = False) -> list[str]:
         prepared_words = remove_duplicates(prepared_words)
 
     return prepared_words
+
+
+def __open(path: str | os.PathLike):
+    """Opens a text file for reading, decompressing it if it is gzipped.
+
+    Args:
+        path: Path of the file.
+
+    Returns:
+        The file object.
+    """
+    with open(path, "rb") as f:
+        compressed = f.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+
+    if compressed:
+        return gzip.open(path, "rt", encoding="utf-8")
+
+    return open(path, encoding="utf-8")
+
+
+def read_words(
+    source: Iterable[str] | Iterable[bytes] | str | os.PathLike,
+    min_length: int | None = None,
+    max_length: int | None = None,
+    alphabet: str | None = None,
+    allow_duplicates: bool = False,
+) -> Generator[str, None, None]:
+    """Reads words lazily, one per line, normalized to uppercase.
+
+    Unlike `prepare_words`, invalid words are skipped rather than rejected, so large word
+    lists can be streamed through filters: lines are stripped, and empty lines, words with
+    non-alphabetic characters, words out of the length range and words with letters out of
+    the alphabet are skipped. Duplicates are removed in linear time, keeping the first
+    occurrence of each word.
+
+    Args:
+        source: Path of a text file, gzipped or not, or any iterable of lines such as
+            an open file, text or binary (utf-8).
+        min_length: Minimum length of a word. Defaults to None.
+        max_length: Maximum length of a word. Defaults to None.
+        alphabet: Letters the words are made of, in any case. Defaults to None (any
+            alphabetic character).
+        allow_duplicates: If set to False, duplicate words will be removed. Defaults to False.
+
+    Yields:
+        str: The words, normalized to uppercase.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with __open(source) as file:
+            yield from read_words(
+                file, min_length, max_length, alphabet, allow_duplicates
+            )
+
+        return
+
+    letters = None if alphabet is None else frozenset(alphabet.upper())
+    seen = set()
+    for line in source:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+
+        word = line.strip().upper()
+        if not word.isalpha():
+            continue
+
+        if min_length is not None and len(word) < min_length:
+            continue
+
+        if max_length is not None and len(word) > max_length:
+            continue
+
+        if letters is not None and not letters.issuperset(word):
+            continue
+
+        if not allow_duplicates:
+            if word in seen:
+                continue
+
+            seen.add(word)
+
+        yield word
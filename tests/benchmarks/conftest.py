@@ -0,0 +1,46 @@
+import json
+import random
+from pathlib import Path
+
+TEST_DIR = Path(__file__).resolve().parent.parent
+
+# English letters from the most to the least frequent one
+LETTERS = "etaoinshrdlcumwfgypbvkjxqz"
+
+
+def synthetic_words(count: int, min_length: int, max_length: int, seed: int) -> list:
+    """Generate distinct random words, drawing letters with English-like frequencies.
+
+    Args:
+        count: Number of words.
+        min_length: Minimum length of a word.
+        max_length: Maximum length of a word.
+        seed: Random seed, the same seed gives the same words.
+
+    Returns:
+        list: Sorted list of words.
+    """
+    rng = random.Random(seed)
+    weights = range(len(LETTERS), 0, -1)
+    words = set()
+    while len(words) < count:
+        length = rng.randint(min_length, max_length)
+        words.add("".join(rng.choices(LETTERS, weights, k=length)))
+
+    return sorted(words)
+
+
+def real_words(count: int, seed: int) -> list:
+    """Sample distinct words of the english word list of the tests.
+
+    Args:
+        count: Number of words, at most the size of the word list.
+        seed: Random seed, the same seed gives the same words.
+
+    Returns:
+        list: Sorted list of words.
+    """
+    with open(TEST_DIR / "words" / "words.json", "r") as f:
+        words = sorted(set(json.load(f)))
+
+    return sorted(random.Random(seed).sample(words, count))
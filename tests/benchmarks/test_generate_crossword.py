@@ -0,0 +1,109 @@
+"""Benchmarks of the crossword generation.
+
+Run them with `make benchmark`, results are saved to `.benchmarks` and can be compared
+between releases with `pytest-benchmark compare`. Besides the timings, every benchmark
+records the throughput (words per second), the placement efficiency (share of the words
+placed) and the peak memory allocated by the generation (bytes) in its extra info.
+"""
+
+import tracemalloc
+
+import pytest
+
+from pycrossword import CrosswordEngine, generate_crossword
+
+from .conftest import real_words, synthetic_words
+
+pytest.importorskip("pytest_benchmark")
+
+SEED = 11
+BOUNDS = ((None, None), (30, 30))
+
+
+def rounds(count: int) -> int:
+    """Number of rounds of a benchmark, fewer for the larger word lists."""
+    return max(1, 1000 // count)
+
+
+def run(benchmark, words: list, x: int | None, y: int | None, **options):
+    """Benchmark the generation of a crossword and record its metrics.
+
+    Args:
+        benchmark: The pytest-benchmark fixture.
+        words: Words of the crossword.
+        x: Optional width constraint for the crossword grid.
+        y: Optional height constraint for the crossword grid.
+        **options: Other options of `generate_crossword`.
+    """
+    _, placed_words = benchmark.pedantic(
+        generate_crossword,
+        setup=lambda: ((words.copy(),), {"x": x, "y": y, "seed": SEED, **options}),
+        rounds=rounds(len(words)),
+    )
+
+    # memory is traced in a separate run, tracing slows the generation down
+    tracemalloc.start()
+    try:
+        generate_crossword(words.copy(), x=x, y=y, seed=SEED, **options)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    benchmark.extra_info.update(
+        words=len(words),
+        placed_words=len(placed_words),
+        efficiency=len(placed_words) / len(words),
+        peak_memory=peak_memory,
+    )
+    # there are no timings with --benchmark-disable
+    if benchmark.stats:
+        benchmark.extra_info["words_per_second"] = (
+            len(words) / benchmark.stats.stats.mean
+        )
+
+
+@pytest.mark.parametrize("x,y", BOUNDS)
+@pytest.mark.parametrize("min_length,max_length", ((3, 5), (8, 14)))
+@pytest.mark.parametrize("count", (10, 100, 1000, 10000))
+def test_synthetic_words(
+    benchmark, count: int, min_length: int, max_length: int, x: int, y: int
+):
+    benchmark.group = f"synthetic-{count}-{min_length}-{max_length}"
+    words = synthetic_words(count, min_length, max_length, seed=SEED)
+    run(benchmark, words, x, y)
+
+
+@pytest.mark.parametrize("x,y", BOUNDS)
+@pytest.mark.parametrize("count", (10, 100, 1000))
+def test_real_words(benchmark, count: int, x: int, y: int):
+    benchmark.group = f"real-{count}"
+    words = real_words(count, seed=SEED)
+    run(benchmark, words, x, y)
+
+
+# a beam of width w costs about as much as w greedy attempts
+@pytest.mark.parametrize(
+    "options",
+    (
+        {"engine": CrosswordEngine.BEAM, "beam_width": 4},
+        {"attempts": 4},
+        {"engine": CrosswordEngine.BEAM, "beam_width": 8},
+        {"attempts": 8},
+    ),
+    ids=("beam-4", "attempts-4", "beam-8", "attempts-8"),
+)
+def test_beam(benchmark, options: dict):
+    """Compare the efficiency of the beam engine with greedy attempts of the same cost,
+    in a bounded grid.
+    """
+    benchmark.group = "beam-100-15x15"
+    words = real_words(100, seed=SEED)
+    run(benchmark, words, 15, 15, **options)
+
+
+@pytest.mark.parametrize("x,y", BOUNDS)
+@pytest.mark.parametrize("engine", list(CrosswordEngine))
+def test_engines(benchmark, engine: str, x: int, y: int):
+    benchmark.group = "engines-1000"
+    words = real_words(1000, seed=SEED)
+    run(benchmark, words, x, y, engine=engine)
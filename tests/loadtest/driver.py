@@ -0,0 +1,172 @@
+"""Load test of the clue generation against the fake OpenAI server.
+
+Run it with `python -m tests.loadtest.driver --help`, see `make loadtest`.
+"""
+
+import asyncio
+import dataclasses
+import json
+import random
+import statistics
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+from pycrossword import (
+    AdaptiveLimit,
+    AsyncOpenAIClient,
+    ClueGenerator,
+    RateLimiter,
+    RetryPolicy,
+)
+
+from .server import FakeOpenAIServer, FakeProfile
+
+WORDS_FILE = Path(__file__).resolve().parent.parent / "words" / "words.json"
+
+
+class TimedClient(AsyncOpenAIClient):
+    """Client recording the latency of its requests, retries and waits included."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+
+    async def request(self, query: str, json_output: bool = False) -> str:
+        start = time.perf_counter()
+        try:
+            return await super().request(query, json_output)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def sample_words(count: int, seed: int | None = None) -> list:
+    """Sample distinct words of the word list of the tests.
+
+    Args:
+        count: Number of words, at most the size of the word list.
+        seed: Random seed. Defaults to None.
+
+    Returns:
+        list: The words, in uppercase.
+    """
+    with open(WORDS_FILE) as f:
+        words = sorted({word.upper() for word in json.load(f) if word.isalpha()})
+
+    return random.Random(seed).sample(words, count)
+
+
+async def run_load_test(
+    words: list,
+    profile: FakeProfile | None = None,
+    max_concurrency: int = 8,
+    batch_size: int | None = None,
+    max_retries: int = 5,
+    requests_per_minute: float | None = None,
+    tokens_per_minute: float | None = None,
+) -> dict:
+    """Generate the clues of the words against a fake server and measure it.
+
+    Args:
+        words: Words to generate clues for.
+        profile: Behaviour of the fake service. Defaults to None (default profile).
+        max_concurrency: Maximum number of requests in flight, the adaptive limit
+            starts there. Defaults to 8.
+        batch_size: Number of words per request. Defaults to None (one per word).
+        max_retries: Retries of a failed request. Defaults to 5.
+        requests_per_minute: Requests per minute of the rate limiter. Defaults to None.
+        tokens_per_minute: Tokens per minute of the rate limiter. Defaults to None.
+
+    Returns:
+        dict: The report: clues, requests, clues per second, p50 and p99 latency of
+            the requests in seconds, retries, responses by status and error if any.
+    """
+    rate_limiter = None
+    if requests_per_minute is not None or tokens_per_minute is not None:
+        rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+
+    async with FakeOpenAIServer(profile) as server:
+        client = TimedClient(
+            "fake-token",
+            rate_limiter=rate_limiter,
+            retry_policy=RetryPolicy(max_retries, rng=random.Random(0)),
+            concurrency=AdaptiveLimit(max_concurrency, maximum=max_concurrency),
+            base_url=server.url,
+        )
+        generator = ClueGenerator(client, cacheable=False)
+        error = None
+        start = time.perf_counter()
+        try:
+            clues = await generator.acreate(
+                words, max_concurrency=max_concurrency, batch_size=batch_size
+            )
+        except Exception as e:
+            clues = {}
+            error = f"{type(e).__name__}: {e}"
+
+        elapsed = time.perf_counter() - start
+        await client.client.close()
+
+    count = sum(len(word_clues) for word_clues in clues.values())
+    latencies = client.latencies
+    percentiles = (
+        statistics.quantiles(latencies, n=100, method="inclusive")
+        if len(latencies) > 1
+        else latencies * 99
+    )
+    return {
+        "clues": count,
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "clues_per_second": round(count / elapsed, 2) if elapsed else 0.0,
+        "p50_latency": round(percentiles[49], 3) if percentiles else None,
+        "p99_latency": round(percentiles[98], 3) if percentiles else None,
+        "retries": client.retries,
+        "final_concurrency": client.concurrency.limit,
+        "responses": dict(sorted(server.responses.items())),
+        "error": error,
+    }
+
+
+def main():
+    parser = ArgumentParser(
+        prog="python -m tests.loadtest.driver",
+        description="Load test the clue generation against a fake OpenAI server.",
+    )
+    parser.add_argument("-n", "--words", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("-b", "--batch-size", type=int)
+    parser.add_argument("-r", "--max-retries", type=int, default=5)
+    parser.add_argument("--requests-per-minute", type=float)
+    parser.add_argument("--tokens-per-minute", type=float)
+    profile = parser.add_argument_group("fake service")
+    for field in dataclasses.fields(FakeProfile):
+        profile.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            dest=field.name,
+            type=int if field.name in ("max_concurrency", "seed") else float,
+            default=field.default,
+        )
+
+    args = parser.parse_args()
+    report = asyncio.run(
+        run_load_test(
+            sample_words(args.words, args.seed),
+            FakeProfile(
+                **{
+                    field.name: getattr(args, field.name)
+                    for field in dataclasses.fields(FakeProfile)
+                }
+            ),
+            max_concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            max_retries=args.max_retries,
+            requests_per_minute=args.requests_per_minute,
+            tokens_per_minute=args.tokens_per_minute,
+        )
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import asyncio
+import dataclasses
+import json
+import math
+import random
+import re
+import time
+from collections import Counter
+
+# words of the queries are quoted, see OpenAIClient.render_query
+QUOTED = re.compile(r"'([^']+)'")
+STATUS_TEXT = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Error"}
+
+
+@dataclasses.dataclass
+class FakeProfile:
+    """Behaviour of the fake service.
+
+    Latencies follow a log-normal distribution of the given median, the sigma being
+    the standard deviation of their logarithm: 0.5 puts the p99 at about 3.2 times
+    the median.
+    """
+
+    median_latency: float = 0.5
+    sigma: float = 0.5
+    # share of the requests failing with a 500 after their latency
+    error_rate: float = 0.0
+    # share of the requests rejected with a 429 right away
+    rate_limit_rate: float = 0.0
+    # requests in flight above which requests are rejected with a 429
+    max_concurrency: int | None = None
+    # retry-after-ms header of the 429 responses, None to leave it out
+    retry_after: float | None = 0.5
+    # share of the words left out of the answers of batched queries
+    drop_rate: float = 0.0
+    seed: int | None = None
+
+
+class FakeOpenAIServer:
+    """Local HTTP server mimicking the chat completions of the OpenAI API.
+
+    It answers clue queries with a fake clue, and batched queries with a JSON object of
+    fake clues, after a latency drawn from the profile, and injects the errors of the
+    profile. Use it as an async context manager, and point a client to its `url`.
+    """
+
+    def __init__(self, profile: FakeProfile | None = None, port: int = 0):
+        """Initialize the server.
+
+        Args:
+            profile: Behaviour of the service. Defaults to None (default profile).
+            port: Port to listen to. Defaults to 0 (any free port).
+        """
+        self.profile = profile or FakeProfile()
+        self.port = port
+        self.rng = random.Random(self.profile.seed)
+        self.in_flight = 0
+        # responses by status code
+        self.responses = Counter()
+        self.__server = None
+
+    @property
+    def url(self) -> str:
+        """Returns the base URL of the API, for the base_url of the clients."""
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    async def __aenter__(self) -> "FakeOpenAIServer":
+        self.__server = await asyncio.start_server(self.__serve, "127.0.0.1", self.port)
+        self.port = self.__server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.__server.close()
+        await self.__server.wait_closed()
+
+    async def __serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # connections are kept alive, requests are read one after the other
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                path = request_line.split()[1].decode()
+                status, extra, payload = await self.__respond(path, body)
+                self.responses[status] += 1
+                content = json.dumps(payload).encode()
+                head = [
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(content)}",
+                    *(f"{name}: {value}" for name, value in extra.items()),
+                ]
+                writer.write("\r\n".join(head).encode() + b"\r\n\r\n" + content)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def __respond(self, path: str, body: bytes) -> tuple:
+        """Answer a request.
+
+        Args:
+            path: Path of the request.
+            body: Body of the request.
+
+        Returns:
+            tuple: Status code, extra headers and JSON payload of the response.
+        """
+        if not path.endswith("/chat/completions"):
+            return 404, {}, self.__error("Not found.", "invalid_request_error")
+
+        profile = self.profile
+        self.in_flight += 1
+        try:
+            draw = self.rng.random()
+            overloaded = (
+                profile.max_concurrency is not None
+                and self.in_flight > profile.max_concurrency
+            )
+            if overloaded or draw < profile.rate_limit_rate:
+                headers = {}
+                if profile.retry_after is not None:
+                    headers["retry-after-ms"] = str(int(profile.retry_after * 1000))
+
+                return 429, headers, self.__error("Rate limit reached.", "requests")
+
+            await asyncio.sleep(
+                self.rng.lognormvariate(math.log(profile.median_latency), profile.sigma)
+            )
+            if draw < profile.rate_limit_rate + profile.error_rate:
+                return 500, {}, self.__error("The server had an error.", "server_error")
+
+            return 200, {}, self.__completion(json.loads(body))
+        finally:
+            self.in_flight -= 1
+
+    @staticmethod
+    def __error(message: str, kind: str) -> dict:
+        return {
+            "error": {"message": message, "type": kind, "param": None, "code": None}
+        }
+
+    def __completion(self, request: dict) -> dict:
+        query = request["messages"][-1]["content"]
+        words = QUOTED.findall(query)
+        if request.get("response_format", {}).get("type") == "json_object":
+            content = json.dumps(
+                {
+                    word: f"Fake clue for {word}."
+                    for word in words
+                    if self.rng.random() >= self.profile.drop_rate
+                }
+            )
+        else:
+            content = f"Fake clue for {words[0] if words else 'nothing'}."
+
+        prompt_tokens = len(query) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": f"chatcmpl-{self.rng.getrandbits(64):016x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
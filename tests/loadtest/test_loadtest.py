@@ -0,0 +1,44 @@
+import asyncio
+
+from .driver import run_load_test, sample_words
+from .server import FakeProfile
+
+
+def test_load_test_with_errors():
+    profile = FakeProfile(
+        median_latency=0.01,
+        error_rate=0.1,
+        rate_limit_rate=0.1,
+        retry_after=0.01,
+        seed=3,
+    )
+    report = asyncio.run(
+        run_load_test(sample_words(50, seed=1), profile, max_concurrency=4)
+    )
+
+    assert report["error"] is None
+    assert report["clues"] == report["requests"] == 50
+    assert report["retries"] == report["responses"][429] + report["responses"][500]
+    assert report["retries"] > 0
+    assert report["p50_latency"] <= report["p99_latency"]
+    assert 1 <= report["final_concurrency"] <= 4
+
+
+def test_load_test_batches():
+    profile = FakeProfile(median_latency=0.01, drop_rate=0.2, seed=3)
+    report = asyncio.run(
+        run_load_test(sample_words(50, seed=1), profile, batch_size=10)
+    )
+
+    # the words dropped from the answers are requested individually
+    assert report["clues"] == 50
+    assert 5 < report["requests"] < 50
+    assert report["responses"] == {200: report["requests"]}
+
+
+def test_load_test_gives_up():
+    profile = FakeProfile(median_latency=0.01, error_rate=1.0, seed=3)
+    report = asyncio.run(run_load_test(sample_words(5, seed=1), profile, max_retries=1))
+
+    assert report["error"].startswith("InternalServerError")
+    assert report["clues"] == 0
@@ -1,9 +1,9 @@
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from pycrossword import ClueGenerator, OpenAIClient
+from pycrossword import AsyncOpenAIClient, ClueGenerator, OpenAIClient
 
 TEST_DIR = Path(__file__).resolve().parent.parent
 
@@ -56,3 +56,25 @@ def client_with_mock(client, content) -> OpenAIClient:
 @pytest.fixture(scope="function")
 def clue_generator(client_with_mock) -> ClueGenerator:
     return ClueGenerator(client_with_mock, cacheable=True)
+
+
+@pytest.fixture(scope="function")
+def async_client() -> AsyncOpenAIClient:
+    return AsyncOpenAIClient(api_token="")
+
+
+@pytest.fixture(scope="function")
+def async_client_with_mock(async_client, content) -> AsyncOpenAIClient:
+    with patch("openai.AsyncOpenAI") as mock_open_ai_client:
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content=content))]
+        mock_open_ai_client.chat.completions.create = AsyncMock(
+            return_value=mock_response
+        )
+        async_client.client = mock_open_ai_client
+        yield async_client
+
+
+@pytest.fixture(scope="function")
+def async_clue_generator(async_client_with_mock) -> ClueGenerator:
+    return ClueGenerator(async_client_with_mock, cacheable=True)
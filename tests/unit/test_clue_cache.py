@@ -0,0 +1,217 @@
+import multiprocessing
+import pickle
+import sqlite3
+
+import pytest
+
+from pycrossword import ClueCache, ClueGenerator, LRUClueCache
+
+KEY = ("DAY", "time", "easy", "gpt-3.5-turbo")
+
+
+def fill(path: str, start: int):
+    cache = ClueCache(path)
+    for i in range(start, start + 100):
+        cache.add("DAY", "time", "easy", "gpt-3.5-turbo", f"Clue {i}.")
+
+
+def test_clue_cache(tmp_path):
+    cache = ClueCache(tmp_path / "clues.sqlite3")
+    assert cache.get(*KEY) == []
+
+    cache.add(*KEY, "Sunrise to sunset.")
+    cache.add(*KEY, "Opposite of night.")
+    cache.add("DAY", "time", "hard", "gpt-3.5-turbo", "Diurnal span.")
+
+    assert cache.get(*KEY) == ["Sunrise to sunset.", "Opposite of night."]
+    assert len(cache) == 3
+
+    # clues persist across connections and processes, see __reduce__
+    reopened = pickle.loads(pickle.dumps(cache))
+    assert reopened.get(*KEY) == ["Sunrise to sunset.", "Opposite of night."]
+
+    cache.clear()
+    assert len(reopened) == 0
+
+
+def test_clue_cache_eviction(tmp_path, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("pycrossword.clue.cache.time.time", lambda: now)
+    cache = ClueCache(tmp_path / "clues.sqlite3", ttl=100, max_entries=2)
+    cache.add("DAY", *KEY[1:], "Day.")
+    now += 1
+    cache.add("NIGHT", *KEY[1:], "Night.")
+    now += 1
+    # DAY is used, NIGHT becomes the least recently used
+    assert cache.get("DAY", *KEY[1:]) == ["Day."]
+    now += 1
+    cache.add("SUN", *KEY[1:], "Sun.")
+
+    assert cache.get("NIGHT", *KEY[1:]) == []
+    assert len(cache) == 2
+
+    now += 101
+    assert cache.get("SUN", *KEY[1:]) == []
+    cache.add("MOON", *KEY[1:], "Moon.")
+    assert len(cache) == 1
+
+
+def test_clue_cache_eviction_of_shared_clues(tmp_path, monkeypatch):
+    monkeypatch.setattr("pycrossword.clue.cache.COUNT_INTERVAL", 10)
+    path = tmp_path / "clues.sqlite3"
+    cache = ClueCache(path, max_entries=20)
+    other = ClueCache(path, max_entries=20)
+    for i in range(20):
+        other.add(*KEY, f"Clue {i}.")
+
+    # the clues added by the other connection are counted every COUNT_INTERVAL clues
+    cache.add_many([(*KEY, f"Clue {i}.") for i in range(20, 29)])
+    assert len(cache) == 29
+
+    cache.add(*KEY, "Clue 29.")
+    assert cache.get(*KEY) == [f"Clue {i}." for i in range(10, 30)]
+
+
+def test_clue_cache_reads_without_write_lock(tmp_path, monkeypatch):
+    monkeypatch.setattr("pycrossword.clue.cache.TIMEOUT", 0.1)
+    cache = ClueCache(tmp_path / "clues.sqlite3")
+    cache.add(*KEY, "Sunrise to sunset.")
+    writer = sqlite3.connect(cache.path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        assert cache.get(*KEY) == ["Sunrise to sunset."]
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+    # the use of the clue is recorded with the next write
+    cache.add(*KEY, "Opposite of night.")
+    assert cache.get(*KEY) == ["Sunrise to sunset.", "Opposite of night."]
+
+
+def test_clue_cache_concurrent_processes(tmp_path):
+    path = str(tmp_path / "clues.sqlite3")
+    ClueCache(path)
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=fill, args=(path, i * 100)) for i in range(2)]
+    for process in processes:
+        process.start()
+
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    assert len(ClueCache(path).get(*KEY)) == 200
+
+
+def test_invalid_clue_cache(tmp_path):
+    with pytest.raises(ValueError) as e:
+        ClueCache(tmp_path / "clues.sqlite3", ttl=0)
+
+    assert str(e.value) == "The time to live of the clues must be positive."
+
+    with pytest.raises(ValueError) as e:
+        ClueCache(tmp_path / "clues.sqlite3", max_entries=0)
+
+    assert str(e.value) == "The maximum number of clues must be at least 1."
+
+
+@pytest.mark.parametrize("content", ("Sunrise to sunset.",))
+def test_clue_generator_with_cache(client_with_mock, tmp_path):
+    cache = ClueCache(tmp_path / "clues.sqlite3")
+    clue_generator = ClueGenerator(client_with_mock, theme="time", cache=cache)
+    clue_generator.create(["DAY", "NIGHT"])
+    create = client_with_mock.client.chat.completions.create
+    assert create.call_count == 2
+
+    # a new generator, as in a new run, serves the clues from the cache
+    clue_generator = ClueGenerator(client_with_mock, theme="time", cache=cache)
+    clues = clue_generator.create(["DAY", "NIGHT", "JOY"], batch_size=5)
+    assert clues["DAY"] == ["Sunrise to sunset."]
+    assert clue_generator.get("NIGHT") == "Sunrise to sunset."
+    assert create.call_count == 4
+
+    # the key includes the difficulty
+    clue_generator = ClueGenerator(
+        client_with_mock, theme="time", difficulty="hard", cache=cache
+    )
+    clue_generator.create("DAY")
+    assert create.call_count == 5
+
+
+@pytest.mark.parametrize("content", ("Sunrise to sunset.",))
+def test_clue_generator_with_cache_hits(client_with_mock, tmp_path):
+    create = client_with_mock.client.chat.completions.create
+    cache = ClueCache(tmp_path / "clues.sqlite3")
+    clue_generator = ClueGenerator(
+        client_with_mock, cache=cache, memory_cache=LRUClueCache(max_entries=10)
+    )
+    for _ in range(100):
+        clue_generator.create(["DAY"])
+
+    # the clue found in the cache is kept in memory once
+    assert create.call_count == 1
+    assert clue_generator.clues == {"DAY": ["Sunrise to sunset."]}
+
+
+def test_lru_clue_cache():
+    cache = LRUClueCache(max_entries=2, max_clues=2)
+    cache.add("DAY", "Sunrise to sunset.")
+    cache.add("DAY", "Opposite of night.")
+    cache.add("DAY", "Diurnal span.")
+    cache.add("NIGHT", "Sunset to sunrise.")
+
+    assert cache["DAY"] == ["Opposite of night.", "Diurnal span."]
+    assert cache.choice("DAY") in cache["DAY"]
+    # NIGHT is the least recently used word
+    cache.add("SUN", "Star of the day.")
+
+    assert list(cache) == ["DAY", "SUN"]
+    assert cache.choice("NIGHT") is None
+    assert "NIGHT" not in cache
+    assert (cache.hits, cache.misses, cache.hit_rate) == (1, 1, 0.5)
+
+    restored = pickle.loads(pickle.dumps(cache))
+    assert restored == cache
+    assert (restored.max_entries, restored.max_clues, restored.hits) == (2, 2, 1)
+
+
+def test_lru_clue_cache_missing_word():
+    cache = LRUClueCache(max_entries=2)
+    cache["DAY"].append("Sunrise to sunset.")
+    cache["NIGHT"].append("Sunset to sunrise.")
+
+    assert cache == {"DAY": ["Sunrise to sunset."], "NIGHT": ["Sunset to sunrise."]}
+    assert cache.max_clues == 10
+
+    # missing words are added, and evict the least recently used ones
+    assert cache["SUN"] == []
+    assert list(cache) == ["NIGHT", "SUN"]
+
+
+def test_invalid_lru_clue_cache():
+    with pytest.raises(ValueError) as e:
+        LRUClueCache(max_entries=0)
+
+    assert str(e.value) == "The maximum number of words must be at least 1."
+
+    with pytest.raises(ValueError) as e:
+        LRUClueCache(max_clues=0)
+
+    assert str(e.value) == "The maximum number of clues per word must be at least 1."
+
+
+@pytest.mark.parametrize("content", ("Sunrise to sunset.",))
+def test_clue_generator_with_lru_cache(client_with_mock):
+    memory_cache = LRUClueCache(max_entries=2, max_clues=1)
+    clue_generator = ClueGenerator(client_with_mock, memory_cache=memory_cache)
+    clue_generator.create(["DAY", "DAY", "NIGHT", "SUN"])
+
+    assert clue_generator.clues is memory_cache
+    assert dict(memory_cache) == {
+        "NIGHT": ["Sunrise to sunset."],
+        "SUN": ["Sunrise to sunset."],
+    }
+    assert clue_generator.get("DAY") is None
+    assert clue_generator.get("SUN") == "Sunrise to sunset."
+    assert (memory_cache.hits, memory_cache.misses) == (1, 1)
@@ -0,0 +1,67 @@
+import pytest
+
+from pycrossword import WordIndex, fill_template
+
+TEMPLATE = ["...", ".#.", "..."]
+WORDS = ["CAT", "BEE", "CAB", "TOE", "DOG", "CAR", "TEA"]
+
+
+def render(dimensions: tuple, placed_words: list) -> list:
+    cols, rows = dimensions
+    grid = [["#"] * cols for _ in range(rows)]
+    for word, x, y, horizontal in placed_words:
+        for i, char in enumerate(word):
+            row, col = (x, y + i) if horizontal else (x + i, y)
+            # crossing words agree on their letters
+            assert grid[row][col] in ("#", char)
+            grid[row][col] = char
+
+    return ["".join(row) for row in grid]
+
+
+@pytest.mark.parametrize("seed", (1, 11, 42))
+def test_fill_template(seed: int):
+    dimensions, placed_words = fill_template(TEMPLATE, WORDS, seed=seed)
+    words = [word for word, *_ in placed_words]
+    grid = render(dimensions, placed_words)
+
+    assert dimensions == (3, 3)
+    assert len(placed_words) == 4
+    assert len(set(words)) == len(words)
+    assert set(words) <= set(WORDS)
+    assert grid[1][1] == "#"
+    assert fill_template(TEMPLATE, WordIndex(WORDS), seed=seed) == (
+        dimensions,
+        placed_words,
+    )
+
+
+def test_fill_template_with_letters():
+    dimensions, placed_words = fill_template("C.T\n.#.\n..E", WORDS, seed=11)
+
+    assert render(dimensions, placed_words) == ["CAT", "A#O", "BEE"]
+
+
+@pytest.mark.parametrize(
+    "template",
+    (
+        # no word of length 2
+        ["..#", "...", "..."],
+        # no word ends with a Z
+        ["..Z", ".#.", "..."],
+    ),
+)
+def test_fill_template_without_solution(template: list):
+    with pytest.raises(ValueError):
+        fill_template(template, WORDS, seed=11)
+
+
+@pytest.mark.parametrize("template", ([], ["...", ".."]))
+def test_fill_template_with_invalid_template(template: list):
+    with pytest.raises(ValueError):
+        fill_template(template, WORDS)
+
+
+def test_fill_template_with_time_budget():
+    with pytest.raises(TimeoutError):
+        fill_template(TEMPLATE, WORDS, time_budget=0)
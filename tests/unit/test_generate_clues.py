@@ -1,3 +1,6 @@
+import asyncio
+from unittest.mock import MagicMock
+
 import pytest
 
 from pycrossword import ClueDifficulty
@@ -39,6 +42,17 @@ def test_clue_generator_fail(clue_generator):
     assert str(e.value) == "No response from the chat model."
 
 
+@pytest.mark.parametrize("content", ("Some kind of clue.",))
+def test_clue_generator_without_choices(clue_generator):
+    create = clue_generator.client.client.chat.completions.create
+    create.return_value.choices = []
+    with pytest.raises(ValueError) as e:
+        clue_generator.create("word")
+
+    assert str(e.value) == "No choices in the response of the chat model."
+    assert create.call_count == 1
+
+
 @pytest.mark.parametrize("content", ("Some kind of clue.",))
 def test_clues_generation(clue_generator):
     clues = clue_generator.create(["word", "day", "night"])
@@ -78,3 +92,132 @@ def test_is_cacheable_clue_generator(client):
 
     clue_generator = ClueGenerator(client, cacheable=False)
     assert not clue_generator.is_cacheable
+
+
+@pytest.mark.parametrize("content", ("Some kind of clue.",))
+def test_async_clues_generation(async_clue_generator):
+    words = ["word", "day", "night", "day"]
+    clues = asyncio.run(async_clue_generator.acreate(words, max_concurrency=2))
+
+    assert list(clues) == ["word", "day", "night"]
+    assert clues["day"] == ["Some kind of clue.", "Some kind of clue."]
+    assert len(async_clue_generator.clues["day"]) == 2
+    create = async_clue_generator.client.client.chat.completions.create
+    assert create.await_count == 4
+
+
+@pytest.mark.parametrize("content", ("Some kind of clue.",))
+def test_async_clues_generation_is_concurrent(async_clue_generator):
+    in_flight = peak = 0
+    create = async_clue_generator.client.client.chat.completions.create
+    response = create.return_value
+
+    async def request(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return response
+
+    create.side_effect = request
+    words = [f"word{i}" for i in range(10)]
+    asyncio.run(async_clue_generator.acreate(words, max_concurrency=3))
+
+    assert peak == 3
+
+
+@pytest.mark.parametrize("content", ("Some kind of clue.",))
+def test_async_clues_generation_with_sync_client(clue_generator):
+    clues = asyncio.run(clue_generator.acreate(["word", "day"]))
+
+    assert clues == {"word": ["Some kind of clue."], "day": ["Some kind of clue."]}
+
+
+@pytest.mark.parametrize("content", ("",))
+def test_async_clue_generator_fail(async_clue_generator):
+    with pytest.raises(ValueError) as e:
+        asyncio.run(async_clue_generator.acreate("word"))
+
+    assert str(e.value) == "No response from the chat model."
+
+
+@pytest.mark.parametrize("content", ("Some kind of clue.",))
+def test_async_clue_generator_invalid_concurrency(async_clue_generator):
+    with pytest.raises(ValueError) as e:
+        asyncio.run(async_clue_generator.acreate(["word"], max_concurrency=0))
+
+    assert str(e.value) == "The maximum concurrency must be at least 1."
+
+    with pytest.raises(TypeError) as e:
+        async_clue_generator.create("word")
+
+    assert str(e.value) == "Can't create clue with an async client, use acreate."
+
+
+def test_parse_batch_response(client):
+    words = ["DAY", "NIGHT", "JOY"]
+    response = (
+        '```json\n{"day": "Sunrise to sunset.", "NIGHT": " ", "SUN": "Star."}\n```'
+    )
+
+    assert client.parse_batch_response(response, words) == {"DAY": "Sunrise to sunset."}
+    assert client.parse_batch_response("Sunrise to sunset.", words) == {}
+    assert client.parse_batch_response('["Sunrise to sunset."]', words) == {}
+
+
+def chat_responses(*contents) -> list:
+    return [
+        MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+        for content in contents
+    ]
+
+
+@pytest.mark.parametrize("content", ("",))
+def test_batched_clues_generation(clue_generator):
+    create = clue_generator.client.client.chat.completions.create
+    create.side_effect = chat_responses(
+        '{"DAY": "Sunrise to sunset.", "NIGHT": "Sunset to sunrise."}',
+        "A feeling of happiness.",
+        '{"SUN": "Star of the day."}',
+    )
+    words = ["DAY", "NIGHT", "JOY", "SUN"]
+    clues = clue_generator.create(words, batch_size=3)
+
+    assert clues == {
+        "DAY": ["Sunrise to sunset."],
+        "NIGHT": ["Sunset to sunrise."],
+        "JOY": ["A feeling of happiness."],
+        "SUN": ["Star of the day."],
+    }
+    assert clue_generator.clues == clues
+    assert create.call_count == 3
+    assert create.call_args_list[0].kwargs["response_format"] == {"type": "json_object"}
+    assert "response_format" not in create.call_args_list[1].kwargs
+
+
+@pytest.mark.parametrize("content", ("",))
+def test_async_batched_clues_generation(async_clue_generator):
+    create = async_clue_generator.client.client.chat.completions.create
+    create.side_effect = chat_responses(
+        '{"DAY": "Sunrise to sunset."}',
+        '{"SUN": "Star of the day."}',
+        "Sunset to sunrise.",
+    )
+    words = ["DAY", "NIGHT", "SUN"]
+    clues = asyncio.run(async_clue_generator.acreate(words, batch_size=2))
+
+    assert clues == {
+        "DAY": ["Sunrise to sunset."],
+        "NIGHT": ["Sunset to sunrise."],
+        "SUN": ["Star of the day."],
+    }
+    assert create.await_count == 3
+
+
+@pytest.mark.parametrize("content", ("Some kind of clue.",))
+def test_batched_clues_generation_invalid_batch_size(clue_generator):
+    with pytest.raises(ValueError) as e:
+        clue_generator.create(["word"], batch_size=0)
+
+    assert str(e.value) == "The batch size must be at least 1."
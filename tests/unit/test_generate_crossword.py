@@ -1,6 +1,11 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
-from pycrossword import generate_crossword
+from pycrossword import CrosswordEngine, GenerationStats, WordOrder, generate_crossword
+from pycrossword.crossword._v2.ordering import order_words
 
 
 @pytest.mark.parametrize("filename", ("word-set-1.txt",))
@@ -30,3 +35,242 @@ def test_generate_crossword_with_dimensions(
 
     assert x <= width
     assert y <= height
+
+
+@pytest.mark.parametrize(
+    "filename,width,height",
+    (
+        ("word-set-1.txt", None, None),
+        ("word-set-94-1.txt", None, None),
+        ("word-set-94-1.txt", 30, 10),
+    ),
+)
+def test_generate_crossword_with_numpy_engine(
+    unique_words: list, width: int, height: int
+):
+    pytest.importorskip("numpy")
+    expected = generate_crossword(
+        unique_words.copy(), x=width, y=height, seed=11, engine=CrosswordEngine.PYTHON
+    )
+    result = generate_crossword(
+        unique_words.copy(), x=width, y=height, seed=11, engine=CrosswordEngine.NUMPY
+    )
+
+    assert result == expected
+
+
+@pytest.mark.parametrize("filename", ("word-set-17-2.txt", "word-set-38-1.txt"))
+def test_generate_crossword_with_beam_engine(unique_words: list):
+    greedy = generate_crossword(unique_words.copy(), x=10, y=10, seed=11)
+    narrow = generate_crossword(
+        unique_words.copy(),
+        x=10,
+        y=10,
+        seed=11,
+        engine=CrosswordEngine.BEAM,
+        beam_width=1,
+    )
+    result = generate_crossword(
+        unique_words.copy(), x=10, y=10, seed=11, engine=CrosswordEngine.BEAM
+    )
+    (x, y), placed_words = result
+
+    assert narrow == greedy
+    assert len(placed_words) >= len(greedy[1])
+    assert x <= 10
+    assert y <= 10
+
+
+@pytest.mark.parametrize("filename", ("word-set-38-1.txt",))
+def test_generate_crossword_with_beam_depth(unique_words: list):
+    expected = generate_crossword(
+        unique_words.copy(), seed=11, engine=CrosswordEngine.BEAM, beam_depth=5
+    )
+    result = generate_crossword(
+        unique_words.copy(), seed=11, engine=CrosswordEngine.BEAM, beam_depth=5
+    )
+
+    assert result == expected
+
+
+@pytest.mark.parametrize("width,depth", ((0, None), (4, 0)))
+def test_generate_crossword_with_invalid_beam(width: int, depth: int | None):
+    with pytest.raises(ValueError):
+        generate_crossword(
+            ["word"], engine=CrosswordEngine.BEAM, beam_width=width, beam_depth=depth
+        )
+
+
+@pytest.mark.parametrize("filename", ("word-set-38-1.txt",))
+def test_generate_crossword_with_attempts(unique_words: list):
+    single = generate_crossword(unique_words.copy(), x=10, y=10, seed=11)
+    expected = generate_crossword(unique_words.copy(), x=10, y=10, seed=11, attempts=4)
+    result = generate_crossword(
+        unique_words.copy(), x=10, y=10, seed=11, attempts=4, workers=2
+    )
+
+    assert result == expected
+    assert len(expected[1]) >= len(single[1])
+
+
+@pytest.mark.parametrize("attempts,workers", ((0, 1), (1, 0)))
+def test_generate_crossword_with_invalid_attempts(attempts: int, workers: int):
+    with pytest.raises(ValueError):
+        generate_crossword(["word"], attempts=attempts, workers=workers)
+
+
+@pytest.mark.parametrize("filename", ("word-set-24-1.txt",))
+def test_generate_crossword_in_threads(unique_words: list):
+    expected = generate_crossword(unique_words.copy(), seed=11)
+    state = random.getstate()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(
+                lambda _: generate_crossword(unique_words.copy(), seed=11), range(8)
+            )
+        )
+
+    assert all(result == expected for result in results)
+    # the global random state is left untouched
+    assert random.getstate() == state
+
+
+@pytest.mark.parametrize("filename", ("word-set-24-1.txt",))
+def test_generate_crossword_with_rng(unique_words: list):
+    expected = generate_crossword(unique_words.copy(), seed=11)
+    result = generate_crossword(unique_words.copy(), rng=random.Random(11))
+
+    assert result == expected
+
+    with pytest.raises(ValueError):
+        generate_crossword(unique_words.copy(), seed=11, rng=random.Random(11))
+
+
+@pytest.mark.parametrize("filename", ("word-set-94-1.txt",))
+def test_generate_crossword_with_progress(unique_words: list):
+    words = [word for word in unique_words if word.isalpha()]
+    calls = []
+    dimensions, placed_words = generate_crossword(
+        words.copy(),
+        seed=11,
+        progress=lambda placed, pending, score: calls.append((placed, pending, score)),
+    )
+
+    assert calls
+    assert calls[-1][0] == len(placed_words)
+    assert all(score > 0 for _, _, score in calls)
+    assert [placed for placed, _, _ in calls] == sorted(
+        placed for placed, _, _ in calls
+    )
+
+
+@pytest.mark.parametrize("filename", ("word-set-94-1.txt",))
+def test_generate_crossword_with_cancel(unique_words: list):
+    words = [word for word in unique_words if word.isalpha()]
+    cancel = threading.Event()
+
+    def progress(placed: int, pending: int, score: float):
+        if placed == 5:
+            cancel.set()
+
+    _, placed_words = generate_crossword(
+        words.copy(), seed=11, progress=progress, cancel=cancel, attempts=3
+    )
+
+    assert len(placed_words) == 5
+
+
+@pytest.mark.parametrize("filename", ("word-set-94-1.txt",))
+def test_generate_crossword_with_time_budget(unique_words: list):
+    words = [word for word in unique_words if word.isalpha()]
+    _, placed_words = generate_crossword(words.copy(), seed=11, time_budget=0)
+
+    # only the first word is placed
+    assert len(placed_words) == 1
+
+
+@pytest.mark.parametrize("filename", ("word-set-38-1.txt",))
+def test_generate_crossword_with_stats(unique_words: list):
+    stats = GenerationStats()
+    _, placed_words = generate_crossword(
+        unique_words.copy(), x=10, y=10, seed=11, stats=stats
+    )
+    scored = stats.candidates - stats.rejected_by_bounds
+
+    assert stats.anchors >= stats.candidates
+    # each placed word but the first one won over the other scored candidates
+    assert scored - stats.rejected_by_score == len(placed_words) - 1
+    assert stats.requeued > 0
+    assert set(stats.timings) == {"search", "place", "total"}
+
+    attempts = GenerationStats()
+    generate_crossword(
+        unique_words.copy(), x=10, y=10, seed=11, attempts=2, workers=2, stats=attempts
+    )
+
+    assert attempts.anchors > stats.anchors
+
+
+@pytest.mark.parametrize("filename", ("word-set-38-1.txt",))
+def test_generate_crossword_with_stats_of_numpy_engine(unique_words: list):
+    pytest.importorskip("numpy")
+    expected = GenerationStats()
+    generate_crossword(unique_words.copy(), x=10, y=10, seed=11, stats=expected)
+    stats = GenerationStats()
+    generate_crossword(
+        unique_words.copy(),
+        x=10,
+        y=10,
+        seed=11,
+        engine=CrosswordEngine.NUMPY,
+        stats=stats,
+    )
+
+    expected.timings = stats.timings = {}
+    assert stats == expected
+
+
+@pytest.mark.parametrize("filename", ("word-set-38-1.txt",))
+def test_generate_crossword_with_connectivity_order(unique_words: list):
+    expected = generate_crossword(
+        unique_words.copy(), x=10, y=10, seed=11, order=WordOrder.CONNECTIVITY
+    )
+    (x, y), placed_words = generate_crossword(
+        unique_words.copy(), x=10, y=10, seed=11, order=WordOrder.CONNECTIVITY
+    )
+
+    assert ((x, y), placed_words) == expected
+    # the seed word fits the width
+    assert len(placed_words[0][0]) <= 10
+    assert x <= 10
+    assert y <= 10
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize(
+    "x,expected",
+    (
+        # crossings per letter: TREE 10/4, OX 4/2, GEESE 9/5, RARE 7/4, XOXO 4/4, and
+        # OX and XOXO share no letter with the words placed before them
+        (None, ["TREE", "GEESE", "RARE", "OX", "XOXO"]),
+        # the seed word fits the width, then comes the word it crosses
+        (2, ["OX", "XOXO", "TREE", "GEESE", "RARE"]),
+    ),
+)
+def test_order_words_by_connectivity(seed: int, x: int | None, expected: list):
+    words = ["OX", "RARE", "XOXO", "GEESE", "TREE"]
+    order_words(words, random.Random(seed), WordOrder.CONNECTIVITY, x)
+
+    assert words == expected
+    # not the length order either
+    assert words != sorted(words, key=len, reverse=True)
+
+
+def test_generate_crossword_skips_words_without_crossings():
+    stats = GenerationStats()
+    _, placed_words = generate_crossword(
+        ["abc", "xyz", "cab"], seed=11, order=WordOrder.CONNECTIVITY, stats=stats
+    )
+
+    assert sorted(word for word, *_ in placed_words) == ["abc", "cab"]
+    assert stats.skipped == stats.requeued == 1
@@ -0,0 +1,39 @@
+import pytest
+
+from pycrossword import generate_crossword, generate_crosswords
+
+from .conftest import get_file_path
+
+
+@pytest.fixture(scope="function")
+def word_lists() -> list[list[str]]:
+    word_lists = []
+    for filename in ("word-set-10-1.txt", "word-set-17-1.txt", "word-set-24-1.txt"):
+        with open(get_file_path(filename), "r") as f:
+            word_lists.append(f.read().splitlines())
+
+    return word_lists
+
+
+@pytest.mark.parametrize("workers", (1, 2))
+def test_generate_crosswords(word_lists: list, workers: int):
+    expected = [generate_crossword(words.copy(), seed=11) for words in word_lists]
+    crosswords = generate_crosswords(
+        (words.copy() for words in word_lists), seed=11, workers=workers
+    )
+
+    results = {}
+    for index, dimensions, placed_words in crosswords:
+        results[index] = (dimensions, placed_words)
+
+    assert [results[i] for i in range(len(word_lists))] == expected
+
+
+def test_generate_crosswords_with_stats(word_lists: list):
+    crosswords = generate_crosswords(word_lists, seed=11, workers=2, stats=True)
+
+    for _, _, placed_words, stats in crosswords:
+        assert (
+            stats.candidates - stats.rejected_by_bounds - stats.rejected_by_score
+            == (len(placed_words) - 1)
+        )
@@ -1,4 +1,4 @@
-from pycrossword.crossword import generate_score
+from pycrossword.crossword import calculate_score, generate_score
 
 
 def test_generate_score():
@@ -6,3 +6,11 @@ def test_generate_score():
     dimensions = [-1, 0, 0, 3]
     score = generate_score(crossword, dimensions)
     assert round(score, 5) == 38.33333
+
+
+def test_calculate_score():
+    crossword = {(-1, 3): "C", (0, 3): "O", (0, 0): "A", (0, 1): "R", (0, 2): "C"}
+    dimensions = [-1, 0, 0, 3]
+    # phantom cells must not be counted
+    crossword[(-1, 0)] = ""
+    assert calculate_score(5, dimensions) == generate_score(crossword, dimensions)
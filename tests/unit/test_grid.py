@@ -0,0 +1,38 @@
+from pycrossword.crossword import generate_score
+from pycrossword.crossword._v2.grid import Grid
+
+
+def test_grid():
+    grid = Grid()
+    for i, char in enumerate("ARCO"):
+        grid[(0, i)] = char
+
+    grid[(-1, 3)] = "C"
+    # crossing cells are written once
+    grid[(0, 3)] = "O"
+
+    assert len(grid) == 5
+    assert dict(grid) == {
+        (-1, 3): "C",
+        (0, 0): "A",
+        (0, 1): "R",
+        (0, 2): "C",
+        (0, 3): "O",
+    }
+    assert (1, 1) not in grid
+    assert (100, -100) not in grid
+    assert round(generate_score(grid, [-1, 0, 0, 3]), 5) == 38.33333
+
+
+def test_grid_anchors_order():
+    grid = Grid()
+    grid.reserve(-5, 5, -5, 5)
+    code = grid.encode("A")[0]
+    # an empty cell visited before another cell is written keeps its earlier rank
+    grid.visit(grid.index(2, 2))
+    grid[(0, 0)] = "A"
+    grid.reserve(-50, 50, -50, 50)
+    grid[(2, 2)] = "A"
+
+    assert [coords for _, *coords in grid.anchors(code)] == [[2, 2], [0, 0]]
+    assert grid.cells[grid.index(2, 2)] == code
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import pytest
+
+# packages of the clue backend and of the numpy engine, loaded only when needed
+HEAVY_PACKAGES = {"openai", "httpx", "pydantic", "numpy"}
+
+
+def imported_packages(*args: str) -> set:
+    """Run python with -X importtime and return the top-level packages it imported."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rpartition("|")[2].strip().split(".")[0]
+        for line in process.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+@pytest.mark.parametrize(
+    "args",
+    (
+        ("-c", "import pycrossword"),
+        (
+            "-m",
+            "pycrossword",
+            "--words",
+            "amazon",
+            "python",
+            "night",
+            "--no-clue",
+            "-s",
+        ),
+    ),
+)
+def test_startup_imports(args: tuple):
+    assert not imported_packages(*args) & HEAVY_PACKAGES
+
+
+def test_numpy_engine_imports():
+    pytest.importorskip("numpy")
+    # -X importtime also logs failed imports, the modules are checked instead
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "from pycrossword import generate_crossword\n"
+            "before = 'numpy' in sys.modules\n"
+            "generate_crossword(['amazon', 'python', 'night'], engine='numpy', seed=1)\n"
+            "print(before, 'numpy' in sys.modules, 'openai' in sys.modules)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert process.stdout.split() == ["False", "True", "False"]
@@ -0,0 +1,169 @@
+import asyncio
+import random
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from openai import APIConnectionError, BadRequestError, RateLimitError
+
+from pycrossword import (
+    AdaptiveLimit,
+    AsyncOpenAIClient,
+    OpenAIClient,
+    RateLimiter,
+    RetryPolicy,
+)
+from pycrossword.clue.limits import TokenBucket, retry_after
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def status_error(error: type, status: int, headers: dict | None = None):
+    response = httpx.Response(status, headers=headers, request=REQUEST)
+    return error("Error.", response=response, body=None)
+
+
+def chat_response(content: str) -> MagicMock:
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+
+def test_token_bucket():
+    bucket = TokenBucket(60)
+
+    assert bucket.reserve(60) == 0
+    # one token per second, the bucket is empty
+    assert bucket.reserve(2) == pytest.approx(2, abs=0.01)
+    bucket.refund(2)
+    assert bucket.reserve(1) == pytest.approx(1, abs=0.01)
+    bucket.pause(10)
+    assert bucket.reserve(1) == pytest.approx(11, abs=0.01)
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=60)
+
+    assert limiter.reserve(30) == 0
+    assert limiter.reserve(40) == pytest.approx(10, abs=0.01)
+    # the second request used 10 tokens only
+    limiter.settle(40, 10)
+    assert limiter.reserve(0) == 0
+    assert RateLimiter().reserve(1000) == 0
+
+
+def test_retry_after():
+    assert retry_after(status_error(RateLimitError, 429)) is None
+    assert retry_after(status_error(RateLimitError, 429, {"retry-after": "3"})) == 3
+    headers = {"retry-after": "3", "retry-after-ms": "250"}
+    assert retry_after(status_error(RateLimitError, 429, headers)) == 0.25
+    headers = {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    assert retry_after(status_error(RateLimitError, 429, headers)) == 0
+
+
+def test_retry_policy():
+    policy = RetryPolicy(max_retries=3, base_delay=1, max_delay=4, rng=random.Random(1))
+    error = APIConnectionError(request=REQUEST)
+
+    for attempt, ceiling in enumerate((1, 2, 4)):
+        assert 0 <= policy.backoff(error, attempt) <= ceiling
+
+    with pytest.raises(APIConnectionError):
+        policy.backoff(error, 3)
+
+    # the delay asked for by the service is honoured
+    error = status_error(RateLimitError, 429, {"retry-after": "3"})
+    assert 3 <= policy.backoff(error, 0) <= 4
+
+    with pytest.raises(BadRequestError):
+        policy.backoff(status_error(BadRequestError, 400), 0)
+
+    with pytest.raises(ValueError) as e:
+        RetryPolicy(max_retries=-1)
+
+    assert str(e.value) == "The retries and delays must not be negative."
+
+
+def test_adaptive_limit():
+    limit = AdaptiveLimit(initial=4, minimum=1, maximum=5)
+    limit.push_back()
+    assert limit.limit == 2
+
+    # the limit grows by one every limit successes
+    for _ in range(6):
+        limit.succeed()
+
+    assert limit.limit == 4
+    for _ in range(10):
+        limit.push_back()
+
+    assert limit.limit == 1
+
+    with pytest.raises(ValueError) as e:
+        AdaptiveLimit(initial=8, maximum=4)
+
+    assert str(e.value) == "The limits must satisfy 1 <= minimum <= initial <= maximum."
+
+
+def test_adaptive_limit_bounds_concurrency():
+    limit = AdaptiveLimit(initial=3, maximum=3)
+    in_flight = peak = 0
+
+    async def request():
+        nonlocal in_flight, peak
+        async with limit:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def requests():
+        await asyncio.gather(*(request() for _ in range(10)))
+
+    asyncio.run(requests())
+    assert peak == 3
+
+
+def test_client_retries():
+    client = OpenAIClient(
+        api_token="",
+        rate_limiter=RateLimiter(requests_per_minute=600),
+        retry_policy=RetryPolicy(base_delay=0),
+    )
+    client.client = MagicMock()
+    client.client.chat.completions.create.side_effect = [
+        status_error(RateLimitError, 429, {"retry-after-ms": "10"}),
+        APIConnectionError(request=REQUEST),
+        chat_response("Some kind of clue."),
+    ]
+
+    assert client.request("query") == "Some kind of clue."
+    assert client.retries == 2
+
+    client.client.chat.completions.create.side_effect = [
+        status_error(BadRequestError, 400)
+    ]
+    with pytest.raises(BadRequestError):
+        client.request("query")
+
+
+def test_async_client_shrinks_concurrency():
+    client = AsyncOpenAIClient(
+        api_token="",
+        retry_policy=RetryPolicy(base_delay=0),
+        concurrency=AdaptiveLimit(initial=8, maximum=8),
+    )
+    client.client = MagicMock()
+    responses = [status_error(RateLimitError, 429)] * 2 + [chat_response("Clue.")]
+
+    async def create(**kwargs):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+    client.client.chat.completions.create.side_effect = create
+
+    assert asyncio.run(client.request("query")) == "Clue."
+    assert client.retries == 2
+    # halved twice, then grown by 1 / 2
+    assert client.concurrency.limit == 2
@@ -0,0 +1,55 @@
+import gzip
+import itertools
+
+from pycrossword import read_words
+
+
+def test_read_words_normalizes_and_skips_invalid_words():
+    lines = ["python\n", "  Night \n", "\n", "half-time\n", "joy"]
+
+    assert list(read_words(lines)) == ["PYTHON", "NIGHT", "JOY"]
+
+
+def test_read_words_removes_duplicates_in_order():
+    lines = ["night", "joy", "Night", "amazon", "JOY"]
+
+    assert list(read_words(lines)) == ["NIGHT", "JOY", "AMAZON"]
+    assert list(read_words(lines, allow_duplicates=True)) == [
+        "NIGHT",
+        "JOY",
+        "NIGHT",
+        "AMAZON",
+        "JOY",
+    ]
+
+
+def test_read_words_filters_length_and_alphabet():
+    lines = ["ox", "joy", "night", "python", "comprehensive"]
+
+    assert list(read_words(lines, min_length=3, max_length=6)) == [
+        "JOY",
+        "NIGHT",
+        "PYTHON",
+    ]
+    assert list(read_words(lines, alphabet="noptyhigx")) == ["OX", "NIGHT", "PYTHON"]
+
+
+def test_read_words_is_lazy():
+    words = read_words(itertools.cycle(["night", "joy", "amazon"]), max_length=5)
+
+    # the source never ends, words are yielded as they are read
+    assert next(words) == "NIGHT"
+    assert next(words) == "JOY"
+
+
+def test_read_words_reads_files(tmp_path):
+    plain = tmp_path / "words.txt"
+    plain.write_text("night\njoy\n")
+    compressed = tmp_path / "words.txt.gz"
+    with gzip.open(compressed, "wt") as f:
+        f.write("amazon\npython\n")
+
+    assert list(read_words(plain)) == ["NIGHT", "JOY"]
+    assert list(read_words(str(compressed))) == ["AMAZON", "PYTHON"]
+    with gzip.open(compressed) as f:
+        assert list(read_words(f)) == ["AMAZON", "PYTHON"]
@@ -0,0 +1,282 @@
+import asyncio
+import json
+import shutil
+import socket
+import struct
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from pycrossword import (
+    AsyncBaseClient,
+    ClueGenerator,
+    CrosswordServer,
+    generate_crossword,
+)
+from pycrossword._utils import serialize
+
+from .conftest import TEST_DIR
+
+
+class FakeClient(AsyncBaseClient):
+    async def request(self, query: str) -> str:
+        return f"Clue of {query}."
+
+    @staticmethod
+    def render_query(word: str, theme: str, difficulty: str) -> str:
+        return word
+
+
+def request(server: CrosswordServer, method: str, path: str, **kwargs):
+    """Send a request to the server from a worker thread."""
+
+    def send() -> httpx.Response:
+        with httpx.Client(base_url=server.url, timeout=30) as client:
+            return client.request(method, path, **kwargs)
+
+    return asyncio.to_thread(send)
+
+
+@pytest.mark.parametrize("filename", ("word-set-24-1.txt",))
+def test_server(unique_words: list):
+    async def run() -> tuple:
+        async with CrosswordServer(port=0, workers=1) as server:
+            health = await request(server, "GET", "/health")
+            crossword = await request(
+                server,
+                "POST",
+                "/crosswords",
+                json={"words": unique_words, "cols": 15, "rows": 15, "seed": 11},
+            )
+            return health, crossword
+
+    health, crossword = asyncio.run(run())
+    dimensions, placed_words = generate_crossword(
+        [word.upper() for word in unique_words], x=15, y=15, seed=11
+    )
+
+    assert health.json() == {"status": "ok", "workers": 1, "queued": 0, "queue_size": 4}
+    assert crossword.status_code == 200
+    assert crossword.json() == serialize(dimensions, placed_words)
+
+
+@pytest.mark.parametrize(
+    "method,path,content,status,error",
+    (
+        ("POST", "/crosswords", "[]", 400, "Expected a JSON object."),
+        ("POST", "/crosswords", "{", 400, "Invalid JSON"),
+        ("POST", "/crosswords", '{"words": []}', 400, "Expected a non-empty array"),
+        ("POST", "/crosswords", '{"words": ["w0rd"]}', 400, "The word 'w0rd'"),
+        ("POST", "/crosswords", '{"words": ["a"], "size": 1}', 400, "Unknown options"),
+        ("POST", "/crosswords", '{"words": ["a"], "engine": "x"}', 400, "'x' is not"),
+        (
+            "POST",
+            "/crosswords",
+            '{"words": ["a"], "clues": true}',
+            400,
+            "Clue generation is disabled.",
+        ),
+        (
+            "POST",
+            "/crosswords",
+            '{"words": ["a"], "attempts": 17}',
+            400,
+            "The attempts can't exceed 16.",
+        ),
+        (
+            "POST",
+            "/crosswords",
+            '{"words": ["a"], "time_budget": 60}',
+            400,
+            "The time_budget can't exceed 30.0.",
+        ),
+        (
+            "POST",
+            "/crosswords",
+            '{"words": ["a"], "cols": 2.9}',
+            400,
+            "The cols must be an integer.",
+        ),
+        (
+            "POST",
+            "/crosswords",
+            '{"words": ["a"], "rows": 0}',
+            400,
+            "The rows must be at least 1.",
+        ),
+        (
+            "POST",
+            "/crosswords",
+            '{"words": ["a"], "seed": "1"}',
+            400,
+            "The seed must be a number.",
+        ),
+        (
+            "POST",
+            "/crosswords",
+            '{"words": ["a"], "clues": "false"}',
+            400,
+            "The clues must be true or false.",
+        ),
+        ("GET", "/crosswords", "", 405, "Use POST."),
+        ("GET", "/puzzles", "", 404, "No resource at /puzzles."),
+    ),
+)
+def test_server_errors(method: str, path: str, content: str, status: int, error: str):
+    async def run() -> httpx.Response:
+        async with CrosswordServer(port=0, workers=1) as server:
+            return await request(server, method, path, content=content)
+
+    response = asyncio.run(run())
+
+    assert response.status_code == status
+    assert response.json()["error"].startswith(error)
+
+
+def test_server_request_line_too_long():
+    async def run() -> bytes:
+        async with CrosswordServer(port=0, workers=1) as server:
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            # just over the limit of the reader, so that the line is read in full
+            writer.write(b"GET /" + b"a" * (1 << 16) + b" HTTP/1.1\r\n\r\n")
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+
+    response = asyncio.run(run())
+
+    assert response.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+    assert b"Connection: close" in response
+
+
+def test_server_drops_disconnected_requests(words: list):
+    async def run() -> tuple:
+        async with CrosswordServer(port=0, workers=1) as server:
+            # the first request holds the process while the second one is queued
+            first = asyncio.ensure_future(
+                request(
+                    server,
+                    "POST",
+                    "/crosswords",
+                    json={"words": words, "seed": 1, "attempts": 4},
+                )
+            )
+            await asyncio.sleep(0.5)
+            content = json.dumps({"words": words, "seed": 2, "attempts": 4}).encode()
+            _, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(
+                b"POST /crosswords HTTP/1.1\r\n"
+                + f"Content-Length: {len(content)}\r\n\r\n".encode()
+                + content
+            )
+            await writer.drain()
+            await asyncio.sleep(0.2)
+            # reset the connection rather than just closing it
+            writer.get_extra_info("socket").setsockopt(
+                socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+            )
+            writer.close()
+            await first
+            # the process takes the next request as soon as the first one is done
+            start = time.perf_counter()
+            await request(server, "GET", "/health")
+            await request(server, "POST", "/crosswords", json={"words": ["PYTHON"]})
+            return server.responses, time.perf_counter() - start, (await first)
+
+    responses, elapsed, first = asyncio.run(run())
+
+    assert first.status_code == 200
+    assert responses == {200: 3, 499: 1}
+    assert elapsed < 0.5
+
+
+def test_server_answers_half_closed_connections(words: list):
+    async def run() -> bytes:
+        async with CrosswordServer(port=0, workers=1) as server:
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            content = json.dumps({"words": words, "seed": 1}).encode()
+            writer.write(
+                b"POST /crosswords HTTP/1.1\r\n"
+                + f"Content-Length: {len(content)}\r\n\r\n".encode()
+                + content
+            )
+            # the client won't send anything else, but waits for the response
+            writer.write_eof()
+            response = await reader.read()
+            writer.close()
+            return response
+
+    response = asyncio.run(run())
+
+    assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+
+
+@pytest.fixture
+def words() -> list:
+    with open(TEST_DIR / "words" / "words.json") as f:
+        return sorted({word for word in json.load(f) if word.isalpha()})[:300]
+
+
+def test_server_backpressure(words: list):
+    async def run() -> list:
+        async with CrosswordServer(port=0, workers=1, queue_size=1) as server:
+            return await asyncio.gather(
+                *(
+                    request(
+                        server,
+                        "POST",
+                        "/crosswords",
+                        json={"words": words, "seed": 1, "attempts": 4},
+                    )
+                    for _ in range(4)
+                )
+            )
+
+    responses = asyncio.run(run())
+    statuses = [response.status_code for response in responses]
+    rejected = [response for response in responses if response.status_code == 503]
+
+    # at most one request is laid out and one waits, the others are rejected
+    assert 1 <= statuses.count(200) <= 2
+    assert statuses.count(503) == 4 - statuses.count(200)
+    assert all(response.headers["retry-after"] == "1" for response in rejected)
+
+
+@pytest.fixture
+def socket_dir():
+    # the paths of Unix sockets are limited to about 100 bytes, unlike tmp_path
+    path = tempfile.mkdtemp()
+    yield Path(path)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="No Unix sockets.")
+@pytest.mark.parametrize("filename", ("word-set-24-1.txt",))
+def test_server_with_clues(unique_words: list, socket_dir: Path):
+    async def run() -> dict:
+        server = CrosswordServer(
+            path=socket_dir / "pycrossword.sock",
+            workers=1,
+            clue_generator=ClueGenerator(FakeClient()),
+        )
+        async with server:
+            transport = httpx.AsyncHTTPTransport(uds=str(server.path))
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://pycrossword"
+            ) as client:
+                response = await client.post(
+                    "/crosswords", json={"words": unique_words, "clues": True}
+                )
+
+        assert not server.path.exists()
+        return response.json()
+
+    crossword = asyncio.run(run())
+
+    assert all(
+        item["clue"] == f"Clue of {item['word']}." for item in crossword["placed_words"]
+    )
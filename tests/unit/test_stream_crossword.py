@@ -0,0 +1,127 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from pycrossword import (
+    AsyncBaseClient,
+    ClueGenerator,
+    CrosswordEngine,
+    GenerationStats,
+    generate_crossword,
+    generate_crossword_with_clues,
+    stream_crossword,
+)
+
+from .conftest import get_file_path
+
+
+class FakeClient(AsyncBaseClient):
+    def __init__(self, fail: str | None = None):
+        self.queries = []
+        self.fail = fail
+
+    async def request(self, query: str) -> str:
+        self.queries.append(query)
+        await asyncio.sleep(0.001)
+        if self.fail is not None and self.fail in query:
+            raise ValueError("No response from the chat model.")
+
+        return f"Clue of {query}."
+
+    @staticmethod
+    def render_query(word: str, theme: str, difficulty: str) -> str:
+        return word
+
+
+def consume(placements) -> tuple:
+    streamed = []
+    while True:
+        try:
+            streamed.append(next(placements).copy())
+        except StopIteration as stop:
+            return streamed, stop.value
+
+
+@pytest.mark.parametrize("filename", ("word-set-24-1.txt",))
+@pytest.mark.parametrize("engine", (CrosswordEngine.PYTHON, CrosswordEngine.NUMPY))
+def test_stream_crossword(unique_words: list, engine: str):
+    expected = generate_crossword(unique_words.copy(), x=12, y=12, seed=11)
+    streamed, result = consume(
+        stream_crossword(unique_words.copy(), x=12, y=12, seed=11, engine=engine)
+    )
+
+    assert result == expected
+    # placements are yielded in order, relative to the first word until the end
+    assert [placement[0] for placement in streamed] == [
+        placement[0] for placement in expected[1]
+    ]
+    assert streamed[0][1:] == [0, 0, True]
+
+
+def test_stream_crossword_with_beam_engine():
+    with pytest.raises(ValueError) as e:
+        next(stream_crossword(["word"], engine=CrosswordEngine.BEAM))
+
+    assert str(e.value) == "The placements of the beam engine can't be streamed."
+
+
+@pytest.mark.parametrize("filename", ("word-set-24-1.txt",))
+def test_generate_crossword_with_clues(unique_words: list):
+    expected = generate_crossword(unique_words.copy(), x=12, y=12, seed=11)
+    client = FakeClient()
+    dimensions, placed_words, clues = asyncio.run(
+        generate_crossword_with_clues(
+            unique_words.copy(),
+            ClueGenerator(client),
+            max_concurrency=3,
+            x=12,
+            y=12,
+            seed=11,
+        )
+    )
+
+    assert (dimensions, placed_words) == expected
+    assert list(clues) == [placement[0] for placement in placed_words]
+    assert all(clues[word] == [f"Clue of {word}."] for word in clues)
+    # unused words are never requested
+    assert len(client.queries) == len(placed_words)
+
+
+@pytest.mark.parametrize("filename", ("word-set-24-1.txt",))
+def test_generate_crossword_with_failing_clues(unique_words: list):
+    expected = generate_crossword(unique_words.copy(), seed=11)
+    client = FakeClient(fail=expected[1][1][0])
+    with pytest.raises(ValueError) as e:
+        asyncio.run(
+            generate_crossword_with_clues(
+                unique_words.copy(), ClueGenerator(client), seed=11
+            )
+        )
+
+    assert str(e.value) == "No response from the chat model."
+
+
+def test_generate_crossword_with_failing_clues_stops_the_layout():
+    with open(get_file_path("words.json")) as f:
+        words = sorted({word.upper() for word in json.load(f) if word.isalpha()})[:300]
+
+    full = GenerationStats()
+    generate_crossword(words.copy(), seed=1, stats=full)
+    stats = GenerationStats()
+    cancel = threading.Event()
+    with pytest.raises(ValueError):
+        asyncio.run(
+            generate_crossword_with_clues(
+                words.copy(),
+                ClueGenerator(FakeClient(fail="")),
+                seed=1,
+                stats=stats,
+                cancel=cancel,
+            )
+        )
+
+    # the first clue failed, the layout stopped long before its end
+    assert cancel.is_set()
+    assert stats.score_calls < full.score_calls / 2
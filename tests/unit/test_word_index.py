@@ -0,0 +1,55 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from pycrossword import WordIndex, fill_template
+
+WORDS = ["CAT", "BEE", "CAB", "TOE", "DOG", "CAR", "TEA", "ÉCLAT", "CAT"]
+
+
+def test_word_index():
+    index = WordIndex(WORDS)
+
+    assert len(index) == 8
+    assert index.lengths() == [3, 5]
+    assert index.candidates(3) == 0b1111111
+    assert index.candidates(4) == 0
+    # CAT, CAB and CAR start with a C
+    assert index.matching(3, 0, "C") == 0b100101
+    assert index.word(3, 0) == "CAT"
+
+
+def test_word_index_save_and_open(tmp_path: Path):
+    path = tmp_path / "words.pcwi"
+    index = WordIndex(WORDS)
+    index.save(path)
+    compiled = WordIndex.open(path)
+
+    assert WordIndex.is_compiled(path)
+    assert list(compiled) == list(index)
+    for length in index.lengths():
+        assert compiled.candidates(length) == index.candidates(length)
+        for position in range(length):
+            assert sorted(compiled.letters(length, position)) == sorted(
+                index.letters(length, position)
+            )
+            for char in index.letters(length, position):
+                assert compiled.matching(length, position, char) == index.matching(
+                    length, position, char
+                )
+
+    # worker processes map the file again
+    assert list(pickle.loads(pickle.dumps(compiled))) == list(index)
+    assert fill_template(["...", ".#.", "..."], compiled, seed=11) == fill_template(
+        ["...", ".#.", "..."], index, seed=11
+    )
+
+
+def test_word_index_open_invalid_file(tmp_path: Path):
+    path = tmp_path / "words.txt"
+    path.write_text("\n".join(WORDS))
+
+    assert not WordIndex.is_compiled(path)
+    with pytest.raises(ValueError):
+        WordIndex.open(path)